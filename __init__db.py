@@ -5,4 +5,8 @@ from app.extensions import db
 app = create_app()
 with app.app_context():
     db.create_all()
+    from app.models.indexes import ensure_indexes
+    ensure_indexes()
+    from app.services.search import ensure_search_index
+    ensure_search_index()
     print("Done!")
\ No newline at end of file
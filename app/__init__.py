@@ -30,13 +30,54 @@ def create_app(env: str = None) -> Flask:
     login_manager.init_app(app)
     bcrypt.init_app(app)
     cors.init_app(app, resources={r"/api/*": {"origins": "*"}})
+    from .services.cache_backends import configure_cache_backend
+    configure_cache_backend(app)
     cache.init_app(app)
 
+    # ── Full-text index theo kip DBWriter (noi truoc cache tags) ──
+    from .services.search import init_search
+    init_search(app)
+
+    # ── Invalidate cache khi DBWriter ghi du lieu moi ──
+    from .services.cache_tags import init_cache_tags
+    init_cache_tags(app)
+
+    # ── Snapshot JSON build lai ngay sau khi du lieu doi ──
+    from .services.snapshots import init_snapshots
+    init_snapshots(app)
+
+    # ── Bump tag khi process khac (crawl_*.py...) ghi DB ──
+    from .services.db_versions import init_db_versions
+    init_db_versions(app)
+
+    # ── Autocomplete trong RAM cap nhat theo tag version ──
+    from .services.autocomplete import init_autocomplete
+    init_autocomplete(app)
+
+    # ── SSE ti so live: delta tu DBWriter -> client dang nghe ──
+    from .services.live_stream import init_live_stream
+    init_live_stream(app)
+
+    # ── Dem query moi request (bat N+1) ──
+    from .services.query_budget import init_query_budget
+    init_query_budget(app)
+
+    # ── Nen gzip / brotli /api/* + static da fingerprint ──
+    from .services.compression import init_compression
+    init_compression(app)
+    from .services.assets import init_assets
+    init_assets(app)
+
+    # ── ETag / 304 cho GET /api/* ──
+    from .services.conditional import init_conditional_requests
+    init_conditional_requests(app)
+
     # ── Đăng ký Models (để Migrate nhận diện) ──
     with app.app_context():
         from .models import (  # noqa: F401
             User, Club, Player, Match, Standing,
-            Statistic, TeamStatistic, News,
+            Statistic, TeamStatistic, News, RecordFingerprint,
+            SearchDocument, BracketMatchup,
         )
 
     # ── Đăng ký Blueprints (Routes) ──
@@ -60,6 +101,8 @@ def _register_blueprints(app: Flask):
     from .routes.players import players_bp
     from .routes.clubs import clubs_bp
     from .routes.chatbot import chatbot_bp
+    from .routes.search import search_bp
+    from .routes.batch import batch_bp
     from .routes.pages import pages_bp
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
@@ -70,4 +113,6 @@ def _register_blueprints(app: Flask):
     app.register_blueprint(players_bp, url_prefix="/api/players")
     app.register_blueprint(clubs_bp, url_prefix="/api/clubs")
     app.register_blueprint(chatbot_bp, url_prefix="/api/chatbot")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(batch_bp, url_prefix="/api/batch")
     app.register_blueprint(pages_bp)  # Serve HTML (no prefix)
\ No newline at end of file
@@ -7,6 +7,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Config:
     """Base configuration"""
     # --- Flask ---
@@ -23,8 +25,22 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
 
     # --- Cache ---
+    # CACHE_BACKEND: simple (rieng tung process) | filesystem (chung giua cac worker,
+    # evict LRU) | redis -> CACHE_TYPE duoc chon trong create_app
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "simple")
     CACHE_TYPE = "SimpleCache"
     CACHE_DEFAULT_TIMEOUT = 300  # 5 phút
+    CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(BASE_DIR, "instance", "app_cache"))
+    CACHE_THRESHOLD = int(os.getenv("CACHE_THRESHOLD", 5000))
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_REDIS_CLIENT = os.getenv("CACHE_REDIS_CLIENT")   # vd. "fakeredis.FakeRedis"
+    CACHE_KEY_PREFIX = "aimond:"
+    # @cached: tra ban cu toi da N giay trong luc 1 request build lai o background;
+    # request cung key khi miss cho toi da CACHE_SINGLE_FLIGHT_WAIT giay
+    CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", 30))
+    CACHE_SINGLE_FLIGHT_WAIT = 5.0
+    # Chu ky doc watermark DB (max updated_at + count) de bat ghi tu script chay rieng
+    CACHE_DB_SYNC_INTERVAL = int(os.getenv("CACHE_DB_SYNC_INTERVAL", 10))
 
     # --- Season Config (CỐ ĐỊNH mùa giải 2025-2026) ---
     CURRENT_SEASON = "2025"              # ID mùa giải PL
@@ -40,6 +56,27 @@ class Config:
     CRAWLER_HEADLESS = True
     CRAWLER_TIMEOUT = 30000             # 30 giây
     CRAWLER_RETRY = 3
+    # League payload dung chung giua cac crawler trong bao lau (giay)
+    LEAGUE_SNAPSHOT_MAX_AGE = int(os.getenv("LEAGUE_SNAPSHOT_MAX_AGE", 120))
+    # Rate limit moi host (request/giay + burst), tu giam khi bi 403/429
+    CRAWLER_RATE_PER_HOST = float(os.getenv("CRAWLER_RATE_PER_HOST", 4))
+    CRAWLER_BURST_PER_HOST = int(os.getenv("CRAWLER_BURST_PER_HOST", 6))
+    # Ingestion queue: so record moi batch ghi DB, thoi gian cho gom record (giay)
+    INGEST_BATCH_SIZE = 500
+    INGEST_LINGER_SECONDS = 1.0
+
+    # --- Nen response /api/* (app/services/compression.py) ---
+    COMPRESS_MIN_SIZE = 512                    # byte
+    COMPRESS_VARIANT_TIMEOUT = 3600            # giây, ban nen luu trong cache theo ETag
+
+    # --- Live SSE (app/services/live_stream.py) ---
+    # Moi client giu 1 ket noi mo -> can worker gevent; giu duoi --worker-connections
+    LIVE_STREAM_MAX_CLIENTS = int(os.getenv("LIVE_STREAM_MAX_CLIENTS", 800))
+    LIVE_STREAM_HEARTBEAT = 15                 # giây, comment giu ket noi
+    LIVE_STREAM_MAX_AGE = 1800                 # giây, sau do client tu ket noi lai
+
+    # --- Query budget (app/services/query_budget.py): off | log | raise ---
+    QUERY_BUDGET_MODE = "off"
     USER_AGENT = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -59,13 +96,14 @@ class DevelopmentConfig(Config):
         "DATABASE_URL",
         "sqlite:///aimond_dev.db"
     )
-    CACHE_TYPE = "SimpleCache"
     SQLALCHEMY_ECHO = False
+    QUERY_BUDGET_MODE = "log"
 
 
 class ProductionConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
-    CACHE_TYPE = "SimpleCache"
+    # Nhieu gunicorn worker -> cache phai dung chung
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "filesystem")
     SQLALCHEMY_POOL_SIZE = 5
     SQLALCHEMY_MAX_OVERFLOW = 10
 
@@ -73,6 +111,8 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    CACHE_BACKEND = os.getenv("TEST_CACHE_BACKEND", "simple")
+    QUERY_BUDGET_MODE = "raise"
 
 
 config_map = {
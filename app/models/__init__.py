@@ -8,6 +8,9 @@ from .match import Match
 from .standing import Standing
 from .statistic import Statistic, TeamStatistic
 from .news import News
+from .fingerprint import RecordFingerprint
+from .search import SearchDocument
+from .bracket import BracketMatchup
 
 __all__ = [
     "User",
@@ -18,4 +21,7 @@ __all__ = [
     "Statistic",
     "TeamStatistic",
     "News",
+    "RecordFingerprint",
+    "SearchDocument",
+    "BracketMatchup",
 ]
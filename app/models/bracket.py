@@ -0,0 +1,78 @@
+"""
+app/models/bracket.py - Nhanh knockout (playoff -> chung ket) cua UCL
+"""
+import json
+from datetime import datetime, timezone
+from app.extensions import db
+
+
+class BracketMatchup(db.Model):
+    """
+    1 cap dau knockout (1-2 luot) trong 1 vong. Scheduler cao tu FotMob
+    (playoff.rounds, scripts/crawlers/ucl_bracket.py) va ghi qua DBWriter.upsert_bracket;
+    /api/matches/bracket doc bang nay thay vi goi FotMob moi request.
+    """
+    __tablename__ = "bracket_matchups"
+
+    id = db.Column(db.Integer, primary_key=True)
+    league = db.Column(db.String(10), nullable=False, default="UCL")
+    season = db.Column(db.String(10), nullable=False, default="2025")
+    bracket_type = db.Column(db.String(30), nullable=True)        # playoff.type cua FotMob
+
+    stage = db.Column(db.String(20), nullable=False)               # 'playoff' | '1/8' | '1/4' | '1/2' | 'final'
+    stage_order = db.Column(db.Integer, nullable=False, default=0)  # thu tu vong trong payload
+    draw_order = db.Column(db.Integer, nullable=False, default=0)
+
+    # Doi (id FotMob; ten placeholder khi chua boc tham)
+    home_id = db.Column(db.Integer, nullable=True)
+    home_name = db.Column(db.String(100), nullable=True)
+    home_short = db.Column(db.String(30), nullable=True)
+    home_badge = db.Column(db.String(500), nullable=True)
+    away_id = db.Column(db.Integer, nullable=True)
+    away_name = db.Column(db.String(100), nullable=True)
+    away_short = db.Column(db.String(30), nullable=True)
+    away_badge = db.Column(db.String(500), nullable=True)
+    tbd_home = db.Column(db.Boolean, default=False)
+    tbd_away = db.Column(db.Boolean, default=False)
+
+    # Tong ti so / ket qua
+    agg_home = db.Column(db.Integer, nullable=True)
+    agg_away = db.Column(db.Integer, nullable=True)
+    winner_id = db.Column(db.Integer, nullable=True)
+    winner_name = db.Column(db.String(100), nullable=True)
+    loser_id = db.Column(db.Integer, nullable=True)
+    best_of = db.Column(db.Integer, default=2)
+
+    legs_json = db.Column(db.Text, nullable=True)                  # JSON list cac luot dau
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.UniqueConstraint("league", "season", "stage", "draw_order", name="uq_bracket_matchup"),
+        db.Index("ix_bracket_league_season_order", "league", "season", "stage_order", "draw_order"),
+    )
+
+    def to_dict(self):
+        return {
+            "draw_order":  self.draw_order,
+            "home_id":     self.home_id,
+            "home_name":   self.home_name or "",
+            "home_short":  self.home_short or "",
+            "home_badge":  self.home_badge or "",
+            "away_id":     self.away_id,
+            "away_name":   self.away_name or "",
+            "away_short":  self.away_short or "",
+            "away_badge":  self.away_badge or "",
+            "agg_home":    self.agg_home,
+            "agg_away":    self.agg_away,
+            "winner_id":   self.winner_id,
+            "winner_name": self.winner_name,
+            "loser_id":    self.loser_id,
+            "tbd_home":    bool(self.tbd_home),
+            "tbd_away":    bool(self.tbd_away),
+            "best_of":     self.best_of,
+            "matches":     json.loads(self.legs_json) if self.legs_json else [],
+        }
+
+    def __repr__(self):
+        return f"<BracketMatchup {self.league} {self.stage}#{self.draw_order} {self.home_name} v {self.away_name}>"
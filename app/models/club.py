@@ -2,6 +2,7 @@
 app/models/club.py - Model câu lạc bộ
 """
 from datetime import datetime, timezone
+from sqlalchemy.orm import raiseload
 from app.extensions import db
 
 
@@ -80,7 +81,10 @@ class Club(db.Model):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
         if include_players:
-            data["players"] = [p.to_dict() for p in self.players.all()]
+            from app.models.player import Player
+            # Player.club chinh la self (co san trong identity map) -> cam lazy load ra SQL
+            players = self.players.options(raiseload(Player.club, sql_only=True)).all()
+            data["players"] = [p.to_dict() for p in players]
         return data
 
     def __repr__(self):
@@ -0,0 +1,27 @@
+"""
+app/models/fingerprint.py - Fingerprint du lieu da cao (change detection)
+"""
+from datetime import datetime, timezone
+from app.extensions import db
+
+
+class RecordFingerprint(db.Model):
+    """
+    Hash on dinh cua record crawler da ghi gan nhat (entity + key).
+    DBWriter so sanh truoc khi ghi: trung -> bo qua, khong dong vao bang chinh.
+    changed_at = lan cuoi du lieu thuc su thay doi (dung lam version cho cache).
+    """
+    __tablename__ = "record_fingerprints"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)     # 'match' | 'standing' | 'player' | ...
+    key = db.Column(db.String(200), nullable=False)       # vd. source_id hoac "PL:2025:8456"
+    digest = db.Column(db.String(40), nullable=False)     # sha1 cua record da chuan hoa
+    changed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+    __table_args__ = (
+        db.UniqueConstraint("entity", "key", name="uq_fingerprint_entity_key"),
+    )
+
+    def __repr__(self):
+        return f"<RecordFingerprint {self.entity}:{self.key} {self.digest[:8]}>"
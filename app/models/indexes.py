@@ -0,0 +1,36 @@
+"""
+app/models/indexes.py
+Migration index cho DB da co san du lieu.
+
+Index composite khai bao trong __table_args__ cua model; db.create_all() chi tao
+chung khi tao bang moi, bang cu (PostgreSQL tren Render, SQLite local) can chay
+ensure_indexes() - idempotent, goi moi lan khoi dong (run.py).
+Kiem tra query plan: python scripts/check_query_plans.py
+"""
+import logging
+from typing import List
+
+from sqlalchemy import inspect
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_indexes(engine=None) -> List[str]:
+    """CREATE INDEX cho moi index trong metadata ma DB chua co. Tra ve ten index da tao."""
+    engine = engine or db.engine
+    insp = inspect(engine)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        existing = {ix["name"] for ix in insp.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name in existing:
+                continue
+            index.create(bind=engine)
+            created.append(index.name)
+    if created:
+        logger.info(f"[Indexes] Created {len(created)} index(es): {', '.join(created)}")
+    return created
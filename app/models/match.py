@@ -89,7 +89,19 @@ class Match(db.Model):
 
     events_json = db.Column(db.Text, nullable=True)
 
+    # Index cho query nong (list / upcoming / results / rounds); id cuoi = tiebreak cursor
+    __table_args__ = (
+        db.Index("ix_matches_league_season_kickoff", "league", "season", "kickoff_at", "id"),
+        db.Index("ix_matches_league_season_status_kickoff", "league", "season", "status", "kickoff_at"),
+        db.Index("ix_matches_league_season_matchweek", "league", "season", "matchweek"),
+        db.Index("ix_matches_status_kickoff", "status", "kickoff_at"),   # /live (moi league)
+    )
+
     def to_dict(self):
+        """
+        home_club / away_club chi duoc doc khi thieu ten / badge denormalized -
+        query danh sach nen selectinload 2 quan he nay (xem routes/matches.py).
+        """
         import json
         return {
             "id": self.id,
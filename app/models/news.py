@@ -54,6 +54,11 @@ class News(db.Model):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
+    __table_args__ = (
+        db.Index("ix_news_league_season_published", "league", "season", "published_at", "id"),
+        db.Index("ix_news_league_published", "league", "published_at"),
+    )
+
     def to_dict(self, full=False):
         import json
         data = {
@@ -52,24 +52,32 @@ class Player(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("source_id", "league", "season", name="uq_player_source_league_season"),
+        db.Index("ix_players_league_season_name", "league", "season", "name", "id"),
+        db.Index("ix_players_league_season_position_name", "league", "season", "position", "name"),
     )
 
     @property
     def age(self):
-        if self.date_of_birth:
+        return self.age_from(self.date_of_birth)
+
+    @property
+    def age_detail(self):
+        return self.age_detail_from(self.date_of_birth)
+
+    @staticmethod
+    def age_from(d):
+        if d:
             today = datetime.now(timezone.utc).date()
-            d = self.date_of_birth
             return today.year - d.year - ((today.month, today.day) < (d.month, d.day))
         return None
 
-    @property
-    def age_detail(self):
-        """Tinh tuoi chinh xac: X tuoi Y ngay."""
-        if not self.date_of_birth:
+    @staticmethod
+    def age_detail_from(d):
+        """Tinh tuoi chinh xac: X tuoi Y ngay (dung chung cho serializer theo cot)."""
+        if not d:
             return None
         try:
             today = datetime.now(timezone.utc).date()
-            d = self.date_of_birth
             years = today.year - d.year - ((today.month, today.day) < (d.month, d.day))
             # Handle Feb 29 (leap day birthday)
             try:
@@ -87,14 +95,15 @@ class Player(db.Model):
             return None
 
     def to_dict(self, include_stats=False):
+        club = self.club  # 1 lan truy cap (lazy load neu query khong joinedload)
         data = {
             "id": self.id,
             "source_id": self.source_id,
             "league": self.league,
             "season": self.season,
             "club_id": self.club_id,
-            "club_name": self.club.name if self.club else None,
-            "club_badge": self.club.badge_url if self.club else None,
+            "club_name": club.name if club else None,
+            "club_badge": club.badge_url if club else None,
             "name": self.name,
             "first_name": self.first_name,
             "last_name": self.last_name,
@@ -0,0 +1,59 @@
+"""
+app/models/search.py - Van ban da chuan hoa cho full-text search (news / players / clubs)
+"""
+from datetime import datetime, timezone
+from app.extensions import db
+
+
+class SearchDocument(db.Model):
+    """
+    1 dong / entity co the tim kiem. title + body da fold (thuong, bo dau, d->d)
+    nen "Mbappe" khop "Mbappé", "ha noi" khop "Hà Nội".
+    Index full-text nam ngoai bang (xem SEARCH_DDL); ghi bang app/services/search.py.
+    """
+    __tablename__ = "search_documents"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)     # 'news' | 'players' | 'clubs'
+    entity_id = db.Column(db.Integer, nullable=False)
+    league = db.Column(db.String(10), nullable=False)
+    season = db.Column(db.String(10), nullable=True)
+    title = db.Column(db.String(500), nullable=False)     # ten / tieu de (trong so cao)
+    body = db.Column(db.Text, nullable=False, default="")
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.UniqueConstraint("entity", "entity_id", name="uq_search_entity_id"),
+        db.Index("ix_search_documents_entity_league", "entity", "league"),
+    )
+
+    def __repr__(self):
+        return f"<SearchDocument {self.entity}#{self.entity_id} {self.title[:30]}>"
+
+
+# Index full-text theo dialect - chay idempotent trong ensure_search_index()
+SEARCH_DDL = {
+    "sqlite": [
+        # FTS5 external content: chi luu index, noi dung doc tu search_documents
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+        "title, body, content='search_documents', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+        "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+        "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+        "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    ],
+    "postgresql": [
+        "CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents "
+        "USING gin (to_tsvector('simple', title || ' ' || body))",
+    ],
+    # pg_trgm can quyen CREATE EXTENSION -> thieu thi chi dung tsvector
+    "postgresql_optional": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_search_documents_title_trgm ON search_documents "
+        "USING gin (title gin_trgm_ops)",
+    ],
+}
@@ -62,6 +62,7 @@ class Standing(db.Model):
             "league", "season", "group", "club_id",
             name="uq_standing_league_season_group_club"
         ),
+        db.Index("ix_standings_league_season_group_position", "league", "season", "group", "position"),
     )
 
     def to_dict(self):
@@ -87,20 +87,24 @@ class Statistic(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("player_id", "league", "season", name="uq_stat_player_league_season"),
+        # Top ghi ban / kien tao (sort pho bien nhat cua /api/statistics/players)
+        db.Index("ix_statistics_league_season_goals", "league", "season", "goals", "id"),
+        db.Index("ix_statistics_league_season_assists", "league", "season", "assists", "id"),
     )
 
     def to_dict(self):
+        player, club = self.player, self.club
         return {
             "id": self.id,
             "league": self.league,
             "season": self.season,
             "player_id": self.player_id,
-            "player_name": self.player.name if self.player else None,
-            "player_photo": self.player.photo_url if self.player else None,
-            "player_position": self.player.position if self.player else None,
+            "player_name": player.name if player else None,
+            "player_photo": player.photo_url if player else None,
+            "player_position": player.position if player else None,
             "club_id": self.club_id,
-            "club_name": self.club.name if self.club else None,
-            "club_badge": self.club.badge_url if self.club else None,
+            "club_name": club.name if club else None,
+            "club_badge": club.badge_url if club else None,
             # Attack
             "appearances": self.appearances,
             "starts": self.starts,
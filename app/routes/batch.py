@@ -0,0 +1,86 @@
+"""
+app/routes/batch.py - Gop nhieu GET /api/* cua 1 trang vao 1 request
+
+POST /api/batch  {"requests": ["/api/standings/?league=PL", {"path": "/api/matches/live", "etag": "\\"...\\""}]}
+  -> {"responses": [{"path", "status", "etag", "body"}, ...]}   (cung thu tu)
+
+Moi request con chay qua dung view (cache @cached / snapshot, ETag -> 304, query
+budget) trong app context + DB session cua request batch; body JSON da serialize
+cua request con duoc nhung thang, khong parse lai.
+"""
+import logging
+
+from flask import Blueprint, current_app, request
+
+from app.extensions import db
+from app.services.serializers import json_response, raw_json
+
+logger = logging.getLogger(__name__)
+
+batch_bp = Blueprint("batch", __name__)
+
+MAX_REQUESTS = 20
+# Header cua client chuyen xuong request con (dang nhap, ngon ngu)
+FORWARD_HEADERS = ("Authorization", "Cookie", "Accept-Language", "User-Agent")
+# Khong chay qua batch: de quy / stream giu ket noi
+EXCLUDED_PATHS = ("/api/batch", "/api/matches/live/stream")
+
+
+def _parse(item):
+    if isinstance(item, str):
+        return item, None
+    if isinstance(item, dict):
+        return item.get("path"), item.get("etag")
+    return None, None
+
+
+def _allowed(path) -> bool:
+    if not isinstance(path, str) or not path.startswith("/api/"):
+        return False
+    base = path.split("?", 1)[0].rstrip("/")
+    return base not in EXCLUDED_PATHS
+
+
+def _run(path: str, etag, headers) -> dict:
+    app = current_app._get_current_object()
+    sub_headers = dict(headers)
+    if etag:
+        sub_headers["If-None-Match"] = etag
+    # Request context long trong app context hien tai -> dung chung db.session
+    with app.test_request_context(path, method="GET", headers=sub_headers, base_url=request.url_root):
+        try:
+            resp = app.full_dispatch_request()
+        except Exception as e:
+            logger.error(f"[Batch] {path} failed: {e}")
+            db.session.rollback()            # Session dung chung voi cac request con sau
+            resp = app.handle_exception(e)   # TESTING / PROPAGATE_EXCEPTIONS -> raise lai
+        result = {"path": path, "status": resp.status_code, "etag": resp.headers.get("ETag")}
+        if resp.status_code != 304:
+            data = resp.get_data()
+            if resp.is_json and data:
+                result["body"] = raw_json(data)
+            elif resp.status_code >= 400:
+                result["body"] = {"error": resp.status}    # trang loi HTML mac dinh cua Flask
+            else:
+                result["body"] = data.decode("utf-8", "replace")
+    return result
+
+
+@batch_bp.route("", methods=["POST"])
+def batch():
+    items = (request.get_json(silent=True) or {}).get("requests")
+    if not isinstance(items, list) or not items:
+        return json_response({"error": "Body must be {\"requests\": [path, ...]}"}, 400)
+    if len(items) > MAX_REQUESTS:
+        return json_response({"error": f"At most {MAX_REQUESTS} requests per batch"}, 400)
+
+    headers = {h: request.headers[h] for h in FORWARD_HEADERS if h in request.headers}
+    responses = []
+    for item in items:
+        path, etag = _parse(item)
+        if not _allowed(path):
+            responses.append({"path": path, "status": 400, "etag": None,
+                              "body": {"error": "Only GET /api/* paths can be batched"}})
+            continue
+        responses.append(_run(path, etag, headers))
+    return json_response({"responses": responses})
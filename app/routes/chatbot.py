@@ -268,9 +268,8 @@ DỮ LIỆU THỰC TẾ:
 
 
 def _normalize(text: str) -> str:
-    import unicodedata
-    nfd = unicodedata.normalize("NFD", text.lower())
-    return "".join(c for c in nfd if unicodedata.category(c) != "Mn")
+    from app.services.search import fold
+    return fold(text)
 
 
 def _keyword_fallback(msg: str, league: str) -> str:
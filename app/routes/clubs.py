@@ -3,12 +3,15 @@ app/routes/clubs.py - API câu lạc bộ
 """
 from flask import Blueprint, request, jsonify
 from app.models import Club
-from app.extensions import cache
+from app.services.query_budget import query_budget
+from app.services.cache_tags import cached, league_tags, tagged
+from app.services.search import hydrate, search_ids
 
 clubs_bp = Blueprint("clubs", __name__)
 
 @clubs_bp.route("/", methods=["GET"])
-@cache.cached(timeout=600, query_string=True)
+@query_budget(1)
+@cached(timeout=6 * 3600, tags=league_tags("clubs"))
 def get_clubs():
     league = request.args.get("league", "PL").upper()
     season = request.args.get("season", "2025")
@@ -17,6 +20,8 @@ def get_clubs():
     return jsonify({"items": [c.to_dict() for c in items], "total": len(items)})
 
 @clubs_bp.route("/<int:club_id>", methods=["GET"])
+@query_budget(2)
+@tagged(lambda club_id: [f"clubs#{club_id}", "clubs#*", "players"])
 def get_club(club_id):
     c = Club.query.get_or_404(club_id)
     include_players = request.args.get("players", "false").lower() == "true"
@@ -35,11 +40,11 @@ def get_club(club_id):
     return jsonify(data)
 
 @clubs_bp.route("/search", methods=["GET"])
+@query_budget(2)
+@tagged(league_tags("clubs", default=""))
 def search_clubs():
     q_str = request.args.get("q", "").strip()
     league = request.args.get("league", "").upper()
     if not q_str: return jsonify({"items": []})
-    q = Club.query.filter(Club.name.ilike(f"%{q_str}%"))
-    if league: q = q.filter_by(league=league)
-    items = q.limit(10).all()
-    return jsonify({"items": [c.to_dict() for c in items]})
\ No newline at end of file
+    ids = search_ids(q_str, ["clubs"], league=league, limit=10)["clubs"]
+    return jsonify({"items": hydrate("clubs", ids)})
\ No newline at end of file
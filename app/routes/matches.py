@@ -1,72 +1,103 @@
 """
 app/routes/matches.py - API trận đấu
 """
-from flask import Blueprint, request, jsonify
-from app.models import Match
-from app.extensions import cache
+from flask import Blueprint, current_app, request, jsonify, stream_with_context
+from app.extensions import db
+from app.models import BracketMatchup, Match
+from app.services.query_budget import query_budget
+from app.services.pagination import paginated_response
+from app.services.serializers import MATCH_LIST, json_response
+from app.services.cache_tags import cached, league_tags, tagged
+from app.services.snapshots import snapshot
+from app.services.live_stream import get_broadcaster, stream_settings
 
 matches_bp = Blueprint("matches", __name__)
 
 @matches_bp.route("/", methods=["GET"])
+@query_budget(3)
+@tagged(league_tags("matches"))
 def get_matches():
     league    = request.args.get("league", "PL").upper()
     season    = request.args.get("season", "2025")
     status    = request.args.get("status", "").upper()
     matchweek = request.args.get("matchweek", type=int)
-    page      = max(1, int(request.args.get("page", 1)))
-    per_page  = min(int(request.args.get("per_page", 20)), 100)
-
-    q = Match.query.filter_by(league=league, season=season)
-    if status:    q = q.filter(Match.status == status)
-    if matchweek: q = q.filter(Match.matchweek == matchweek)
-    q = q.order_by(Match.kickoff_at.asc())
-    p = q.paginate(page=page, per_page=per_page, error_out=False)
-    return jsonify({
-        "items": [m.to_dict() for m in p.items],
-        "total": p.total, "page": p.page, "pages": p.pages
-    })
+
+    proj = MATCH_LIST.only(request.args.get("fields"))
+    q = proj.select().where(Match.league == league, Match.season == season)
+    if status:    q = q.where(Match.status == status)
+    if matchweek: q = q.where(Match.matchweek == matchweek)
+    return paginated_response(proj, q, Match.kickoff_at, Match.id, sort_name="kickoff_at")
 
 @matches_bp.route("/live", methods=["GET"])
-@cache.cached(timeout=15, query_string=True)
+@query_budget(1)
+@cached(timeout=600, tags=league_tags("matches", default=""))
 def get_live():
     league = request.args.get("league", "").upper()
-    q = Match.query.filter_by(status="LIVE")
-    if league: q = q.filter_by(league=league)
-    items = q.order_by(Match.kickoff_at.asc()).all()
-    return jsonify({"items": [m.to_dict() for m in items], "count": len(items)})
+    proj = MATCH_LIST.only(request.args.get("fields"))
+    q = proj.select().where(Match.status == "LIVE")
+    if league: q = q.where(Match.league == league)
+    items = proj.rows(db.session.execute(q.order_by(Match.kickoff_at.asc())).all())
+    return json_response({"items": items, "count": len(items)})
+
+@matches_bp.route("/live/stream", methods=["GET"])
+@query_budget(1)
+def stream_live():
+    """SSE: snapshot tran live roi delta ti so / phut / status (xem app/services/live_stream.py)."""
+    league = request.args.get("league", "").upper()
+    settings = stream_settings()
+    broadcaster = get_broadcaster()
+    broadcaster.ensure_loaded()
+    sub = broadcaster.subscribe(league, settings["max_clients"])
+    if sub is None:
+        # Client quay ve poll /live
+        resp = json_response({"error": "Too many live stream connections"}, 503)
+        resp.headers["Retry-After"] = "60"
+        return resp
+    body = broadcaster.events(sub, settings["heartbeat"], settings["max_age"])
+    resp = current_app.response_class(stream_with_context(body), mimetype="text/event-stream")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"     # nginx / proxy khong duoc buffer
+    return resp
 
 @matches_bp.route("/<int:match_id>", methods=["GET"])
-@cache.cached(timeout=30)
+@query_budget(3)
+@cached(timeout=3600, tags=lambda match_id: [f"matches#{match_id}", "matches#*"], query_string=False)
 def get_match(match_id):
     m = Match.query.get_or_404(match_id)
     return jsonify(m.to_dict())
 
 @matches_bp.route("/upcoming", methods=["GET"])
-@cache.cached(timeout=300, query_string=True)
+@query_budget(1)
+@cached(timeout=60, tags=league_tags("matches"), max_age=60)   # Tran qua gio kickoff roi khoi danh sach
 def get_upcoming():
     from datetime import datetime, timezone
     league = request.args.get("league", "PL").upper()
     limit = min(int(request.args.get("limit", 5)), 20)
-    items = (Match.query
-             .filter_by(league=league, season="2025", status="SCHEDULED")
-             .filter(Match.kickoff_at >= datetime.now(timezone.utc))
-             .order_by(Match.kickoff_at.asc())
-             .limit(limit).all())
-    return jsonify({"items": [m.to_dict() for m in items]})
+    proj = MATCH_LIST.only(request.args.get("fields"))
+    q = (proj.select()
+         .where(Match.league == league, Match.season == "2025", Match.status == "SCHEDULED")
+         .where(Match.kickoff_at >= datetime.now(timezone.utc))
+         .order_by(Match.kickoff_at.asc())
+         .limit(limit))
+    return json_response({"items": proj.rows(db.session.execute(q).all())})
 
 @matches_bp.route("/results", methods=["GET"])
-@cache.cached(timeout=120, query_string=True)
+@query_budget(1)
+@cached(timeout=3600, tags=league_tags("matches"))
 def get_results():
     league = request.args.get("league", "PL").upper()
     limit = min(int(request.args.get("limit", 10)), 50)
     matchweek = request.args.get("matchweek", type=int)
-    q = (Match.query.filter_by(league=league, season="2025", status="FT")
+    proj = MATCH_LIST.only(request.args.get("fields"))
+    q = (proj.select()
+         .where(Match.league == league, Match.season == "2025", Match.status == "FT")
          .order_by(Match.kickoff_at.desc()))
-    if matchweek: q = q.filter_by(matchweek=matchweek)
-    items = q.limit(limit).all()
-    return jsonify({"items": [m.to_dict() for m in items]})
+    if matchweek: q = q.where(Match.matchweek == matchweek)
+    return json_response({"items": proj.rows(db.session.execute(q.limit(limit)).all())})
 
 @matches_bp.route("/rounds", methods=["GET"])
+@query_budget(3)
+@snapshot("rounds", entity="matches", tags=league_tags("matches"))
 def get_rounds():
     """Tra ve danh sach vong dau + current_round tro ve vong sap toi."""
     from app.extensions import db
@@ -119,116 +150,34 @@ def get_rounds():
         "current_round": current_round
     })
 
+BRACKET_STAGE_LABELS = {
+    "playoff": "Playoff",
+    "1/8": "Vòng 1/8",
+    "1/4": "Tứ kết",
+    "1/2": "Bán kết",
+    "final": "Chung kết",
+}
+
 @matches_bp.route("/bracket", methods=["GET"])
+@query_budget(1)
+@snapshot("bracket", entity="bracket", tags=league_tags("bracket", default="UCL"), leagues=("UCL",),
+          default_league="UCL")
 def get_bracket():
-    """UCL knockout bracket tu FotMob playoff API."""
-    import requests, urllib3
-    urllib3.disable_warnings()
+    """UCL knockout bracket - bang bracket_matchups (scheduler cao tu FotMob playoff)."""
     league = request.args.get("league", "UCL").upper()
     if league != "UCL":
         return jsonify({"error": "Only UCL bracket available"}), 400
-
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36",
-        "Accept": "application/json",
-        "Referer": "https://www.fotmob.com/",
-    }
-    try:
-        r = requests.get("https://www.fotmob.com/api/data/leagues?id=42",
-                         headers=headers, verify=False, timeout=15)
-        data = r.json()
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-    playoff = data.get("playoff", {})
-    rounds_raw = playoff.get("rounds", [])
-
-    STAGE_LABELS = {
-        "playoff": "Playoff",
-        "1/8": "Vòng 1/8",
-        "1/4": "Tứ kết",
-        "1/2": "Bán kết",
-        "final": "Chung kết",
-    }
-
-    def badge(team_id):
-        if not team_id: return ""
-        return f"https://images.fotmob.com/image_resources/logo/teamlogo/{team_id}_small.png"
-
-    rounds = []
-    for rnd in rounds_raw:
-        stage = rnd.get("stage", "")
-        matchups_raw = rnd.get("matchups", [])
-        matchups = []
-        for mu in matchups_raw:
-            h_id = mu.get("homeTeamId")
-            a_id = mu.get("awayTeamId")
-            agg  = mu.get("aggregatedResult") or {}
-            winner = mu.get("aggregatedWinner")
-            loser  = mu.get("aggregatedLoser")
-
-            matches = []
-            for i, m in enumerate(mu.get("matches", [])):
-                mh = m.get("home", {})
-                ma = m.get("away", {})
-                st = m.get("status", {})
-                finished = st.get("finished", False)
-                started  = st.get("started", False)
-                score_str = st.get("scoreStr", "")
-                hs, as_ = None, None
-                if score_str:
-                    norm = score_str.replace(" ","").replace("-",":")
-                    if ":" in norm:
-                        parts = norm.split(":")
-                        try: hs, as_ = int(parts[0]), int(parts[1])
-                        except: pass
-                matches.append({
-                    "match_id":   m.get("matchId"),
-                    "leg":        i + 1,
-                    "kickoff":    st.get("utcTime"),
-                    "status":     "FT" if finished else ("LIVE" if started else "SCHEDULED"),
-                    "home_name":  mh.get("name",""),
-                    "home_short": mh.get("shortName",""),
-                    "home_id":    mh.get("id"),
-                    "home_score": hs,
-                    "away_name":  ma.get("name",""),
-                    "away_short": ma.get("shortName",""),
-                    "away_id":    ma.get("id"),
-                    "away_score": as_,
-                    "home_winner": mh.get("winner", False),
-                    "away_winner": ma.get("winner", False),
-                })
-
-            tbd1 = mu.get("tbdTeam1", False)
-            tbd2 = mu.get("tbdTeam2", False)
-            home_name = mu.get("homeTeam") or (mu.get("homeTeamPlaceholder") if tbd1 else None)
-            away_name = mu.get("awayTeam") or (mu.get("awayTeamPlaceholder") if tbd2 else None)
-
-            matchups.append({
-                "draw_order":  mu.get("drawOrder"),
-                "home_id":     h_id,
-                "home_name":   home_name or "",
-                "home_short":  mu.get("homeTeamShortName",""),
-                "home_badge":  badge(h_id),
-                "away_id":     a_id,
-                "away_name":   away_name or "",
-                "away_short":  mu.get("awayTeamShortName",""),
-                "away_badge":  badge(a_id),
-                "agg_home":    agg.get("homeScore"),
-                "agg_away":    agg.get("awayScore"),
-                "winner_id":   (winner if isinstance(winner, int) else winner.get("id")) if winner else None,
-                "winner_name": (None if isinstance(winner, int) else winner.get("name")) if winner else None,
-                "loser_id":    (loser if isinstance(loser, int) else loser.get("id")) if loser else None,
-                "tbd_home":    tbd1,
-                "tbd_away":    tbd2,
-                "best_of":     mu.get("bestOf", 2),
-                "matches":     matches,
-            })
-
-        rounds.append({
-            "stage": stage,
-            "label": STAGE_LABELS.get(stage, stage),
-            "matchups": matchups,
-        })
-
-    return jsonify({"rounds": rounds, "type": playoff.get("type","")})
\ No newline at end of file
+    season = request.args.get("season", current_app.config.get("CURRENT_SEASON_UCL", "2025"))
+
+    items = (BracketMatchup.query.filter_by(league=league, season=season)
+             .order_by(BracketMatchup.stage_order.asc(), BracketMatchup.draw_order.asc()).all())
+    rounds, by_stage = [], {}
+    for mu in items:
+        rnd = by_stage.get(mu.stage)
+        if rnd is None:
+            rnd = by_stage[mu.stage] = {"stage": mu.stage,
+                                        "label": BRACKET_STAGE_LABELS.get(mu.stage, mu.stage),
+                                        "matchups": []}
+            rounds.append(rnd)
+        rnd["matchups"].append(mu.to_dict())
+    return jsonify({"rounds": rounds, "type": (items[0].bracket_type or "") if items else ""})
\ No newline at end of file
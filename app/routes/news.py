@@ -2,55 +2,62 @@
 app/routes/news.py - API tin tức
 """
 from flask import Blueprint, request, jsonify
-from flask_caching import Cache
+from app.extensions import db
 from app.models import News
-from app.extensions import cache
+from app.services.pagination import paginated_response
+from app.services.serializers import NEWS_LIST, json_response
+from app.services.cache_tags import cached, league_tags, tagged
+from app.services.query_budget import query_budget
+from app.services.search import hydrate, search_ids
 
 news_bp = Blueprint("news", __name__)
 
-def _paginate(q, page, per_page=20):
-    p = q.paginate(page=page, per_page=per_page, error_out=False)
-    return {
-        "items": [i.to_dict() for i in p.items],
-        "total": p.total, "page": p.page,
-        "pages": p.pages, "per_page": per_page
-    }
+def _paginate(proj, q, per_page=20):
+    return paginated_response(proj, q, News.published_at, News.id, desc=True,
+                              sort_name="published_at", default_per_page=per_page)
 
 @news_bp.route("/", methods=["GET"])
-@cache.cached(timeout=300, query_string=True)
+@query_budget(3)
+@cached(timeout=3600, tags=league_tags("news"))
 def get_news():
     league = request.args.get("league", "PL").upper()
     season = request.args.get("season", "2025")
     category = request.args.get("category")
-    page = int(request.args.get("page", 1))
-    q = News.query.filter_by(league=league, season=season)
-    if category: q = q.filter_by(category=category)
-    q = q.order_by(News.published_at.desc())
-    return jsonify(_paginate(q, page))
+    proj = NEWS_LIST.only(request.args.get("fields"))
+    q = proj.select().where(News.league == league, News.season == season)
+    if category: q = q.where(News.category == category)
+    return _paginate(proj, q)
 
 @news_bp.route("/<int:news_id>", methods=["GET"])
-@cache.cached(timeout=600)
+@query_budget(1)
+@cached(timeout=6 * 3600, tags=lambda news_id: [f"news#{news_id}", "news#*"], query_string=False)
 def get_news_detail(news_id):
     n = News.query.get_or_404(news_id)
     return jsonify(n.to_dict(full=True))
 
 @news_bp.route("/search", methods=["GET"])
+@query_budget(2)
+@tagged(league_tags("news", default=""))
 def search_news():
+    """Full-text (xep theo do lien quan, khong phan biet dau) - xem app/services/search.py"""
     q_str = request.args.get("q", "").strip()
     league = request.args.get("league", "").upper()
-    page = int(request.args.get("page", 1))
+    page = max(1, request.args.get("page", 1, type=int))
+    per_page = max(1, min(request.args.get("per_page", 10, type=int), 50))
     if not q_str:
         return jsonify({"items": [], "total": 0})
-    q = News.query.filter(News.title.ilike(f"%{q_str}%"))
-    if league: q = q.filter_by(league=league)
-    q = q.order_by(News.published_at.desc())
-    return jsonify(_paginate(q, page, per_page=10))
+    ids = search_ids(q_str, ["news"], league=league, limit=per_page + 1, offset=(page - 1) * per_page)["news"]
+    items = hydrate("news", ids[:per_page], request.args.get("fields"))
+    return json_response({"items": items, "page": page, "per_page": per_page,
+                          "has_more": len(ids) > per_page})
 
 @news_bp.route("/latest", methods=["GET"])
-@cache.cached(timeout=120, query_string=True)
+@query_budget(1)
+@cached(timeout=3600, tags=league_tags("news"))
 def get_latest():
     league = request.args.get("league", "PL").upper()
     limit = min(int(request.args.get("limit", 6)), 20)
-    items = (News.query.filter_by(league=league, season="2025")
-             .order_by(News.published_at.desc()).limit(limit).all())
-    return jsonify({"items": [n.to_dict() for n in items]})
\ No newline at end of file
+    proj = NEWS_LIST.only(request.args.get("fields"))
+    q = (proj.select().where(News.league == league, News.season == "2025")
+         .order_by(News.published_at.desc()).limit(limit))
+    return json_response({"items": proj.rows(db.session.execute(q).all())})
\ No newline at end of file
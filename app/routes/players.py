@@ -1,40 +1,47 @@
 """app/routes/players.py"""
 from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import joinedload
+from app.extensions import db
 from app.models import Player, Club
-from app.extensions import cache
+from app.services.query_budget import query_budget
+from app.services.cache_tags import league_tags, tagged
+from app.services.pagination import paginated_response
+from app.services.search import hydrate, search_ids
+from app.services.serializers import PLAYER_LIST, json_response
 
 players_bp = Blueprint("players", __name__)
 
 @players_bp.route("/", methods=["GET"])
+@query_budget(4)
+@tagged(league_tags("players", "clubs"))
 def get_players():
     league   = request.args.get("league", "PL").upper()
     season   = request.args.get("season", "2025")
     position = request.args.get("position", "").upper()
     club_sid = request.args.get("club_source_id", "")
     club_id  = request.args.get("club_id", type=int)
-    page     = max(1, int(request.args.get("page", 1)))
-    per_page = min(int(request.args.get("per_page", 48)), 200)
 
-    q = Player.query.filter_by(league=league, season=season)
+    proj = PLAYER_LIST.only(request.args.get("fields"))
+    q = proj.select().where(Player.league == league, Player.season == season)
     if position:
-        q = q.filter_by(position=position)
+        q = q.where(Player.position == position)
     if club_id:
-        q = q.filter_by(club_id=club_id)
+        q = q.where(Player.club_id == club_id)
     elif club_sid:
-        club = Club.query.filter_by(source_id=club_sid, league=league).first()
-        if club:
-            q = q.filter_by(club_id=club.id)
+        found = db.session.execute(
+            db.select(Club.id).where(Club.source_id == club_sid, Club.league == league)
+        ).scalar()
+        if found:
+            q = q.where(Player.club_id == found)
 
-    q = q.order_by(Player.name.asc())
-    p = q.paginate(page=page, per_page=per_page, error_out=False)
-    return jsonify({
-        "items": [pl.to_dict() for pl in p.items],
-        "total": p.total, "page": p.page, "pages": p.pages
-    })
+    return paginated_response(proj, q, Player.name, Player.id, sort_name="name",
+                              default_per_page=48, max_per_page=200)
 
 @players_bp.route("/<int:player_id>", methods=["GET"])
+@query_budget(3)
+@tagged(lambda player_id: ["players#*", "clubs"])
 def get_player(player_id):
-    pl = Player.query.get_or_404(player_id)
+    pl = Player.query.options(joinedload(Player.club)).get_or_404(player_id)
     data = pl.to_dict(include_stats=True)
     # Flatten stats vao root
     stats = pl.statistics.filter_by(league=pl.league, season=pl.season).first()
@@ -43,13 +50,13 @@ def get_player(player_id):
     return jsonify(data)
 
 @players_bp.route("/search", methods=["GET"])
+@query_budget(2)
+@tagged(league_tags("players", "clubs"))
 def search_players():
     q_str  = request.args.get("q", "").strip()
     league = request.args.get("league", "PL").upper()
     if not q_str:
         return jsonify({"items": [], "total": 0})
-    players = (Player.query
-               .filter_by(league=league)
-               .filter(Player.name.ilike(f"%{q_str}%"))
-               .limit(10).all())
-    return jsonify({"items": [p.to_dict() for p in players], "total": len(players)})
\ No newline at end of file
+    ids = search_ids(q_str, ["players"], league=league, limit=10)["players"]
+    items = hydrate("players", ids, request.args.get("fields"))
+    return json_response({"items": items, "total": len(items)})
\ No newline at end of file
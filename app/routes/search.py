@@ -0,0 +1,42 @@
+"""
+app/routes/search.py - Tim kiem chung (tin tuc + cau thu + CLB) trong 1 request
+"""
+from flask import Blueprint, request
+from app.services.autocomplete import ENTITIES as SUGGEST_ENTITIES, get_index
+from app.services.cache_tags import cached, league_tags, tagged
+from app.services.query_budget import query_budget
+from app.services.search import SEARCHABLE, hydrate, search_ids
+from app.services.serializers import json_response
+
+search_bp = Blueprint("search", __name__)
+
+@search_bp.route("/", methods=["GET"])
+@query_budget(1 + len(SEARCHABLE))
+@cached(timeout=600, tags=league_tags(*SEARCHABLE, default=""))
+def search_all():
+    """?q=mbappe[&league=UCL][&types=news,players][&limit=5] -> {news, players, clubs}"""
+    q_str  = request.args.get("q", "").strip()
+    league = request.args.get("league", "").upper()
+    limit  = max(1, min(request.args.get("limit", 5, type=int), 20))
+    types  = [t for t in request.args.get("types", ",".join(SEARCHABLE)).split(",") if t in SEARCHABLE]
+
+    ids = search_ids(q_str, types, league=league, limit=limit)
+    payload = {"query": q_str}
+    payload.update({entity: hydrate(entity, ids.get(entity, [])) for entity in types})
+    return json_response(payload)
+
+@search_bp.route("/suggest", methods=["GET"])
+@query_budget(4)       # chi khi nap / nap lai index; binh thuong 0 query
+@tagged(league_tags(*SUGGEST_ENTITIES, default=""))
+def suggest():
+    """Autocomplete ten cau thu / CLB tu index trong RAM: ?q=mba[&league=PL][&types=players]"""
+    q_str  = request.args.get("q", "").strip()
+    league = request.args.get("league", "").upper()
+    limit  = max(1, min(request.args.get("limit", 8, type=int), 20))
+    types  = [t for t in request.args.get("types", ",".join(SUGGEST_ENTITIES)).split(",") if t in SUGGEST_ENTITIES]
+
+    index = get_index()
+    index.ensure_fresh()
+    payload = {"query": q_str}
+    payload.update(index.suggest(q_str, types, league=league, limit=limit))
+    return json_response(payload)
@@ -3,10 +3,15 @@ app/routes/standings.py - API bảng xếp hạng
 """
 from flask import Blueprint, request, jsonify
 from app.models import Standing
+from app.services.cache_tags import league_tags
+from app.services.snapshots import snapshot
+from app.services.query_budget import query_budget
 
 standings_bp = Blueprint("standings", __name__)
 
 @standings_bp.route("/", methods=["GET"])
+@query_budget(1)
+@snapshot("standings", entity="standings", tags=league_tags("standings"))
 def get_standings():
     league = request.args.get("league", "PL").upper()
     season = request.args.get("season", "2025")
@@ -17,6 +22,9 @@ def get_standings():
     return jsonify({"items": [s.to_dict() for s in items], "total": len(items)})
 
 @standings_bp.route("/groups", methods=["GET"])
+@query_budget(1)
+@snapshot("standings_groups", entity="standings", tags=lambda: ["standings:UCL"], leagues=("UCL",),
+          default_league="UCL")
 def get_groups():
     """UCL: trả về dict {group: [teams]}"""
     season = request.args.get("season", "2025")
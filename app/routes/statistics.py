@@ -1,7 +1,12 @@
 """app/routes/statistics.py"""
 from flask import Blueprint, request, jsonify
-from app.models import Statistic, TeamStatistic
+from app.models import Player, Statistic, TeamStatistic
 from app.extensions import db
+from app.services.cache_tags import league_tags, tagged
+from app.services.snapshots import snapshot
+from app.services.query_budget import query_budget
+from app.services.pagination import paginated_response
+from app.services.serializers import STATISTIC_LIST
 
 statistics_bp = Blueprint("statistics", __name__)
 
@@ -12,37 +17,35 @@ VALID_SORTS = {
 }
 
 @statistics_bp.route("/players", methods=["GET"])
+@query_budget(3)
+@tagged(league_tags("players"))
 def get_player_stats():
     league   = request.args.get("league", "PL").upper()
     season   = request.args.get("season", "2025")
     sort_by  = request.args.get("sort", "goals")
     position = request.args.get("position", "").upper()
-    page     = max(1, int(request.args.get("page", 1)))
-    per_page = min(int(request.args.get("per_page", 50)), 200)
 
     if sort_by not in VALID_SORTS:
         sort_by = "goals"
 
     col = getattr(Statistic, sort_by, Statistic.goals)
 
-    q = (db.session.query(Statistic)
-         .filter(Statistic.league == league, Statistic.season == season)
-         .filter(col > 0))
+    # Projection da JOIN players + clubs -> loc position truc tiep
+    proj = STATISTIC_LIST.only(request.args.get("fields"))
+    q = (proj.select()
+         .where(Statistic.league == league, Statistic.season == season)
+         .where(col > 0))
 
     if position:
-        from app.models import Player
-        q = q.join(Player, Statistic.player_id == Player.id).filter(Player.position == position)
+        q = q.where(Player.position == position)
 
-    q = q.order_by(col.desc())
-    p = q.paginate(page=page, per_page=per_page, error_out=False)
-
-    return jsonify({
-        "items": [s.to_dict() for s in p.items],
-        "total": p.total, "page": p.page, "pages": p.pages,
-        "sort_by": sort_by, "league": league
-    })
+    return paginated_response(proj, q, col, Statistic.id, desc=True, sort_name=sort_by,
+                              default_per_page=50, max_per_page=200,
+                              extra={"sort_by": sort_by, "league": league})
 
 @statistics_bp.route("/teams", methods=["GET"])
+@query_budget(1)
+@snapshot("team_stats", entity="team_stats", tags=league_tags("team_stats"))
 def get_team_stats():
     league  = request.args.get("league", "PL").upper()
     season  = request.args.get("season", "2025")
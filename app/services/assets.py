@@ -0,0 +1,91 @@
+"""
+app/services/assets.py
+Static da fingerprint (build bang scripts/build_assets.py -> static/dist + manifest.json):
+
+  {{ asset_url('js/api.js') }}  -> /static/dist/js/api.<hash>.js   (chua build -> /static/js/api.js)
+  GET /static/dist/<file>       Cache-Control: public, max-age=1 nam, immutable;
+                                tra file .br / .gz nen san neu client nhan
+
+Manifest nap 1 lan khi khoi dong. Entry co file nguon da sua ma chua build lai
+(sha1 khac) bi bo qua -> van phuc vu file goc, khong tra JS / CSS cu.
+DEBUG (development) luon dung file goc.
+"""
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+from typing import Dict
+
+from flask import current_app, send_from_directory, url_for
+
+from app.services.compression import choose_encoding
+
+logger = logging.getLogger(__name__)
+
+DIST_DIR = "dist"
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+_PRECOMPRESSED = {"br": ".br", "gzip": ".gz"}
+
+_manifest: Dict[str, str] = {}       # "js/api.js" -> "js/api.<hash>.js"
+
+
+def load_manifest(static_folder: str) -> Dict[str, str]:
+    path = os.path.join(static_folder, DIST_DIR, "manifest.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            files = json.load(f)["files"]
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"[Assets] Bad manifest {path}: {e}")
+        return {}
+    fresh, stale = {}, []
+    for name, info in files.items():
+        try:
+            with open(os.path.join(static_folder, name), "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            digest = None
+        if digest == info.get("sha1"):
+            fresh[name] = info["url"]
+        else:
+            stale.append(name)
+    if stale:
+        logger.warning(f"[Assets] Rebuild needed (python scripts/build_assets.py): {', '.join(stale)}")
+    return fresh
+
+
+def asset_url(filename: str) -> str:
+    """URL fingerprint cua file trong static/, fallback URL static thuong."""
+    url = _manifest.get(filename)
+    if url is None:
+        return url_for("static", filename=filename)
+    return url_for("dist_static", filename=url)
+
+
+def serve_dist(filename: str):
+    root = os.path.join(current_app.static_folder, DIST_DIR)
+    available = [enc for enc, suffix in _PRECOMPRESSED.items()
+                 if os.path.isfile(os.path.join(root, filename + suffix))]
+    encoding = choose_encoding(available) if available else None
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    resp = send_from_directory(root, filename + _PRECOMPRESSED[encoding] if encoding else filename,
+                               mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    if available:
+        resp.vary.add("Accept-Encoding")
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+def init_assets(app):
+    global _manifest
+    _manifest = {} if app.debug else load_manifest(app.static_folder)
+    if _manifest:
+        logger.info(f"[Assets] Serving {len(_manifest)} fingerprinted asset(s)")
+    app.add_url_rule(f"{app.static_url_path}/{DIST_DIR}/<path:filename>",
+                     endpoint="dist_static", view_func=serve_dist)
+    app.add_template_global(asset_url)
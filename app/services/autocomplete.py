@@ -0,0 +1,262 @@
+"""
+app/services/autocomplete.py
+Goi y ten cau thu / CLB trong RAM cho o tim kiem (khong query DB moi phim go):
+
+  prefix trie   token da fold -> entry   ("mba" -> Mbappé, "kylian mb" -> giao cac token)
+  trigram       fallback khi go sai / thieu ("mbape" -> Mbappé)
+
+Index theo mua hien tai, nap lazy lan dau. Giu moi nhat bang:
+  - signal data_changed (process cua DBWriter): cap nhat dung cac id / league vua ghi
+  - tag version "players:<LG>" / "clubs:<LG>" (process web khac): league nao doi
+    version -> nap lai rieng league do
+"""
+import logging
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Club, Player
+from app.services.cache_tags import tag_versions
+from app.services.search import fold, tokens
+
+logger = logging.getLogger(__name__)
+
+ENTITIES = ("players", "clubs")
+PREFIX_CANDIDATES = 200       # Dung duyet trie sau ngan nay entry hop le
+TRIGRAM_MIN_SCORE = 0.3
+
+Key = Tuple[str, int]          # (entity, id)
+
+
+@dataclass
+class Entry:
+    entity: str
+    league: str
+    name: str                  # da fold
+    payload: Dict              # tra thang ra JSON
+    words: List[str] = field(default_factory=list)
+
+
+class _Node:
+    __slots__ = ("children", "keys")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.keys: Set[Key] = set()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AutocompleteIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[Key, Entry] = {}
+        self._root = _Node()
+        self._trigrams: Dict[str, Set[Key]] = {}
+        self._versions: Dict[str, str] = {}      # tag -> version luc nap
+        self._loaded = False
+
+    # ── Ghi ───────────────────────────────────────────────────────
+    def _add(self, key: Key, entry: Entry):
+        self._remove(key)
+        entry.words = list(dict.fromkeys(tokens(entry.name)))
+        self._entries[key] = entry
+        for word in entry.words:
+            node = self._root
+            for ch in word:
+                node = node.children.setdefault(ch, _Node())
+            node.keys.add(key)
+        for gram in _trigrams(entry.name):
+            self._trigrams.setdefault(gram, set()).add(key)
+
+    def _remove(self, key: Key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for word in entry.words:
+            node = self._root
+            for ch in word:
+                node = node.children.get(ch)
+                if node is None:
+                    break
+            else:
+                node.keys.discard(key)
+        for gram in _trigrams(entry.name):
+            self._trigrams.get(gram, set()).discard(key)
+
+    def _load(self, entity: str, where=None, drop: Optional[Iterable[Key]] = None) -> int:
+        """Doc lai entity tu DB (where) va thay cac entry cu (drop)."""
+        season = current_app.config.get("CURRENT_SEASON", "2025")
+        rows = list(_ROW_LOADERS[entity](season, where))
+        with self._lock:
+            for key in list(drop or ()):
+                self._remove(key)
+            for key, entry in rows:
+                self._add(key, entry)
+        return len(rows)
+
+    def _keys(self, entity: str, leagues: Iterable[str]) -> List[Key]:
+        leagues = set(leagues)
+        return [k for k, e in self._entries.items() if e.entity == entity and e.league in leagues]
+
+    def _remember_versions(self, leagues: Iterable[str]):
+        tags = [f"{e}:{lg}" for lg in leagues for e in ENTITIES]
+        if tags:
+            self._versions.update(tag_versions(tags))
+
+    def ensure_fresh(self):
+        """Nap lan dau; sau do nap lai league nao co tag version moi."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    for entity in ENTITIES:
+                        self._load(entity)
+                    self._remember_versions({e.league for e in self._entries.values()})
+                    self._loaded = True
+                    logger.info(f"[Autocomplete] Loaded {len(self._entries)} entries")
+            return
+        current = tag_versions(list(self._versions))
+        stale = {tag.split(":", 1)[1] for tag, v in current.items() if self._versions.get(tag) != v}
+        if stale:
+            self.reload_leagues(stale)
+
+    def reload_leagues(self, leagues: Iterable[str]):
+        leagues = sorted(set(leagues))
+        with self._lock:
+            for entity, model in (("players", Player), ("clubs", Club)):
+                self._load(entity, model.league.in_(leagues), drop=self._keys(entity, leagues))
+            self._remember_versions(leagues)
+        logger.debug(f"[Autocomplete] Reloaded {leagues}")
+
+    def apply_change(self, entity: str, leagues: Iterable[str], ids: Optional[List[int]]):
+        """Cap nhat tu signal data_changed: theo id neu co, khong thi ca league."""
+        if not self._loaded:
+            return
+        leagues = sorted({lg for lg in leagues or () if lg})
+        with self._lock:
+            if ids:
+                model = Player if entity == "players" else Club
+                self._load(entity, model.id.in_(ids), drop=[(entity, i) for i in ids])
+                if entity == "clubs":
+                    # Ten / logo CLB nam trong payload cau thu
+                    self._load("players", Player.club_id.in_(ids),
+                               drop=[k for k, e in self._entries.items()
+                                     if e.entity == "players" and e.payload.get("club_id") in ids])
+            elif leagues:
+                model = Player if entity == "players" else Club
+                self._load(entity, model.league.in_(leagues), drop=self._keys(entity, leagues))
+            self._remember_versions(leagues)
+
+    # ── Doc ───────────────────────────────────────────────────────
+    def _prefix(self, word: str, wanted: Callable[[Key], bool]) -> Set[Key]:
+        """Entry (qua loc wanted) co token bat dau bang `word`; BFS -> token ngan (khop sat) truoc."""
+        node = self._root
+        for ch in word:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        found: Set[Key] = set()
+        queue = deque([node])
+        while queue and len(found) < PREFIX_CANDIDATES:
+            node = queue.popleft()
+            found.update(k for k in node.keys if wanted(k))
+            queue.extend(node.children.values())
+        return found
+
+    def suggest(self, q: str, entities: Iterable[str] = ENTITIES, league: str = "",
+                limit: int = 8) -> Dict[str, List[Dict]]:
+        entities = [e for e in entities if e in ENTITIES]
+        result: Dict[str, List[Dict]] = {e: [] for e in entities}
+        words = tokens(q)
+        if not words:
+            return result
+        folded = " ".join(words)
+
+        def wanted(key: Key) -> bool:
+            entry = self._entries.get(key)
+            return entry is not None and entry.entity in entities and (not league or entry.league == league)
+
+        # Token dai nhat (it ung vien nhat) lay tu trie; cac token con lai loc tren entry
+        first, *rest = sorted(set(words), key=len, reverse=True)
+        with self._lock:
+            scored = []
+            for key in self._prefix(first, wanted):
+                entry = self._entries[key]
+                if all(any(w.startswith(r) for w in entry.words) for r in rest):
+                    scored.append((0 if entry.name.startswith(folded) else 1, len(entry.name), key))
+
+            if not scored:
+                grams = _trigrams(folded)
+                hits: Counter = Counter()
+                for gram in grams:
+                    hits.update(self._trigrams.get(gram, ()))
+                need = TRIGRAM_MIN_SCORE * len(grams)
+                scored = [(2, -n, k) for k, n in hits.most_common(PREFIX_CANDIDATES) if n >= need and wanted(k)]
+
+            for _, _, key in sorted(scored)[:limit * len(entities)]:
+                entry = self._entries[key]
+                if len(result[entry.entity]) < limit:
+                    result[entry.entity].append(entry.payload)
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "trigrams": len(self._trigrams),
+                    "leagues": sorted({e.league for e in self._entries.values()})}
+
+
+# ── Nap tu DB ─────────────────────────────────────────────────────
+def _player_rows(season: str, where=None):
+    stmt = (select(Player.id, Player.league, Player.name, Player.photo_url, Player.nationality,
+                   Player.position, Player.club_id, Club.name, Club.badge_url)
+            .outerjoin(Club, Club.id == Player.club_id)
+            .where(Player.season == season))
+    if where is not None:
+        stmt = stmt.where(where)
+    for pid, league, name, photo, nationality, position, club_id, club_name, badge in db.session.execute(stmt):
+        yield ("players", pid), Entry("players", league, fold(name), {
+            "id": pid, "name": name, "league": league, "photo_url": photo, "nationality": nationality,
+            "position": position, "club_id": club_id, "club_name": club_name, "club_badge": badge,
+        })
+
+
+def _club_rows(season: str, where=None):
+    stmt = select(Club.id, Club.league, Club.name, Club.short_name, Club.badge_url).where(Club.season == season)
+    if where is not None:
+        stmt = stmt.where(where)
+    for cid, league, name, short_name, badge in db.session.execute(stmt):
+        yield ("clubs", cid), Entry("clubs", league, fold(f"{name} {short_name or ''}"), {
+            "id": cid, "name": name, "short_name": short_name, "league": league, "badge_url": badge,
+        })
+
+
+_ROW_LOADERS = {"players": _player_rows, "clubs": _club_rows}
+
+_index = AutocompleteIndex()
+
+
+def get_index() -> AutocompleteIndex:
+    return _index
+
+
+def _on_tags_invalidated(entity: str, leagues=None, ids=None, **_):
+    if entity not in ENTITIES:
+        return
+    try:
+        _index.apply_change(entity, leagues, list(ids) if ids else None)
+    except Exception as e:
+        logger.error(f"[Autocomplete] Update {entity} failed: {e}")
+
+
+def init_autocomplete(app):
+    # tags_invalidated (sau cache_tags) -> version moi da co trong cache, ghi nho ngay
+    from app.services.cache_tags import tags_invalidated
+    tags_invalidated.connect(_on_tags_invalidated)
@@ -0,0 +1,93 @@
+"""
+app/services/cache_backends.py
+Chon backend cho flask-caching theo CACHE_BACKEND:
+
+  simple      SimpleCache - rieng tung process (dev / test)
+  filesystem  LRUFileSystemCache - dung chung giua cac gunicorn worker tren 1 may
+  redis       RedisProtocolCache - Redis that (CACHE_REDIS_URL) hoac client tuong
+              thich redis-py (CACHE_REDIS_CLIENT, vd. "fakeredis.FakeRedis" khi test)
+
+Cache response cua route va tag version (cache_tags.py) cung nam trong backend
+nay -> worker A invalidate thi worker B cung thay.
+"""
+import logging
+import os
+
+from flask_caching.backends.filesystemcache import FileSystemCache
+from flask_caching.backends.rediscache import RedisCache
+from werkzeug.utils import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class LRUFileSystemCache(FileSystemCache):
+    """
+    FileSystemCache evict theo lan doc gan nhat: get() cap nhat mtime cua file,
+    qua CACHE_THRESHOLD -> xoa file het han roi file co mtime cu nhat.
+    (Ban goc xoa theo thoi diem het han -> key timeout=0 nhu tag version bi xoa dau tien.)
+    """
+
+    def get(self, key):
+        value = super().get(key)
+        if value is not None:
+            try:
+                os.utime(self._get_filename(key), None)
+            except OSError:
+                pass
+        return value
+
+    def _remove_older(self) -> bool:
+        files = []
+        for fname in self._list_dir():
+            try:
+                files.append((os.path.getmtime(fname), fname))
+            except OSError:
+                pass
+        for _, fname in sorted(files):
+            try:
+                os.remove(fname)
+                self._update_count(delta=-1)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"[LRUFileSystemCache] Cannot remove {fname}: {e}")
+                return False
+            if not self._over_threshold():
+                break
+        return True
+
+
+class RedisProtocolCache(RedisCache):
+    """RedisCache nhan them CACHE_REDIS_CLIENT: import path / callable tra ve client."""
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        client = config.get("CACHE_REDIS_CLIENT")
+        if not client:
+            return super().factory(app, config, args, kwargs)
+        if isinstance(client, str):
+            client = import_string(client)
+        if callable(client):
+            client = client()
+        kwargs["host"] = client
+        if config.get("CACHE_KEY_PREFIX"):
+            kwargs["key_prefix"] = config["CACHE_KEY_PREFIX"]
+        return cls(*args, **kwargs)
+
+
+CACHE_BACKENDS = {
+    "simple": "SimpleCache",
+    "filesystem": f"{__name__}.LRUFileSystemCache",
+    "redis": f"{__name__}.RedisProtocolCache",
+}
+
+
+def configure_cache_backend(app):
+    """CACHE_BACKEND -> CACHE_TYPE (goi truoc cache.init_app)."""
+    backend = (app.config.get("CACHE_BACKEND") or "simple").lower()
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown CACHE_BACKEND: {backend} (expected {', '.join(CACHE_BACKENDS)})")
+    app.config["CACHE_TYPE"] = CACHE_BACKENDS[backend]
+    if backend == "filesystem":
+        os.makedirs(app.config["CACHE_DIR"], exist_ok=True)
+    logger.info(f"[Cache] Backend: {backend}")
@@ -0,0 +1,305 @@
+"""
+app/services/cache_tags.py
+Invalidation theo tag cho cache cua cac route: moi endpoint khai bao tag ma
+response phu thuoc (vd. "matches:PL", "matches#123"), DBWriter phat signal
+data_changed sau moi commit -> chi tag lien quan bi doi version.
+
+Version cua tag nam trong entry / cache key -> entry cu khong con duoc coi la
+moi ngay sau commit, nen TTL co the de hang gio.
+
+  @matches_bp.route("/<int:match_id>")
+  @cached(timeout=3600, tags=lambda match_id: [f"matches#{match_id}", "matches#*"])
+  def get_match(match_id): ...
+
+Tag duoc bump khi entity thay doi:
+  <entity>              moi thay doi (endpoint khong loc theo league)
+  <entity>:<league>     thay doi trong league
+  <entity>#<id>         row theo primary key
+  <entity>#*            khong biet id (bulk reload) -> moi endpoint chi tiet
+
+@cached chong dong loat miss (single-flight + stale-while-revalidate):
+  - entry luu kem version tag luc build; chi het TTL (version khong doi) ma con
+    trong cua so CACHE_STALE_TTL -> tra ban cu ngay, 1 request (1 thread / worker,
+    khoa cache.add giua cac worker) build lai o background
+  - version doi (du lieu vua ghi) -> khong tra ban cu, xu ly nhu miss
+  - khong co ban dung duoc -> 1 request build, request khac cung key cho ket qua
+    (toi da CACHE_SINGLE_FLIGHT_WAIT giay) thay vi cung query DB
+  - ban cu tra ve khong mang ETag theo tag (ETag theo body, xem conditional.py)
+"""
+import functools
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from blinker import signal
+from flask import Response, current_app, g, request
+
+from app.extensions import cache
+
+logger = logging.getLogger(__name__)
+
+_VERSION_PREFIX = "tagv/"
+_VIEW_PREFIX = "view/"
+_LOCK_PREFIX = "lock/"
+
+STALE_TTL = 30                 # Giay duoc tra ban cu sau khi het TTL
+SINGLE_FLIGHT_WAIT = 5.0       # Request cho toi da bao lau truoc khi tu build
+LOCK_TIMEOUT = 30              # Khoa build giua cac worker (build loi -> tu nha)
+POLL_INTERVAL = 0.05
+
+_inflight: Dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+_stats = {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "errors": 0}
+_stats_lock = threading.Lock()
+
+# Phat sau khi tag cua 1 thay doi da bump (vd. snapshots.py build lai payload)
+tags_invalidated = signal("cache-tags-invalidated")
+
+
+def _new_version() -> str:
+    # "<ms hex>-<ngau nhien>": khong dem tang de key version bi evict / backend
+    # restart khong the trung lai version cu; phan thoi gian -> Last-Modified
+    return f"{int(time.time() * 1000):x}-{uuid.uuid4().hex[:6]}"
+
+
+def version_time(version: str) -> Optional[float]:
+    """Thoi diem (epoch giay) tag doi version, None neu khong doc duoc."""
+    try:
+        return int(version.split("-", 1)[0], 16) / 1000
+    except (AttributeError, ValueError):
+        return None
+
+
+def tag_versions(tags: List[str]) -> Dict[str, str]:
+    """Version hien tai cua cac tag (tag chua co -> tao version moi)."""
+    keys = [_VERSION_PREFIX + t for t in tags]
+    values = cache.get_many(*keys) if keys else []
+    versions = {}
+    for tag, key, value in zip(tags, keys, values):
+        if value is None:
+            # add: request dong thoi cung tao tag -> dung chung 1 version
+            value = _new_version()
+            if not cache.add(key, value, timeout=0):
+                value = cache.get(key) or value
+        versions[tag] = value
+    return versions
+
+
+def invalidate_tags(tags: Iterable[str]) -> int:
+    """Doi version cac tag -> moi entry cache gan voi tag do thanh vo hieu."""
+    tags = sorted(set(tags))
+    if tags:
+        cache.set_many({_VERSION_PREFIX + t: _new_version() for t in tags}, timeout=0)
+        logger.debug(f"[CacheTags] Invalidated {tags}")
+    return len(tags)
+
+
+def tags_for_change(entity: str, leagues: Optional[Iterable[str]] = None,
+                    ids: Optional[Iterable] = None) -> List[str]:
+    tags = [entity]
+    tags += [f"{entity}:{lg}" for lg in (leagues or ()) if lg]
+    if ids is None:
+        tags.append(f"{entity}#*")
+    else:
+        tags += [f"{entity}#{i}" for i in ids]
+    return tags
+
+
+def league_tags(*entities: str, default: str = "PL") -> Callable[..., List[str]]:
+    """Tag theo ?league=: [<entity>:<LG>], hoac [<entity>] khi view khong loc league."""
+    def tags(**_):
+        league = request.args.get("league", default).upper()
+        return [f"{e}:{league}" if league else e for e in entities]
+    return tags
+
+
+def tagged(tags: Callable[..., Iterable[str]], max_age: Optional[int] = None):
+    """
+    Khai bao tag du lieu cua view ma khong cache response (ETag / 304 van dung
+    tag, xem app/services/conditional.py).
+    max_age: view phu thuoc thoi gian (vd. "sap dien ra"): ETag doi moi max_age
+    giay du tag khong doi, client duoc cache toi da max_age giay.
+    """
+    def decorator(f):
+        f.cache_tags = tags
+        f.cache_max_age = max_age
+        return f
+    return decorator
+
+
+def _count(field: str):
+    with _stats_lock:
+        _stats[field] += 1
+
+
+def cached(timeout: int, tags: Callable[..., Iterable[str]], query_string: bool = True,
+           stale_ttl: Optional[int] = None, max_age: Optional[int] = None):
+    """
+    Thay cho cache.cached: key = path + query string, entry ghi kem version cac tag.
+    tags: ham nhan kwargs cua view (vd. match_id), co the doc request.args.
+    stale_ttl: cua so stale-while-revalidate (None = config CACHE_STALE_TTL, 0 = tat).
+    max_age: xem tagged(); view phu thuoc thoi gian nen dat timeout <= max_age.
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            versions = tag_versions(list(tags(**kwargs)))
+            qs = urlencode(sorted(request.args.items(multi=True))) if query_string else ""
+            key = f"{_VIEW_PREFIX}{request.path}?{qs}"
+            window = current_app.config.get("CACHE_STALE_TTL", STALE_TTL) if stale_ttl is None else stale_ttl
+
+            entry = cache.get(key)
+            state = _freshness(entry, versions, timeout, window)
+            if state == "fresh":
+                _count("hits")
+                return _respond(entry)
+            if state == "stale":
+                _count("stale")
+                _refresh_async(current_app._get_current_object(), key, f, args, kwargs,
+                               tags, timeout + window, request.full_path if query_string else request.path)
+                g.etag = g.last_modified = None     # Body cu (het TTL): khong gan validator
+                return _respond(entry)
+
+            _count("misses")
+            built = _single_flight(key, lambda: _build(key, f, args, kwargs, versions, timeout + window))
+            if built is not None:
+                return built
+            # Request khac vua build xong -> doc lai
+            entry = cache.get(key)
+            if _freshness(entry, versions, timeout, 0) == "fresh":
+                _count("coalesced")
+                return _respond(entry)
+            return _build(key, f, args, kwargs, versions, timeout + window)
+
+        return tagged(tags, max_age)(wrapper)
+    return decorator
+
+
+def _freshness(entry: Optional[Dict], versions: Dict[str, str], timeout: int, window: int) -> str:
+    """ "fresh" | "stale" (tra duoc, can build lai) | "miss"."""
+    if not entry:
+        return "miss"
+    if any(entry["versions"].get(t) != v for t, v in versions.items()):
+        # Du lieu vua ghi phai thay ngay (data_changed): build lai qua _single_flight
+        return "miss"
+    now = time.time()
+    expired_at = entry["built_at"] + timeout
+    if now < expired_at:
+        return "fresh"
+    return "stale" if now - expired_at < window else "miss"
+
+
+def _respond(entry: Dict) -> Response:
+    return Response(entry["body"], status=entry["status"], headers=entry["headers"])
+
+
+def _build(key: str, f, args, kwargs, versions: Dict[str, str], ttl: int):
+    resp = current_app.make_response(f(*args, **kwargs))
+    if resp.status_code != 200 or resp.direct_passthrough or resp.is_streamed:
+        return resp
+    headers = [(k, v) for k, v in resp.headers.to_wsgi_list() if k.lower() != "content-length"]
+    entry = {"body": resp.get_data(), "status": resp.status_code, "headers": headers,
+             "versions": versions, "built_at": time.time()}
+    try:
+        cache.set(key, entry, timeout=ttl)
+    except Exception as e:
+        logger.error(f"[CacheTags] Store {key} failed: {e}")
+    return _respond(entry)
+
+
+def _claim(key: str) -> Tuple[bool, threading.Event]:
+    with _inflight_lock:
+        event = _inflight.get(key)
+        if event is not None:
+            return False, event
+        event = _inflight[key] = threading.Event()
+        return True, event
+
+
+def _release(key: str, event: threading.Event):
+    with _inflight_lock:
+        _inflight.pop(key, None)
+    event.set()
+
+
+def _single_flight(key: str, build: Callable[[], Response]) -> Optional[Response]:
+    """
+    Leader (thread dau tien trong worker, giu khoa cache giua cac worker) build va
+    tra response; request khac cho xong roi tra None (caller doc lai cache).
+    """
+    leader, event = _claim(key)
+    if not leader:
+        event.wait(current_app.config.get("CACHE_SINGLE_FLIGHT_WAIT", SINGLE_FLIGHT_WAIT))
+        return None
+    try:
+        lock_key = _LOCK_PREFIX + key
+        if not cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+            # Worker khac dang build -> cho entry moi xuat hien
+            deadline = time.time() + current_app.config.get("CACHE_SINGLE_FLIGHT_WAIT", SINGLE_FLIGHT_WAIT)
+            built_at = (cache.get(key) or {}).get("built_at")
+            while time.time() < deadline and cache.get(lock_key) is not None:
+                time.sleep(POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry and entry.get("built_at") != built_at:
+                return None
+            return build()
+        try:
+            return build()
+        finally:
+            cache.delete(lock_key)
+    finally:
+        _release(key, event)
+
+
+def _refresh_async(app, key: str, f, args, kwargs, tags, ttl: int, url: str):
+    """Build lai entry stale o background; bo qua neu da co request khac dang build."""
+    leader, event = _claim(key)
+    if not leader:
+        return
+    lock_key = _LOCK_PREFIX + key
+    if not cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        _release(key, event)
+        return
+
+    def run():
+        try:
+            with app.test_request_context(url):
+                # Version doc truoc khi build: doi tiep trong luc build -> lan sau van stale
+                versions = tag_versions(list(tags(**kwargs)))
+                _build(key, f, args, kwargs, versions, ttl)
+            _count("refreshes")
+        except Exception as e:
+            _count("errors")
+            logger.error(f"[CacheTags] Refresh {key} failed: {e}")
+        finally:
+            cache.delete(lock_key)
+            _release(key, event)
+
+    threading.Thread(target=run, daemon=True, name="cache-refresh").start()
+
+
+def cache_stats() -> Dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _on_data_changed(entity: str, leagues=None, ids=None, **_):
+    from app.services.db_versions import record_watermark
+    record_watermark(entity)     # Ghi nay da biet -> thread dong bo DB khong bump lai
+    try:
+        invalidate_tags(tags_for_change(entity, leagues, ids))
+    except Exception as e:
+        # Loi cache backend khong duoc lam hong transaction da commit
+        logger.error(f"[CacheTags] Invalidate {entity} failed: {e}")
+        return
+    tags_invalidated.send(entity, leagues=leagues, ids=ids)
+
+
+def init_cache_tags(app):
+    """Noi signal data_changed cua DBWriter voi invalidation (goi trong create_app)."""
+    from scripts.utils.db_writer import data_changed
+    data_changed.connect(_on_data_changed)
@@ -0,0 +1,125 @@
+"""
+app/services/compression.py
+Nen gzip / brotli cho response /api/* (after_request):
+
+  - chi nen body >= COMPRESS_MIN_SIZE, mimetype JSON / text, chua co Content-Encoding
+  - chon br > gzip theo Accept-Encoding (thieu package brotli -> chi gzip)
+  - ban nen luu trong cache theo ETag ("z/<encoding>/<etag>"): ETag da dinh danh
+    payload (version tag hoac sha1 body, xem conditional.py) -> moi payload chi nen
+    1 lan / encoding, request sau va worker khac (cache dung chung) doc lai bytes
+  - body da nen -> ETag thanh weak (W/"..."), If-None-Match so sanh weak nen 304 van dung
+
+Snapshot (app/services/snapshots.py) goi compress() luc build -> luu san ban nen.
+"""
+import gzip
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+from flask import current_app, request
+
+from app.extensions import cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli la tuy chon
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/"
+VARIANT_PREFIX = "z/"
+COMPRESS_MIN_SIZE = 512          # Body nho hon -> khong dang nen
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5               # Nen luc request: nhanh; build static dung muc toi da
+_COMPRESSIBLE = ("application/json", "application/javascript", "image/svg+xml", "text/")
+
+_stats = {"hits": 0, "misses": 0, "uncached": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(field: str):
+    with _stats_lock:
+        _stats[field] += 1
+
+
+def encodings() -> tuple:
+    """Encoding server tao duoc, theo thu tu uu tien."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL if level is None else level)
+
+
+def choose_encoding(offered: Iterable[str] = None) -> Optional[str]:
+    """Encoding dau tien trong `offered` ma client nhan (Accept-Encoding), None neu khong co."""
+    accepted = request.accept_encodings
+    for encoding in offered if offered is not None else encodings():
+        if accepted[encoding]:
+            return encoding
+    return None
+
+
+def _compressible(mimetype: Optional[str]) -> bool:
+    return bool(mimetype) and mimetype.startswith(_COMPRESSIBLE)
+
+
+def _variant(encoding: str, etag: Optional[str], body: bytes) -> bytes:
+    if not etag:
+        _count("uncached")
+        return compress(body, encoding)
+    key = f"{VARIANT_PREFIX}{encoding}/{etag}"
+    data = cache.get(key)
+    if data is not None:
+        _count("hits")
+        return data
+    _count("misses")
+    data = compress(body, encoding)
+    cache.set(key, data, timeout=current_app.config.get("COMPRESS_VARIANT_TIMEOUT", 3600))
+    return data
+
+
+def _after_request(resp):
+    if not request.path.startswith(API_PREFIX) or resp.status_code != 200 \
+            or resp.direct_passthrough or resp.is_streamed:
+        return resp
+    if "Content-Encoding" in resp.headers:
+        # Da nen san (snapshot) -> chi doi ETag sang weak
+        etag, weak = resp.get_etag()
+        if etag and not weak:
+            resp.set_etag(etag, weak=True)
+        return resp
+    if not _compressible(resp.mimetype):
+        return resp
+    body = resp.get_data()
+    if len(body) < current_app.config.get("COMPRESS_MIN_SIZE", COMPRESS_MIN_SIZE):
+        return resp
+    resp.vary.add("Accept-Encoding")
+    encoding = choose_encoding()
+    if encoding is None:
+        return resp
+    etag, _ = resp.get_etag()
+    try:
+        data = _variant(encoding, etag, body)
+    except Exception as e:
+        logger.error(f"[Compression] {encoding} {request.path} failed: {e}")
+        return resp
+    resp.set_data(data)
+    resp.headers["Content-Encoding"] = encoding
+    if etag:
+        resp.set_etag(etag, weak=True)
+    return resp
+
+
+def compression_stats() -> Dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def init_compression(app):
+    # after_request chay nguoc thu tu dang ky: goi truoc init_conditional_requests
+    # de nen sau khi ETag / 304 da xu ly xong
+    app.after_request(_after_request)
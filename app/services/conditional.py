@@ -0,0 +1,115 @@
+"""
+app/services/conditional.py
+ETag / Last-Modified + 304 cho moi GET /api/*.
+
+  - View co tag (@cached / @tagged): ETag = sha1(path + query + version cac tag),
+    Last-Modified = lan doi version gan nhat. Tinh trong before_request -> request
+    co If-None-Match / If-Modified-Since khop duoc tra 304 truoc khi chay view
+    (khong query DB, khong serialize JSON).
+  - View khong co tag: ETag = sha1(body) sau khi render (van tiet kiem bang thong).
+  - View phu thuoc thoi gian (@cached(max_age=...)): ETag them moc thoi gian
+    (doi moi max_age giay), Cache-Control: max-age thay cho no-cache.
+"""
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from flask import Response, g, request
+
+from app.services.cache_tags import tag_versions, version_time
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/"
+
+
+def _is_api_get() -> bool:
+    return request.method == "GET" and request.path.startswith(API_PREFIX)
+
+
+def _tagged_validators():
+    """(etag, last_modified) cua view hien tai neu view khai bao tag, nguoc lai None."""
+    from flask import current_app
+    view = current_app.view_functions.get(request.endpoint)
+    tags_fn = getattr(view, "cache_tags", None)
+    if tags_fn is None:
+        return None
+    versions = tag_versions(list(tags_fn(**(request.view_args or {}))))
+    qs = urlencode(sorted(request.args.items(multi=True)))
+    raw = f"{request.path}?{qs}|" + ",".join(f"{t}={v}" for t, v in sorted(versions.items()))
+    times = [t for t in map(version_time, versions.values()) if t is not None]
+    max_age = getattr(view, "cache_max_age", None)
+    if max_age:
+        bucket = int(time.time() // max_age)
+        raw += f"|t={bucket}"
+        times.append(bucket * max_age)      # If-Modified-Since cung het han theo moc
+    etag = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:32]
+    last_modified = datetime.fromtimestamp(max(times), timezone.utc).replace(microsecond=0) if times else None
+    return etag, last_modified
+
+
+def _view_max_age():
+    from flask import current_app
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, "cache_max_age", None)
+
+
+def _not_modified(etag: str, last_modified) -> bool:
+    # If-None-Match uu tien; chi xet If-Modified-Since khi client khong gui ETag
+    if request.if_none_match:
+        # So sanh weak (RFC 7232): response da nen gui ETag W/"..." (compression.py)
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return bool(since and last_modified and last_modified <= since)
+
+
+def _before_request():
+    if not _is_api_get():
+        return None
+    g.etag = g.last_modified = None
+    g.max_age = _view_max_age()
+    try:
+        validators = _tagged_validators()
+    except Exception as e:
+        logger.warning(f"[Conditional] {request.path}: {e}")
+        return None
+    if validators is None:
+        return None
+    g.etag, g.last_modified = validators
+    if _not_modified(*validators):
+        resp = Response(status=304)
+        _set_validators(resp, *validators)
+        return resp
+    return None
+
+
+def _set_validators(resp, etag, last_modified):
+    resp.set_etag(etag)
+    if last_modified is not None:
+        resp.last_modified = last_modified
+    max_age = g.get("max_age")
+    if max_age:
+        resp.headers.setdefault("Cache-Control", f"public, max-age={max_age}")
+    else:
+        # Cho phep cache o client nhung luon hoi lai server (304 neu khong doi)
+        resp.headers.setdefault("Cache-Control", "no-cache")
+
+
+def _after_request(resp):
+    if not _is_api_get() or resp.status_code != 200 or resp.direct_passthrough \
+            or resp.is_streamed:
+        return resp
+    if g.get("etag"):
+        _set_validators(resp, g.etag, g.last_modified)
+        return resp
+    # View khong co tag -> ETag theo noi dung body
+    resp.add_etag()
+    resp.headers.setdefault("Cache-Control", "no-cache")
+    return resp.make_conditional(request)
+
+
+def init_conditional_requests(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
@@ -0,0 +1,100 @@
+"""
+app/services/db_versions.py
+Dong bo version tag cache voi du lieu trong DB.
+
+Tag chi bump khi DBWriter trong CUNG cache backend phat data_changed. Script chay
+rieng (crawl_*.py, setup_ucl_playoff.py, update_all.bat) co cache rieng (backend
+"simple") -> web process khong biet du lieu da doi, ETag / @cached giu ban cu.
+
+Moi entity co 1 watermark lay tu DB: max(updated_at) + count(*) cua cac bang.
+  - sau moi data_changed trong process: luu watermark moi (record_watermark)
+  - thread nen moi CACHE_DB_SYNC_INTERVAL giay doc lai watermark (1 query UNION);
+    khac ban da luu -> co process khac ghi DB -> bump tag cua entity (moi league)
+    va phat tags_invalidated (snapshot build lai)
+"""
+import logging
+import threading
+from typing import Dict, Optional
+
+from app.extensions import cache, db
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_PREFIX = "dbv/"
+SYNC_INTERVAL = 10
+LEAGUES = ("PL", "UCL")
+
+# entity (ten trong data_changed / tag) -> bang DB ma view cua entity doc
+WATCHED: Dict[str, tuple] = {
+    "matches":    ("matches",),
+    "news":       ("news",),
+    "standings":  ("standings",),
+    "players":    ("players", "statistics"),
+    "clubs":      ("clubs",),
+    "team_stats": ("team_statistics",),
+    "bracket":    ("bracket_matchups",),
+}
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _read_watermarks(entities) -> Dict[str, str]:
+    """1 query cho moi bang cua cac entity: "<max updated_at>|<count>"."""
+    tables = sorted({t for e in entities for t in WATCHED[e]})
+    if not tables:
+        return {}
+    sql = " UNION ALL ".join(
+        f"SELECT '{t}' AS t, MAX(updated_at) AS m, COUNT(*) AS n FROM {t}" for t in tables)
+    marks = {t: f"{m}|{n}" for t, m, n in db.session.execute(db.text(sql))}
+    return {e: ",".join(marks[t] for t in WATCHED[e]) for e in entities}
+
+
+def record_watermark(entity: str):
+    """Goi sau commit, TRUOC khi bump tag: ghi cua process khac xen vao van duoc tag moi phu."""
+    if entity not in WATCHED:
+        return
+    try:
+        marks = _read_watermarks([entity])
+        cache.set(WATERMARK_PREFIX + entity, marks[entity], timeout=0)
+    except Exception as e:
+        logger.warning(f"[DBVersions] Watermark {entity} failed: {e}")
+
+
+def sync_external_writes() -> list:
+    """So watermark DB voi ban da luu; tra ve cac entity vua bi process khac ghi."""
+    from app.services.cache_tags import invalidate_tags, tags_for_change, tags_invalidated
+    marks = _read_watermarks(WATCHED)
+    stored = dict(zip(marks, cache.get_many(*(WATERMARK_PREFIX + e for e in marks))))
+    changed = []
+    for entity, mark in marks.items():
+        if stored.get(entity) == mark:
+            continue
+        cache.set(WATERMARK_PREFIX + entity, mark, timeout=0)
+        if stored.get(entity) is None:
+            continue                     # Lan dau chay: chi ghi moc
+        invalidate_tags(tags_for_change(entity, LEAGUES))
+        tags_invalidated.send(entity, leagues=set(LEAGUES), ids=None)
+        changed.append(entity)
+    if changed:
+        logger.info(f"[DBVersions] External writes detected: {changed}")
+    return changed
+
+
+def _run(app, interval: float):
+    while not _stop.wait(interval):
+        with app.app_context():
+            try:
+                sync_external_writes()
+            except Exception as e:
+                logger.error(f"[DBVersions] Sync failed: {e}")
+
+
+def init_db_versions(app):
+    global _thread
+    interval = app.config.get("CACHE_DB_SYNC_INTERVAL", SYNC_INTERVAL)
+    if app.testing or not interval or (_thread and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, args=(app, interval), name="db-versions", daemon=True)
+    _thread.start()
@@ -0,0 +1,239 @@
+"""
+app/services/ingest_queue.py
+Write-behind ingestion queue: scheduler job day record da parse vao hang doi,
+1 writer thread duy nhat gom theo entity, dedupe theo key (ban moi nhat thang)
+va ghi qua DBWriter theo batch -> cac job khong con tranh lock SQLite / row lock.
+
+  enqueue(app, "matches", records)          # job scheduler
+  enqueue(app, "news", records, on_commit=crawler.mark_seen)   # chay sau khi ghi thanh cong
+  get_ingest_queue().stats()                # do sau hang doi, batch, commit latency
+"""
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# entity -> (ten method DBWriter, ham lay key dedupe)
+ENTITIES: Dict[str, Tuple[str, Callable[[Dict], tuple]]] = {
+    "matches":   ("upsert_matches",     lambda r: (str(r.get("source_id", r.get("match_id", ""))),)),
+    "live":      ("update_live_scores", lambda r: (str(r.get("source_id", "")),)),
+    "standings": ("upsert_standings",   lambda r: (str(r.get("source_id", "")), r.get("season", "2025"))),
+    "players":   ("upsert_players",     lambda r: (str(r.get("source_id", "")), r.get("league"), r.get("season", "2025"))),
+    "clubs":     ("upsert_clubs",       lambda r: (str(r.get("source_id", "")), r.get("league"))),
+    "news":      ("upsert_news",        lambda r: (str(r.get("source_id", "")),)),
+    "bracket":   ("upsert_bracket",     lambda r: (r.get("stage"), r.get("draw_order"), r.get("season", "2025"))),
+}
+
+# Entity ghi vao cung 1 bang: khong gom qua nhau de giu thu tu den
+# (payload fixtures cu khong de len ti so live moi hon trong cung cua so linger)
+_TABLES = {"live": "matches"}
+
+_SENTINEL = object()
+
+
+class IngestQueue:
+    def __init__(self, app, batch_size: int = 500, linger: float = 1.0):
+        self.app = app
+        self.batch_size = batch_size
+        self.linger = linger              # Cho them toi da `linger` giay de gom record
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._idle = threading.Event()
+        self._idle.set()
+        self._metrics = {
+            "received": 0, "deduped": 0, "written": 0, "batches": 0, "errors": 0,
+            "last_batch_size": 0, "max_batch_size": 0,
+            "last_commit_ms": 0.0, "max_commit_ms": 0.0, "total_commit_ms": 0.0,
+        }
+        self._lock = threading.Lock()
+
+    # ── Producer ──────────────────────────────────────────────────
+    def put(self, entity: str, records: List[Dict], league: Optional[str] = None,
+            on_commit: Optional[Callable[[], None]] = None):
+        """on_commit: goi trong writer thread khi moi batch cua nhom record nay da commit."""
+        if entity not in ENTITIES:
+            raise ValueError(f"Unknown ingest entity: {entity}")
+        if not records:
+            return
+        with self._lock:
+            self._idle.clear()
+            self._queue.put((entity, league, list(records), on_commit))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Cho den khi hang doi da ghi het (dung khi shutdown / trigger thu cong)."""
+        return self._idle.wait(timeout)
+
+    # ── Lifecycle ─────────────────────────────────────────────────
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="ingest-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"[IngestQueue] Writer started (batch={self.batch_size}, linger={self.linger}s)")
+
+    def stop(self, timeout: float = 30):
+        if self._thread and self._thread.is_alive():
+            self._queue.put(_SENTINEL)
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    # ── Writer thread ─────────────────────────────────────────────
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _SENTINEL:
+                return
+            # (entity, league, thu tu nhom) -> record; nhom ghi theo thu tu den
+            pending: "OrderedDict[Tuple[str, Optional[str], int], OrderedDict]" = OrderedDict()
+            callbacks: Dict[Tuple[str, Optional[str], int], List[Callable[[], None]]] = {}
+            size = self._collect(item, pending, callbacks)
+
+            # Gom them record toi trong `linger` giay hoac du batch
+            stop = False
+            deadline = time.monotonic() + self.linger
+            while size < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _SENTINEL:
+                    stop = True
+                    break
+                size += self._collect(item, pending, callbacks)
+
+            self._write(pending, callbacks)
+            if stop:
+                return
+            with self._lock:
+                if self._queue.empty():
+                    self._idle.set()
+
+    def _collect(self, item, pending, callbacks) -> int:
+        entity, league, records, on_commit = item
+        key_fn = ENTITIES[entity][1]
+        table = _TABLES.get(entity, entity)
+        target = None
+        for gkey in reversed(pending):
+            if gkey[:2] == (entity, league):
+                target = gkey
+                break
+            if _TABLES.get(gkey[0], gkey[0]) == table:
+                break          # Nhom khac ghi cung bang den sau -> mo nhom moi
+        if target is None:
+            target = (entity, league, len(pending))
+        group = pending.setdefault(target, OrderedDict())
+        if on_commit is not None:
+            callbacks.setdefault(target, []).append(on_commit)
+        before = len(group)
+        for r in records:
+            key = key_fn(r)
+            group.pop(key, None)   # Ban moi nhat thang, dua ve cuoi thu tu
+            group[key] = r
+        added = len(group) - before
+        with self._lock:
+            self._metrics["received"] += len(records)
+            self._metrics["deduped"] += len(records) - added
+        return added
+
+    def _write(self, pending, callbacks):
+        from scripts.utils.db_writer import DBWriter
+        writer = DBWriter()
+        with self.app.app_context():
+            for target, group in pending.items():
+                entity, league, _ = target
+                method = getattr(writer, ENTITIES[entity][0])
+                records = list(group.values())
+                group_ok = True
+                for i in range(0, len(records), self.batch_size):
+                    batch = records[i:i + self.batch_size]
+                    started = time.perf_counter()
+                    try:
+                        method(batch) if league is None else method(batch, league=league)
+                        ok = True
+                    except Exception as e:
+                        logger.error(f"[IngestQueue] {entity} batch failed: {e}")
+                        ok = False
+                    group_ok = group_ok and ok
+                    self._record_batch(len(batch), (time.perf_counter() - started) * 1000, ok)
+                if group_ok:
+                    _run_callbacks(callbacks.get(target, ()))
+
+    def _record_batch(self, size: int, elapsed_ms: float, ok: bool):
+        with self._lock:
+            m = self._metrics
+            m["batches"] += 1
+            m["last_batch_size"] = size
+            m["max_batch_size"] = max(m["max_batch_size"], size)
+            m["last_commit_ms"] = round(elapsed_ms, 1)
+            m["max_commit_ms"] = round(max(m["max_commit_ms"], elapsed_ms), 1)
+            m["total_commit_ms"] += elapsed_ms
+            if ok:
+                m["written"] += size
+            else:
+                m["errors"] += 1
+
+    # ── Metrics ───────────────────────────────────────────────────
+    def stats(self) -> Dict:
+        with self._lock:
+            m = dict(self._metrics)
+        m["avg_commit_ms"] = round(m.pop("total_commit_ms") / m["batches"], 1) if m["batches"] else 0.0
+        m["queue_depth"] = self._queue.qsize()
+        m["running"] = self.running
+        return m
+
+
+def _run_callbacks(callbacks: Iterable[Callable[[], None]]):
+    for cb in callbacks:
+        try:
+            cb()
+        except Exception as e:
+            logger.error(f"[IngestQueue] on_commit callback failed: {e}")
+
+
+_ingest_queue: Optional[IngestQueue] = None
+
+
+def start_ingest_queue(app) -> IngestQueue:
+    global _ingest_queue
+    if _ingest_queue is None:
+        _ingest_queue = IngestQueue(
+            app,
+            batch_size=app.config.get("INGEST_BATCH_SIZE", 500),
+            linger=app.config.get("INGEST_LINGER_SECONDS", 1.0),
+        )
+    _ingest_queue.start()
+    return _ingest_queue
+
+
+def get_ingest_queue() -> Optional[IngestQueue]:
+    return _ingest_queue
+
+
+def enqueue(app, entity: str, records: List[Dict], league: Optional[str] = None,
+            on_commit: Optional[Callable[[], None]] = None):
+    """
+    Day record vao writer thread; chua co queue (vd. DISABLE_SCHEDULER) -> ghi truc tiep.
+    on_commit chi chay khi ghi thanh cong (vd. crawler.mark_seen).
+    """
+    if not records:
+        return
+    q = _ingest_queue
+    if q is not None and q.running:
+        q.put(entity, records, league, on_commit)
+        return
+    from scripts.utils.db_writer import DBWriter
+    method = getattr(DBWriter(), ENTITIES[entity][0])
+    with app.app_context():
+        method(records) if league is None else method(records, league=league)
+        if on_commit is not None:
+            _run_callbacks([on_commit])
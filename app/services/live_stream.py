@@ -0,0 +1,228 @@
+"""
+app/services/live_stream.py
+Server-Sent Events cho ti so live (/api/matches/live/stream) thay cho poll 60s:
+
+  job live -> DBWriter.update_live_scores / upsert_matches -> data_changed("matches", ids)
+           -> tags_invalidated -> LiveBroadcaster.refresh(ids) -> 1 SELECT, so voi state
+           -> delta {id, status, minute, ti so} -> queue cua moi client dang nghe
+
+Moi process giu 1 state (item MATCH_LIST cua tran LIVE/HT) -> snapshot luc client
+ket noi doc tu RAM, khong query. Worker khong chay DBWriter biet thay doi qua tag
+version "matches" (kiem tra moi nhip heartbeat).
+
+Event gui ve:
+  event: snapshot   {"items": [item MATCH_LIST, ...]}        luc ket noi / client bi tre
+  event: delta      {"changes": [{id, league, status, minute, home_score, away_score,
+                                  match?}]}                 match = item day du khi tran moi vao live
+  : heartbeat       comment moi LIVE_STREAM_HEARTBEAT giay (giu ket noi qua proxy,
+                    phat hien client da dong)
+
+Moi ket noi giu 1 request mo suot LIVE_STREAM_MAX_AGE giay -> gunicorn phai chay
+worker gevent (Procfile), worker sync se bi chiem het.
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from flask import current_app
+from sqlalchemy import or_
+
+from app.extensions import db
+from app.models import Match
+from app.services.cache_tags import tag_versions
+from app.services.serializers import MATCH_LIST, dumps
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATUSES = ("LIVE", "HT")
+QUEUE_SIZE = 50            # Event cho moi client; day -> gui lai snapshot thay vi backlog
+RETRY_MS = 5000            # EventSource tu ket noi lai sau khi stream dong
+
+
+def _scoreline(item: Dict) -> Dict:
+    return {"id": item["id"], "league": item["league"], "status": item["status"],
+            "minute": item["minute"],
+            "home_score": (item.get("home_team") or {}).get("score"),
+            "away_score": (item.get("away_team") or {}).get("score")}
+
+
+def _message(event: str, payload: Dict) -> str:
+    return f"event: {event}\ndata: {dumps(payload).decode('utf-8')}\n\n"
+
+
+@dataclass(eq=False)
+class Subscriber:
+    league: str                                    # "" = moi league
+    queue: "queue.Queue[str]" = field(default_factory=lambda: queue.Queue(QUEUE_SIZE))
+    resync: bool = False
+
+    def wants(self, league: str) -> bool:
+        return not self.league or self.league == league
+
+
+class LiveBroadcaster:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscriber] = []
+        self._items: Dict[int, Dict] = {}          # match id -> item MATCH_LIST (LIVE/HT)
+        self._loaded = False
+        self._version: Optional[str] = None        # tag "matches" luc refresh gan nhat
+        self._last_poll = 0.0
+
+    # ── Ket noi ───────────────────────────────────────────────────
+    def subscribe(self, league: str = "", max_clients: int = 0) -> Optional[Subscriber]:
+        """None khi da du max_clients ket noi."""
+        with self._lock:
+            if max_clients and len(self._subscribers) >= max_clients:
+                return None
+            sub = Subscriber(league)
+            self._subscribers.append(sub)
+            return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+            if not self._subscribers:
+                # Khong ai nghe -> bo qua signal; client sau nap lai tu DB
+                self._loaded = False
+
+    def snapshot(self, league: str = "") -> List[Dict]:
+        with self._lock:
+            items = [m for m in self._items.values() if not league or m["league"] == league]
+        return sorted(items, key=lambda m: (m["kickoff_at"] or "", m["id"]))
+
+    def events(self, sub: Subscriber, heartbeat: int = 15, max_age: int = 1800) -> Iterator[str]:
+        """Body text/event-stream cua 1 client; ket thuc sau max_age giay (client tu noi lai)."""
+        deadline = time.monotonic() + max_age
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            yield _message("snapshot", {"items": self.snapshot(sub.league)})
+            while time.monotonic() < deadline:
+                try:
+                    msg = sub.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    self.poll(heartbeat)
+                    yield ": heartbeat\n\n"
+                    continue
+                if sub.resync:
+                    # Client doc cham, queue da tran -> bo backlog, gui lai toan bo
+                    sub.resync = False
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    msg = _message("snapshot", {"items": self.snapshot(sub.league)})
+                yield msg
+        finally:
+            self.unsubscribe(sub)
+
+    # ── Cap nhat state ────────────────────────────────────────────
+    def ensure_loaded(self):
+        if not self._loaded:
+            self.refresh()
+
+    def refresh(self, ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Doc lai tran (ids, hoac moi tran LIVE/HT + tran dang giu) va phat delta
+        cho tran doi status / phut / ti so. Tra ve so tran thay doi.
+        """
+        with self._lock:
+            known = list(self._items)
+            first_load = not self._loaded
+        stmt = MATCH_LIST.select().where(or_(Match.status.in_(LIVE_STATUSES), Match.id.in_(known)))
+        if ids is not None and not first_load:
+            stmt = stmt.where(Match.id.in_(list(ids)))
+        version = tag_versions(["matches"])["matches"]
+        # Connection rieng, tra ve pool ngay: stream mo hang gio khong duoc giu session
+        with db.engine.connect() as conn:
+            items = MATCH_LIST.rows(conn.execute(stmt).all())
+
+        changes = []
+        with self._lock:
+            if first_load:
+                self._items = {}
+            for item in items:
+                old = self._items.get(item["id"])
+                live = item["status"] in LIVE_STATUSES
+                if live:
+                    self._items[item["id"]] = item
+                else:
+                    self._items.pop(item["id"], None)
+                if first_load or (old is None and not live):
+                    continue
+                change = _scoreline(item)
+                if old is not None and _scoreline(old) == change:
+                    continue
+                if old is None:
+                    change["match"] = item
+                changes.append(change)
+            self._loaded = True
+            self._version = version
+        if changes:
+            self.publish(changes)
+        return len(changes)
+
+    def poll(self, interval: int):
+        """Worker khac ghi DB -> tag "matches" doi version -> refresh; toi da 1 lan / interval."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_poll < interval:
+                return
+            self._last_poll = now
+        try:
+            if tag_versions(["matches"])["matches"] != self._version:
+                self.refresh()
+        except Exception as e:
+            logger.error(f"[LiveStream] Poll failed: {e}")
+
+    def publish(self, changes: List[Dict]):
+        by_league: Dict[str, str] = {}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            wanted = [c for c in changes if sub.wants(c["league"])]
+            if not wanted:
+                continue
+            msg = by_league.get(sub.league)
+            if msg is None:
+                msg = by_league[sub.league] = _message("delta", {"changes": wanted})
+            try:
+                sub.queue.put_nowait(msg)
+            except queue.Full:
+                sub.resync = True
+        logger.debug(f"[LiveStream] {len(changes)} change(s) -> {len(subscribers)} client(s)")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"clients": len(self._subscribers), "live": len(self._items), "loaded": self._loaded}
+
+
+_broadcaster = LiveBroadcaster()
+
+
+def get_broadcaster() -> LiveBroadcaster:
+    return _broadcaster
+
+
+def stream_settings() -> Dict:
+    cfg = current_app.config
+    return {"max_clients": cfg.get("LIVE_STREAM_MAX_CLIENTS", 800),
+            "heartbeat": cfg.get("LIVE_STREAM_HEARTBEAT", 15),
+            "max_age": cfg.get("LIVE_STREAM_MAX_AGE", 1800)}
+
+
+def _on_tags_invalidated(entity: str, leagues=None, ids=None, **_):
+    if entity != "matches" or not _broadcaster.stats()["clients"]:
+        return
+    try:
+        _broadcaster.refresh(list(ids) if ids else None)
+    except Exception as e:
+        logger.error(f"[LiveStream] Refresh failed: {e}")
+
+
+def init_live_stream(app):
+    # tags_invalidated: version "matches" da doi -> refresh ghi nho dung version moi
+    from app.services.cache_tags import tags_invalidated
+    tags_invalidated.connect(_on_tags_invalidated)
@@ -0,0 +1,169 @@
+"""
+app/services/pagination.py
+Keyset (cursor) pagination cho endpoint danh sach dung Projection:
+
+  ORDER BY <cot sort>, id  +  WHERE (cot, id) > (gia tri cua dong cuoi trang truoc)
+  -> khong COUNT(*), khong OFFSET scan; trang sau nhanh nhu trang dau.
+
+Request:  ?per_page=20[&cursor=<next_cursor>][&with_total=1]
+Response: {"items": [...], "next_cursor": "..." | null, "per_page": 20,
+           "total": .., "pages": ..}            # total/pages chi khi with_total=1
+?page=N (client cu) van chay LIMIT/OFFSET + total; total duoc cache theo tag
+version cua view nen COUNT(*) chi chay lai khi du lieu doi.
+"""
+import base64
+import json
+import math
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from flask import current_app, request
+from sqlalchemy import and_, func, select, tuple_
+
+from app.extensions import cache, db
+from app.services.cache_tags import tag_versions
+from app.services.serializers import json_response
+
+COUNT_TIMEOUT = 3600
+# Tham so khong anh huong tap ket qua -> bo khoi key cache cua total
+_NON_FILTER_ARGS = {"cursor", "page", "per_page", "fields", "with_total"}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ── Cursor ────────────────────────────────────────────────────────
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursor("bad value")
+    return value
+
+
+def encode_cursor(sort_name: str, value, row_id: int) -> str:
+    raw = json.dumps({"s": sort_name, "k": [_encode_value(value), row_id]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_name: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        value, row_id = data["k"]
+        if data.get("s") != sort_name:
+            raise InvalidCursor("cursor belongs to another sort order")
+        return _decode_value(value), int(row_id)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def _nulls_first(desc: bool) -> bool:
+    """NULL dung dau thu tu scan? (SQLite/MySQL: NULL nho nhat; PostgreSQL: lon nhat)."""
+    nulls_small = db.session.get_bind().dialect.name not in ("postgresql", "oracle")
+    return desc != nulls_small
+
+
+def _segments(sort_col, id_col, value, row_id, desc: bool) -> List:
+    """
+    Dieu kien WHERE cho phan 'sau (value, row_id)', tach thanh cac doan de moi doan
+    la 1 range seek tren index (league, season, sort_col, id) - khong dung OR IS NULL.
+    """
+    id_after = id_col < row_id if desc else id_col > row_id
+    key_after = tuple_(sort_col, id_col) < (value, row_id) if desc else tuple_(sort_col, id_col) > (value, row_id)
+    nullable = getattr(sort_col, "nullable", True)
+    if _nulls_first(desc):
+        if value is None:
+            return [and_(sort_col.is_(None), id_after), sort_col.isnot(None)]
+        return [key_after]
+    if value is None:
+        return [and_(sort_col.is_(None), id_after)]
+    return [key_after, sort_col.is_(None)] if nullable else [key_after]
+
+
+# ── Total (cache theo tag) ────────────────────────────────────────
+def cached_total(stmt) -> int:
+    view = current_app.view_functions.get(request.endpoint)
+    tags_fn = getattr(view, "cache_tags", None)
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    if tags_fn is None:
+        return db.session.execute(count_stmt).scalar()
+
+    versions = tag_versions(list(tags_fn(**(request.view_args or {}))))
+    args = sorted((k, v) for k, v in request.args.items(multi=True) if k not in _NON_FILTER_ARGS)
+    key = f"count/{request.path}?{urlencode(args)}|" + ",".join(f"{t}={v}" for t, v in versions.items())
+    total = cache.get(key)
+    if total is None:
+        total = db.session.execute(count_stmt).scalar()
+        cache.set(key, total, timeout=COUNT_TIMEOUT)
+    return total
+
+
+# ── Response ──────────────────────────────────────────────────────
+def paginated_response(proj, stmt, sort_col, id_col, desc: bool = False,
+                       sort_name: str = "default", default_per_page: int = 20,
+                       max_per_page: int = 100, extra: Optional[Dict] = None):
+    """
+    stmt: proj.select() da co WHERE (chua ORDER BY / LIMIT). Sap xep
+    sort_col, id_col cung chieu (NULL theo mac dinh cua DB de dung duoc index)
+    roi tra JSON trang hien tai.
+    """
+    per_page = max(1, min(request.args.get("per_page", default_per_page, type=int), max_per_page))
+    cursor = request.args.get("cursor")
+    page = request.args.get("page", type=int)
+    with_total = request.args.get("with_total", "").lower() in ("1", "true", "yes")
+
+    ordered = stmt.order_by(sort_col.desc(), id_col.desc()) if desc else stmt.order_by(sort_col, id_col)
+    # 2 cot cuoi moi dong = (sort, id) de dung cursor
+    ordered = ordered.add_columns(sort_col, id_col)
+    segments: List = [None]
+    payload: Dict = {}
+
+    if page and not cursor:
+        # Client cu (?page=N): LIMIT/OFFSET + total/pages (COUNT da cache)
+        ordered = ordered.offset((page - 1) * per_page) if page > 1 else ordered
+        payload["page"] = page
+        with_total = True
+    elif cursor:
+        try:
+            value, row_id = decode_cursor(cursor, sort_name)
+        except InvalidCursor:
+            return json_response({"error": "Invalid cursor"}, 400)
+        segments = _segments(sort_col, id_col, value, row_id, desc)
+    else:
+        payload["page"] = 1
+
+    # Lay them 1 dong de biet con trang sau khong; doan tiep theo (vd. cac dong
+    # NULL) chi query khi doan truoc khong du
+    rows: List = []
+    for cond in segments:
+        query = ordered if cond is None else ordered.where(cond)
+        rows += db.session.execute(query.limit(per_page + 1 - len(rows))).all()
+        if len(rows) > per_page:
+            break
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    payload["items"] = proj.rows(rows)
+    payload["next_cursor"] = encode_cursor(sort_name, rows[-1][-2], rows[-1][-1]) if has_more else None
+    payload["per_page"] = per_page
+    if with_total:
+        total = cached_total(stmt)
+        payload["total"] = total
+        payload["pages"] = math.ceil(total / per_page)
+    if extra:
+        payload.update(extra)
+    return json_response(payload)
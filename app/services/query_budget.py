@@ -0,0 +1,64 @@
+"""
+app/services/query_budget.py
+Dem so query SQL moi request va so voi ngan sach khai bao tren view:
+
+  @players_bp.route("/")
+  @query_budget(3)
+  def get_players(): ...
+
+QUERY_BUDGET_MODE (config):
+  raise  -> vuot ngan sach = loi 500 (TestingConfig: test bat duoc N+1 moi)
+  log    -> chi log warning (development)
+  off    -> khong dem (production)
+"""
+import logging
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(limit: int):
+    """So query toi da cua view (ke ca COUNT cua paginate, khong tinh cache hit)."""
+    def decorator(f):
+        f.query_budget = limit
+        return f
+    return decorator
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    # Chi dem query trong request (writer thread / scheduler khong co request context)
+    if has_request_context() and "query_count" in g:
+        g.query_count += 1
+
+
+def _before_request():
+    g.query_count = 0
+
+
+def _after_request(resp):
+    view = current_app.view_functions.get(request.endpoint)
+    limit = getattr(view, "query_budget", None)
+    count = g.get("query_count", 0)
+    if limit is None or count <= limit:
+        return resp
+    msg = f"{request.method} {request.full_path} ran {count} queries (budget {limit})"
+    if current_app.config.get("QUERY_BUDGET_MODE") == "raise":
+        raise QueryBudgetExceeded(msg)
+    logger.warning(f"[QueryBudget] {msg}")
+    return resp
+
+
+def init_query_budget(app):
+    if app.config.get("QUERY_BUDGET_MODE", "off") == "off":
+        return
+    if not event.contains(Engine, "before_cursor_execute", _count_query):
+        event.listen(Engine, "before_cursor_execute", _count_query)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
@@ -1,7 +1,8 @@
 """
 app/services/scheduler.py
 APScheduler - Background jobs tự động cập nhật dữ liệu.
-Real-time: LIVE(60s), END_DETECT(90s), STANDINGS(1h), NEWS(30m), PLAYERS(24h), FIXTURES(6h)
+Real-time: LIVE(60s, chi tran dang da), END_DETECT(90s), STANDINGS(1h), NEWS(30m), PLAYERS(24h), FIXTURES(6h),
+          BRACKET(30m, nhanh knockout UCL)
 """
 import asyncio
 import logging
@@ -12,14 +13,26 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.jobstores.memory import MemoryJobStore
 
+from app.services.ingest_queue import enqueue, get_ingest_queue, start_ingest_queue
+
 logger = logging.getLogger(__name__)
 _scheduler = None
 
+# Job live/end-detector can payload moi hon freshness window mac dinh
+LIVE_SNAPSHOT_MAX_AGE = 30
+
 
 def start_scheduler(app):
     global _scheduler
     if _scheduler and _scheduler.running:
         return
+    from scripts.crawlers.league_snapshot import league_snapshots
+    league_snapshots.max_age = app.config.get("LEAGUE_SNAPSHOT_MAX_AGE", league_snapshots.max_age)
+    from scripts.utils.rate_limiter import rate_limiter
+    rate_limiter.rate = app.config.get("CRAWLER_RATE_PER_HOST", rate_limiter.rate)
+    rate_limiter.burst = app.config.get("CRAWLER_BURST_PER_HOST", rate_limiter.burst)
+    # Writer thread duy nhat cho moi job (ghi DB qua enqueue)
+    start_ingest_queue(app)
     _scheduler = BackgroundScheduler(
         jobstores={"default": MemoryJobStore()},
         executors={"default": ThreadPoolExecutor(max_workers=4)},
@@ -38,8 +51,10 @@ def start_scheduler(app):
                        id="players", args=[app], replace_existing=True)
     _scheduler.add_job(_job_fixtures, IntervalTrigger(hours=6),
                        id="fixtures", args=[app], replace_existing=True)
+    _scheduler.add_job(_job_bracket, IntervalTrigger(minutes=30),
+                       id="bracket", args=[app], replace_existing=True)
     _scheduler.start()
-    logger.info("Scheduler started with 6 jobs")
+    logger.info("Scheduler started with 7 jobs")
     _run_initial_crawl(app)
 
 
@@ -50,36 +65,57 @@ def _run_initial_crawl(app):
             _job_standings(app)
             _job_fixtures(app)
             _job_news(app)
+            _job_bracket(app)
     threading.Thread(target=run, daemon=True).start()
 
 
-def _run_crawler_sync(crawler_class):
+def _run_crawler_sync(crawler_class, job: str = "", force: bool = False, max_age: float = None):
+    """
+    Moi job la 1 consumer rieng cua HTTP cache: payload khong doi ke tu lan
+    chay truoc cua job do -> crawler tra [] (bo qua parse + DBWriter).
+    max_age: do tuoi toi da cua league snapshot dung chung (None = mac dinh).
+    Tra (records, mark_seen): truyen mark_seen lam on_commit cua enqueue de payload
+    chi bi danh dau da xu ly khi writer commit thanh cong.
+    """
     try:
-        return crawler_class().run_sync()
+        consumer = f"{job}.{crawler_class.__name__}" if job else None
+        crawler = crawler_class(consumer=consumer, snapshot_max_age=max_age)
+        return crawler.run_sync(force=force), crawler.mark_seen
     except Exception as e:
         logger.error(f"Crawler error: {e}")
-        return []
+        return [], None
 
 
 def _job_live_matches(app):
+    """
+    Live tick: chi poll tran LIVE/HT + tran sap/vua da (matches?date / matchDetails)
+    va chi ghi cot status / ti so / phut thay doi.
+    """
     with app.app_context():
         try:
+            from sqlalchemy import and_, or_
             from app.models import Match
-            live_count = Match.query.filter_by(status="LIVE").count()
-            soon = Match.query.filter(
-                Match.status == "SCHEDULED",
-                Match.kickoff_at <= datetime.now(timezone.utc) + timedelta(minutes=10),
-                Match.kickoff_at >= datetime.now(timezone.utc) - timedelta(hours=3),
-            ).count()
-            if not live_count and not soon:
+            now = datetime.now(timezone.utc)
+            tracked = Match.query.filter(or_(
+                Match.status.in_(("LIVE", "HT")),
+                and_(Match.status == "SCHEDULED",
+                       Match.kickoff_at <= now + timedelta(minutes=10),
+                       Match.kickoff_at >= now - timedelta(hours=3)),
+            )).all()
+            if not tracked:
                 return
-            from scripts.crawlers.pl_matches import PLMatchesCrawler
-            from scripts.crawlers.ucl_matches import UCLMatchesCrawler
-            from scripts.utils.db_writer import DBWriter
-            data = (_run_crawler_sync(PLMatchesCrawler) +
-                    _run_crawler_sync(UCLMatchesCrawler))
+            from scripts.crawlers.live_scores import LiveScoreCrawler
+            prev_status = {m.source_id: m.status for m in tracked if m.source_id}
+            days = {m.kickoff_at.date() for m in tracked if m.kickoff_at} or {now.date()}
+            data = LiveScoreCrawler().fetch_live(prev_status, days=days)
             if data:
-                DBWriter().upsert_matches(data)
+                just_finished = [r for r in data if r["status"] == "FT"
+                                 and prev_status.get(r["source_id"]) != "FT"]
+                finished_ids = {r["source_id"] for r in just_finished}
+                leagues = {m.league for m in tracked if m.source_id in finished_ids}
+                # Standings chi cap nhat sau khi ket qua FT da commit
+                on_commit = _after_commit(app, "LiveJob", len(just_finished), leagues) if just_finished else None
+                enqueue(app, "live", data, on_commit=on_commit)
         except Exception as e:
             logger.error(f"LiveJob error: {e}")
 
@@ -97,31 +133,48 @@ def _job_match_end_detector(app):
                 return
             from scripts.crawlers.pl_matches import PLMatchesCrawler
             from scripts.crawlers.ucl_matches import UCLMatchesCrawler
-            from scripts.utils.db_writer import DBWriter
-            results = (_run_crawler_sync(PLMatchesCrawler) +
-                       _run_crawler_sync(UCLMatchesCrawler))
+            # Can toan bo ket qua de doi chieu -> khong bo qua khi payload khong doi
+            results = (_run_crawler_sync(PLMatchesCrawler, force=True, max_age=LIVE_SNAPSHOT_MAX_AGE)[0] +
+                       _run_crawler_sync(UCLMatchesCrawler, force=True, max_age=LIVE_SNAPSHOT_MAX_AGE)[0])
             ended_ids = {m.source_id for m in ended}
             just_finished = [r for r in results if r.get("status") == "FT"
                              and r.get("source_id") in ended_ids]
             if just_finished:
-                DBWriter().upsert_matches(just_finished)
-                logger.info(f"EndDetector: {len(just_finished)} FT -> updating standings")
-                _job_standings(app)
+                enqueue(app, "matches", just_finished,
+                        on_commit=_after_commit(app, "EndDetector", len(just_finished),
+                                                {r.get("league") for r in just_finished}))
         except Exception as e:
             logger.error(f"EndDetector error: {e}")
 
 
+def _after_commit(app, source: str, count: int, leagues):
+    """
+    on_commit cho record FT: chay trong writer thread nen chi dat job standings
+    (va bracket neu co tran UCL) chay ngay tren scheduler, khong crawl tai cho.
+    """
+    jobs = [("standings_after_ft", _job_standings)]
+    if "UCL" in leagues:
+        jobs.append(("bracket_after_ft", _job_bracket))
+
+    def run():
+        logger.info(f"{source}: {count} FT committed -> updating standings")
+        for job_id, fn in jobs:
+            if _scheduler and _scheduler.running:
+                _scheduler.add_job(fn, args=[app], id=job_id, replace_existing=True)
+            else:
+                fn(app)
+    return run
+
+
 def _job_standings(app):
     with app.app_context():
         try:
             from scripts.crawlers.pl_standings import PLStandingsCrawler
             from scripts.crawlers.ucl_standings import UCLStandingsCrawler
-            from scripts.utils.db_writer import DBWriter
-            w = DBWriter()
-            pl = _run_crawler_sync(PLStandingsCrawler)
-            ucl = _run_crawler_sync(UCLStandingsCrawler)
-            if pl: w.upsert_standings(pl, league="PL")
-            if ucl: w.upsert_standings(ucl, league="UCL")
+            records, seen = _run_crawler_sync(PLStandingsCrawler, "standings")
+            enqueue(app, "standings", records, league="PL", on_commit=seen)
+            records, seen = _run_crawler_sync(UCLStandingsCrawler, "standings")
+            enqueue(app, "standings", records, league="UCL", on_commit=seen)
         except Exception as e:
             logger.error(f"StandingsJob error: {e}")
 
@@ -131,12 +184,10 @@ def _job_news(app):
         try:
             from scripts.crawlers.pl_news import PLNewsCrawler
             from scripts.crawlers.ucl_news import UCLNewsCrawler
-            from scripts.utils.db_writer import DBWriter
-            w = DBWriter()
-            pl = _run_crawler_sync(PLNewsCrawler)
-            ucl = _run_crawler_sync(UCLNewsCrawler)
-            if pl: w.upsert_news(pl)
-            if ucl: w.upsert_news(ucl)
+            records, seen = _run_crawler_sync(PLNewsCrawler, "news")
+            enqueue(app, "news", records, on_commit=seen)
+            records, seen = _run_crawler_sync(UCLNewsCrawler, "news")
+            enqueue(app, "news", records, on_commit=seen)
         except Exception as e:
             logger.error(f"NewsJob error: {e}")
 
@@ -145,9 +196,8 @@ def _job_players(app):
     with app.app_context():
         try:
             from scripts.crawlers.pl_players import PLPlayersCrawler
-            from scripts.utils.db_writer import DBWriter
-            data = _run_crawler_sync(PLPlayersCrawler)
-            if data: DBWriter().upsert_players(data)
+            records, seen = _run_crawler_sync(PLPlayersCrawler, "players")
+            enqueue(app, "players", records, on_commit=seen)
         except Exception as e:
             logger.error(f"PlayersJob error: {e}")
 
@@ -157,20 +207,29 @@ def _job_fixtures(app):
         try:
             from scripts.crawlers.pl_matches import PLMatchesCrawler
             from scripts.crawlers.ucl_matches import UCLMatchesCrawler
-            from scripts.utils.db_writer import DBWriter
-            w = DBWriter()
-            pl = _run_crawler_sync(PLMatchesCrawler)
-            ucl = _run_crawler_sync(UCLMatchesCrawler)
-            if pl: w.upsert_matches(pl)
-            if ucl: w.upsert_matches(ucl)
+            records, seen = _run_crawler_sync(PLMatchesCrawler, "fixtures")
+            enqueue(app, "matches", records, on_commit=seen)
+            records, seen = _run_crawler_sync(UCLMatchesCrawler, "fixtures")
+            enqueue(app, "matches", records, on_commit=seen)
         except Exception as e:
             logger.error(f"FixturesJob error: {e}")
 
 
+def _job_bracket(app):
+    with app.app_context():
+        try:
+            from scripts.crawlers.ucl_bracket import UCLBracketCrawler
+            records, seen = _run_crawler_sync(UCLBracketCrawler, "bracket")
+            enqueue(app, "bracket", records, league="UCL", on_commit=seen)
+        except Exception as e:
+            logger.error(f"BracketJob error: {e}")
+
+
 def trigger_job(job_id: str, app) -> bool:
     mapping = {
         "live": _job_live_matches, "standings": _job_standings,
         "news": _job_news, "players": _job_players, "fixtures": _job_fixtures,
+        "bracket": _job_bracket,
     }
     fn = mapping.get(job_id)
     if fn:
@@ -182,9 +241,18 @@ def trigger_job(job_id: str, app) -> bool:
 def get_scheduler_status() -> dict:
     if not _scheduler:
         return {"running": False, "jobs": []}
+    from scripts.crawlers.league_snapshot import league_snapshots
+    from scripts.utils.rate_limiter import rate_limiter
+    from app.services.snapshots import snapshot_stats
+    from app.services.cache_tags import cache_stats
     return {
         "running": _scheduler.running,
         "jobs": [{"id": j.id, "name": j.name,
                   "next_run": j.next_run_time.isoformat() if j.next_run_time else None}
                  for j in _scheduler.get_jobs()],
+        "league_snapshots": league_snapshots.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "ingest_queue": get_ingest_queue().stats() if get_ingest_queue() else None,
+        "snapshots": snapshot_stats(),
+        "view_cache": cache_stats(),
     }
\ No newline at end of file
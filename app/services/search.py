@@ -0,0 +1,259 @@
+"""
+app/services/search.py
+Full-text search cho news / players / clubs:
+
+  fold(text)                   thuong + bo dau (NFD) + d/o/ae... -> "Ødegaard" = "odegaard"
+  reindex(entity, ids|leagues) dong bo search_documents tu bang goc; goi tu signal
+                               data_changed cua DBWriter nen index luon theo kip upsert
+  search_ids(q, entities, ...) {entity: [id, ...]} xep theo do lien quan, toi da `limit` / entity
+  hydrate(entity, ids)         item JSON (cung shape voi endpoint danh sach) theo thu tu ids
+
+Backend theo dialect (ensure_search_index() tao index, chay khi khoi dong - run.py):
+  SQLite      FTS5 (external content) + bm25, title trong so x10
+  PostgreSQL  GIN to_tsvector('simple') + ts_rank; them pg_trgm (title % q) neu co
+  khac / thieu FTS5  LIKE tren cot da fold (van khong phan biet dau)
+"""
+import logging
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, bindparam, delete, insert, select, text
+
+from app.extensions import db
+from app.models import Club, News, Player, SearchDocument
+from app.models.search import SEARCH_DDL
+
+logger = logging.getLogger(__name__)
+
+SEARCHABLE = ("news", "players", "clubs")
+MAX_TOKENS = 8
+TITLE_WEIGHT = 10.0
+
+# Ky tu NFD khong tach duoc dau
+_FOLD_EXTRA = str.maketrans({"đ": "d", "ø": "o", "æ": "ae", "œ": "oe", "ß": "ss", "ł": "l", "ı": "i"})
+_TOKEN = re.compile(r"\w+")
+_backends: Dict[str, str] = {}
+
+
+# ── Chuan hoa ─────────────────────────────────────────────────────
+def fold(value) -> str:
+    """Chu thuong, bo dau tieng Viet / Latin: "Hà Nội Đức" -> "ha noi duc"."""
+    if not value:
+        return ""
+    nfd = unicodedata.normalize("NFD", str(value).lower().translate(_FOLD_EXTRA))
+    return "".join(c for c in nfd if unicodedata.category(c) != "Mn")
+
+
+def tokens(q: str) -> List[str]:
+    return _TOKEN.findall(fold(q))[:MAX_TOKENS]
+
+
+def _join(*parts) -> str:
+    return fold(" ".join(str(p) for p in parts if p))
+
+
+# ── Document builders ─────────────────────────────────────────────
+def _news_docs(where) -> List[Dict]:
+    rows = db.session.execute(
+        select(News.id, News.league, News.season, News.title, News.excerpt, News.category, News.tags)
+        .where(where))
+    return [{"entity": "news", "entity_id": r.id, "league": r.league, "season": r.season,
+             "title": fold(r.title), "body": _join(r.excerpt, r.category, r.tags)} for r in rows]
+
+
+def _player_docs(where) -> List[Dict]:
+    rows = db.session.execute(
+        select(Player.id, Player.league, Player.season, Player.name, Player.first_name, Player.last_name,
+               Player.nationality, Player.position, Club.name.label("club_name"))
+        .outerjoin(Club, Club.id == Player.club_id)
+        .where(where))
+    return [{"entity": "players", "entity_id": r.id, "league": r.league, "season": r.season,
+             "title": fold(r.name),
+             "body": _join(r.first_name, r.last_name, r.nationality, r.position, r.club_name)} for r in rows]
+
+
+def _club_docs(where) -> List[Dict]:
+    rows = db.session.execute(
+        select(Club.id, Club.league, Club.season, Club.name, Club.short_name, Club.full_name,
+               Club.stadium_name, Club.stadium_city, Club.country, Club.manager)
+        .where(where))
+    return [{"entity": "clubs", "entity_id": r.id, "league": r.league, "season": r.season,
+             "title": fold(r.name),
+             "body": _join(r.short_name, r.full_name, r.stadium_name, r.stadium_city, r.country, r.manager)}
+            for r in rows]
+
+
+_SOURCES = {
+    "news": (News, _news_docs),
+    "players": (Player, _player_docs),
+    "clubs": (Club, _club_docs),
+}
+
+
+def reindex(entity: str, ids: Optional[Iterable[int]] = None, leagues: Optional[Iterable[str]] = None) -> int:
+    """Xoa + ghi lai document cua entity (theo ids, theo leagues, hoac toan bo)."""
+    model, build = _SOURCES[entity]
+    doc = SearchDocument
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return 0
+        where, doc_where = model.id.in_(ids), and_(doc.entity == entity, doc.entity_id.in_(ids))
+    elif leagues is not None:
+        leagues = list(leagues)
+        where, doc_where = model.league.in_(leagues), and_(doc.entity == entity, doc.league.in_(leagues))
+    else:
+        where, doc_where = model.id.isnot(None), doc.entity == entity
+
+    docs = build(where)
+    db.session.execute(delete(doc).where(doc_where))
+    if docs:
+        db.session.execute(insert(doc), docs)
+    db.session.commit()
+    return len(docs)
+
+
+def _on_data_changed(entity: str, leagues=None, ids=None, **_):
+    if entity not in SEARCHABLE:
+        return
+    try:
+        ids = list(ids) if ids else None
+        count = reindex(entity, ids=ids, leagues=None if ids else (leagues or ()))
+        if entity == "clubs" and ids:
+            # Ten CLB nam trong body cua cau thu
+            player_ids = db.session.execute(select(Player.id).where(Player.club_id.in_(ids))).scalars().all()
+            reindex("players", ids=player_ids)
+        logger.debug(f"[Search] Reindexed {count} {entity} document(s)")
+    except Exception as e:
+        # Index loi khong duoc lam hong lan ghi da commit
+        db.session.rollback()
+        logger.error(f"[Search] Reindex {entity} failed: {e}")
+
+
+# ── Backend ───────────────────────────────────────────────────────
+def _backend() -> str:
+    engine = db.engine
+    key = str(engine.url)
+    if key not in _backends:
+        dialect = engine.dialect.name
+        backend = "like"
+        with engine.connect() as conn:
+            if dialect == "sqlite":
+                if conn.exec_driver_sql(
+                        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='search_fts'").first():
+                    backend = "fts5"
+            elif dialect == "postgresql":
+                backend = "tsvector"
+                if conn.exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'").first():
+                    backend = "tsvector+trgm"
+        _backends[key] = backend
+    return _backends[key]
+
+
+def ensure_search_index(backfill: bool = True) -> str:
+    """Tao index full-text (idempotent) + backfill lan dau. Tra ve backend dang dung."""
+    engine = db.engine
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            for ddl in SEARCH_DDL.get(dialect, []):
+                conn.exec_driver_sql(ddl)
+    except Exception as e:
+        logger.error(f"[Search] Full-text index unavailable on {dialect}, using LIKE: {e}")
+    for ddl in SEARCH_DDL.get(f"{dialect}_optional", []):
+        try:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(ddl)
+        except Exception as e:
+            logger.warning(f"[Search] Optional index skipped: {e}")
+            break
+    _backends.pop(str(engine.url), None)
+
+    if backfill and db.session.execute(select(SearchDocument.id).limit(1)).first() is None:
+        counts = {entity: reindex(entity) for entity in SEARCHABLE}
+        logger.info(f"[Search] Backfilled search_documents: {counts}")
+    return _backend()
+
+
+# ── Query ─────────────────────────────────────────────────────────
+_RANKED = """
+SELECT entity, entity_id FROM (
+  SELECT d.entity, d.entity_id,
+         ROW_NUMBER() OVER (PARTITION BY d.entity ORDER BY {rank}) AS rn
+  FROM {source}
+  WHERE d.entity IN :entities {league} AND ({match})
+) ranked
+WHERE rn > :offset AND rn <= :offset + :limit
+ORDER BY entity, rn
+"""
+
+
+def _ranked_sql(backend: str, league: bool):
+    if backend == "fts5":
+        parts = dict(source="search_fts JOIN search_documents d ON d.id = search_fts.rowid",
+                     match="search_fts MATCH :match",
+                     rank=f"bm25(search_fts, {TITLE_WEIGHT}, 1.0)")
+    elif backend.startswith("tsvector"):
+        vector = "to_tsvector('simple', d.title || ' ' || d.body)"
+        rank = f"ts_rank({vector}, to_tsquery('simple', :match))"
+        match = f"{vector} @@ to_tsquery('simple', :match)"
+        if backend.endswith("trgm"):
+            rank += " + similarity(d.title, :raw)"
+            match += " OR d.title % :raw"
+        parts = dict(source="search_documents d", match=match, rank=f"{rank} DESC")
+    else:
+        parts = dict(source="search_documents d",
+                     match="(d.title || ' ' || d.body) LIKE :like",
+                     rank="CASE WHEN d.title LIKE :prefix THEN 0 ELSE 1 END, length(d.title)")
+    sql = _RANKED.format(league="AND d.league = :league" if league else "", **parts)
+    return text(sql).bindparams(bindparam("entities", expanding=True))
+
+
+def search_ids(q: str, entities: Iterable[str] = SEARCHABLE, league: str = "",
+               limit: int = 5, offset: int = 0) -> Dict[str, List[int]]:
+    """1 query cho moi entity: {entity: [id, ...]} theo do lien quan giam dan."""
+    entities = [e for e in entities if e in SEARCHABLE]
+    result: Dict[str, List[int]] = {e: [] for e in entities}
+    words = tokens(q)
+    if not words or not entities:
+        return result
+
+    backend = _backend()
+    params = {"entities": entities, "limit": limit, "offset": offset}
+    if backend == "fts5":
+        params["match"] = " ".join(f'"{w}"*' for w in words)      # AND cac tien to
+    elif backend.startswith("tsvector"):
+        params["match"] = " & ".join(f"{w}:*" for w in words)
+        params["raw"] = " ".join(words)
+    else:
+        params["like"] = "%" + "%".join(words) + "%"
+        params["prefix"] = words[0] + "%"
+    if league:
+        params["league"] = league
+
+    for entity, entity_id in db.session.execute(_ranked_sql(backend, bool(league)), params):
+        result[entity].append(entity_id)
+    return result
+
+
+# ── Hydrate ───────────────────────────────────────────────────────
+def hydrate(entity: str, ids: List[int], fields: Optional[str] = None) -> List[Dict]:
+    """Item JSON cua ids (giu thu tu xep hang); 1 query / entity."""
+    if not ids:
+        return []
+    from app.services.serializers import NEWS_LIST, PLAYER_LIST
+    if entity == "clubs":
+        by_id = {c.id: c.to_dict() for c in Club.query.filter(Club.id.in_(ids))}
+    else:
+        proj = (NEWS_LIST if entity == "news" else PLAYER_LIST).only(fields)
+        model = News if entity == "news" else Player
+        rows = db.session.execute(proj.select(model.id).where(model.id.in_(ids))).all()
+        by_id = {row[-1]: proj.row(row) for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def init_search(app):
+    """Noi data_changed -> reindex. Goi truoc init_cache_tags: index moi xong roi cache moi doi version."""
+    from scripts.utils.db_writer import data_changed
+    data_changed.connect(_on_data_changed)
@@ -0,0 +1,210 @@
+"""
+app/services/serializers.py
+Serialize nhanh cho cac endpoint danh sach:
+  - SELECT chi cac cot endpoint tra ve (row tuple, khong hydrate ORM entity)
+  - moi field output = 1 ham nho tren cac cot cua no (cung shape voi Model.to_dict)
+  - encode bang orjson (fallback json chuan neu chua cai)
+  - cot JSON text (events_json, tags) nhung thang vao body (orjson.Fragment), khong
+    parse tung row; item chi dung de dumps() - code Python can list thi tu loads()
+  - ?fields=id,home_team,status -> chi SELECT / tra ve cac field do
+
+  proj = MATCH_LIST.only(request.args.get("fields"))
+  rows = db.session.execute(proj.select().where(Match.league == "PL")).all()
+  return json_response({"items": proj.rows(rows)})
+"""
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.models import Club, Match, News, Player, Statistic
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson la tuy chon
+    orjson = None
+
+
+# ── JSON ──────────────────────────────────────────────────────────
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(value):
+    return orjson.loads(value) if orjson is not None else json.loads(value)
+
+
+def raw_json(value):
+    """Body JSON da serialize (vd. response con cua /api/batch) nhung thang vao payload."""
+    if orjson is not None and hasattr(orjson, "Fragment"):   # orjson >= 3.9: khong parse lai
+        return orjson.Fragment(value)
+    return loads(value)
+
+
+def json_response(payload, status: int = 200):
+    return current_app.response_class(dumps(payload), status=status, mimetype="application/json")
+
+
+# ── Projection ────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Field:
+    name: str
+    columns: Tuple
+    build: Optional[Callable[..., Any]] = None   # None -> gia tri cua cot duy nhat
+
+
+def col(name: str, column) -> Field:
+    return Field(name, (column,))
+
+
+class Projection:
+    """Danh sach Field + FROM / JOIN chung; only() cat bot field theo ?fields=."""
+
+    def __init__(self, entity, fields: Sequence[Field], joins: Sequence[Tuple] = ()):
+        self.entity = entity
+        self.fields = list(fields)
+        self.joins = list(joins)           # (target, onclause, isouter)
+        self.names = [f.name for f in self.fields]
+        self._columns: List = []
+        self._slices: List[Tuple[Field, List[int]]] = []
+        index: Dict[int, int] = {}
+        for f in self.fields:
+            positions = []
+            for c in f.columns:
+                if id(c) not in index:
+                    index[id(c)] = len(self._columns)
+                    self._columns.append(c)
+                positions.append(index[id(c)])
+            self._slices.append((f, positions))
+
+    def only(self, fields: Optional[str]) -> "Projection":
+        wanted = {f.strip() for f in (fields or "").split(",") if f.strip()}
+        chosen = [f for f in self.fields if f.name in wanted]
+        if not chosen or len(chosen) == len(self.fields):
+            return self
+        return Projection(self.entity, chosen, self.joins)
+
+    def select(self, *extra):
+        """SELECT cac cot can thiet (+ cot phu `extra`, vd. cot sort cho cursor)."""
+        stmt = select(*self._columns, *extra).select_from(self.entity)
+        for target, onclause, isouter in self.joins:
+            stmt = stmt.join(target, onclause, isouter=isouter)
+        return stmt
+
+    def row(self, row) -> Dict:
+        out = {}
+        for f, positions in self._slices:
+            if f.build is None:
+                out[f.name] = row[positions[0]]
+            else:
+                out[f.name] = f.build(*(row[i] for i in positions))
+        return out
+
+    def rows(self, rows) -> List[Dict]:
+        return [self.row(r) for r in rows]
+
+
+# ── Builders ──────────────────────────────────────────────────────
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _json_list(value):
+    return raw_json(value) if value else []
+
+
+def _team(club_id, name, club_name, badge, club_badge, score, score_ht):
+    return {"id": club_id, "name": name or club_name, "badge": badge or club_badge,
+            "score": score, "score_ht": score_ht}
+
+
+# ── Match (Match.to_dict) ─────────────────────────────────────────
+_HomeClub, _AwayClub = aliased(Club), aliased(Club)
+
+MATCH_LIST = Projection(Match, [
+    col("id", Match.id), col("source_id", Match.source_id),
+    col("league", Match.league), col("season", Match.season),
+    col("matchweek", Match.matchweek), col("round", Match.round), col("group", Match.group),
+    Field("home_team", (Match.home_club_id, Match.home_team_name, _HomeClub.name,
+                        Match.home_team_badge, _HomeClub.badge_url,
+                        Match.home_score, Match.home_score_ht), _team),
+    Field("away_team", (Match.away_club_id, Match.away_team_name, _AwayClub.name,
+                        Match.away_team_badge, _AwayClub.badge_url,
+                        Match.away_score, Match.away_score_ht), _team),
+    Field("kickoff_at", (Match.kickoff_at,), _iso),
+    col("status", Match.status), col("minute", Match.minute),
+    col("venue", Match.venue), col("venue_city", Match.venue_city),
+    col("referee", Match.referee), col("attendance", Match.attendance),
+    col("is_knockout", Match.is_knockout), col("leg", Match.leg),
+    col("agg_home", Match.agg_home), col("agg_away", Match.agg_away),
+    col("ended_aet", Match.ended_aet), col("ended_pen", Match.ended_pen),
+    Field("events", (Match.events_json,), _json_list),
+    Field("updated_at", (Match.updated_at,), _iso),
+], joins=[
+    (_HomeClub, _HomeClub.id == Match.home_club_id, True),
+    (_AwayClub, _AwayClub.id == Match.away_club_id, True),
+])
+
+# ── Statistic (Statistic.to_dict) ─────────────────────────────────
+_STAT_COLUMNS = (
+    "appearances", "starts", "minutes_played", "goals", "assists", "expected_goals",
+    "expected_assists", "shots", "shots_on_target", "big_chances_created",
+    "passes", "pass_accuracy", "key_passes",
+    "tackles", "interceptions", "clearances", "duels_won",
+    "saves", "save_percentage", "clean_sheets",
+    "yellow_cards", "red_cards", "fouls_committed", "average_rating",
+)
+
+STATISTIC_LIST = Projection(Statistic, [
+    col("id", Statistic.id), col("league", Statistic.league), col("season", Statistic.season),
+    col("player_id", Statistic.player_id),
+    col("player_name", Player.name), col("player_photo", Player.photo_url),
+    col("player_position", Player.position),
+    col("club_id", Statistic.club_id), col("club_name", Club.name), col("club_badge", Club.badge_url),
+    *[col(name, getattr(Statistic, name)) for name in _STAT_COLUMNS],
+    Field("updated_at", (Statistic.updated_at,), _iso),
+], joins=[
+    (Player, Player.id == Statistic.player_id, False),
+    (Club, Club.id == Statistic.club_id, True),
+])
+
+# ── Player (Player.to_dict) ───────────────────────────────────────
+PLAYER_LIST = Projection(Player, [
+    col("id", Player.id), col("source_id", Player.source_id),
+    col("league", Player.league), col("season", Player.season),
+    col("club_id", Player.club_id), col("club_name", Club.name), col("club_badge", Club.badge_url),
+    col("name", Player.name), col("first_name", Player.first_name), col("last_name", Player.last_name),
+    Field("date_of_birth", (Player.date_of_birth,), _iso),
+    Field("age", (Player.date_of_birth,), Player.age_from),
+    Field("age_detail", (Player.date_of_birth,), Player.age_detail_from),
+    col("nationality", Player.nationality), col("position", Player.position),
+    col("shirt_number", Player.shirt_number),
+    col("photo_url", Player.photo_url), col("flag_url", Player.flag_url),
+    col("height_cm", Player.height_cm), col("weight_kg", Player.weight_kg), col("foot", Player.foot),
+], joins=[
+    (Club, Club.id == Player.club_id, True),
+])
+
+# ── News (News.to_dict, full=False) ───────────────────────────────
+NEWS_LIST = Projection(News, [
+    col("id", News.id), col("source_id", News.source_id), col("source_url", News.source_url),
+    col("league", News.league), col("season", News.season),
+    col("title", News.title), col("slug", News.slug), col("excerpt", News.excerpt),
+    col("thumbnail_url", News.thumbnail_url), col("image_url", News.image_url),
+    col("category", News.category),
+    Field("tags", (News.tags,), _json_list),
+    col("author", News.author), col("source_name", News.source_name),
+    Field("published_at", (News.published_at,), _iso),
+])
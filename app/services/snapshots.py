@@ -0,0 +1,157 @@
+"""
+app/services/snapshots.py
+Snapshot JSON da serialize san cho cac endpoint doc nhieu (standings, rounds...).
+
+  @standings_bp.route("/")
+  @snapshot("standings", entity="standings", tags=league_tags("standings"))
+  def get_standings(): ...            # view goc = builder / fallback DB
+
+Moi (endpoint, query, version tag) -> 1 entry trong cache backend (league / season
+trung mac dinh bi bo khoi query: /standings/ va /standings/?league=PL&season=2025
+dung chung 1 snapshot, ban build lai sau khi ghi cung trung request khong tham so):
+  {"body": bytes, "encoded": {"br": bytes, "gzip": bytes}, "mimetype": ..., "built_at": epoch}
+Request doc thang bytes (br / gzip neu client nhan), khong query DB, khong to_dict().
+Sau khi DBWriter ghi entity (signal tags_invalidated), snapshot cua league bi
+anh huong (mua hien tai) duoc build lai ngay -> request dau tien cung trung.
+"""
+import functools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+from flask import Response, current_app, request, url_for
+
+from app.extensions import cache
+from app.services.cache_tags import tag_versions, tagged
+from app.services.compression import COMPRESS_MIN_SIZE, choose_encoding, compress, encodings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "snap/"
+SNAPSHOT_TIMEOUT = 24 * 3600     # Luoi an toan cho bang duoc ghi ngoai DBWriter
+
+
+@dataclass
+class SnapshotSpec:
+    name: str
+    entity: str
+    leagues: Optional[Tuple[str, ...]] = None   # None = moi league trong signal
+
+
+_stats = {"hits": 0, "misses": 0, "warmed": 0, "errors": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(field: str):
+    with _stats_lock:
+        _stats[field] += 1
+
+
+def snapshot(name: str, entity: str, tags: Callable[..., Iterable[str]],
+             leagues: Optional[Iterable[str]] = None, timeout: int = SNAPSHOT_TIMEOUT,
+             default_league: str = "PL"):
+    """
+    Phuc vu view tu bytes da serialize; miss -> chay view roi luu lai.
+    default_league: league view dung khi thieu ?league= (bo khoi key snapshot).
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            versions = tag_versions(list(tags(**kwargs)))
+            qs = _canonical_query(default_league)
+            key = f"{SNAPSHOT_PREFIX}{name}?{qs}|" + ",".join(f"{t}={v}" for t, v in versions.items())
+
+            entry = cache.get(key)
+            if entry is not None:
+                _count("hits")
+                return _respond(entry)
+
+            _count("misses")
+            resp = current_app.make_response(f(*args, **kwargs))
+            if resp.status_code != 200 or resp.direct_passthrough:
+                return resp
+            entry = _pack(resp)
+            cache.set(key, entry, timeout=timeout)
+            return _respond(entry)
+
+        wrapper.snapshot = SnapshotSpec(name, entity, tuple(leagues) if leagues else None)
+        return tagged(tags)(wrapper)
+    return decorator
+
+
+def _canonical_query(default_league: str) -> str:
+    defaults = {"league": default_league.upper(),
+                "season": str(current_app.config.get("CURRENT_SEASON", "2025")).upper()}
+    items = [(k, v) for k, v in request.args.items(multi=True)
+             if defaults.get(k) != v.upper()]
+    return urlencode(sorted(items))
+
+
+def _pack(resp: Response) -> Dict:
+    body = resp.get_data()
+    min_size = current_app.config.get("COMPRESS_MIN_SIZE", COMPRESS_MIN_SIZE)
+    return {
+        "body": body,
+        "encoded": {enc: compress(body, enc) for enc in encodings()} if len(body) >= min_size else {},
+        "mimetype": resp.mimetype,
+        "built_at": time.time(),
+    }
+
+
+def _respond(entry: Dict) -> Response:
+    encoded = entry.get("encoded") or {}
+    encoding = choose_encoding(tuple(encoded)) if encoded else None
+    if encoding:
+        resp = Response(encoded[encoding], mimetype=entry["mimetype"])
+        resp.headers["Content-Encoding"] = encoding
+    else:
+        resp = Response(entry["body"], mimetype=entry["mimetype"])
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
+# ── Build lai sau khi ghi ─────────────────────────────────────────
+def warm_snapshots(app, entity: str, leagues: Iterable[str]) -> int:
+    """Chay lai cac view @snapshot cua `entity` cho tung league (mua hien tai)."""
+    season = app.config.get("CURRENT_SEASON", "2025")
+    leagues = sorted({lg for lg in leagues if lg})
+    warmed = 0
+    for endpoint, view in list(app.view_functions.items()):
+        spec = getattr(view, "snapshot", None)
+        if spec is None or spec.entity != entity:
+            continue
+        for league in leagues:
+            if spec.leagues and league not in spec.leagues:
+                continue
+            try:
+                with app.test_request_context():
+                    url = url_for(endpoint, league=league, season=season)
+                with app.test_request_context(url):
+                    view()
+                warmed += 1
+            except Exception as e:
+                _count("errors")
+                logger.error(f"[Snapshots] Build {spec.name} {league} failed: {e}")
+    if warmed:
+        with _stats_lock:
+            _stats["warmed"] += warmed
+        logger.info(f"[Snapshots] Rebuilt {warmed} snapshot(s) for {entity} {leagues}")
+    return warmed
+
+
+def _on_tags_invalidated(entity: str, leagues=None, **_):
+    if leagues:
+        warm_snapshots(current_app._get_current_object(), entity, leagues)
+
+
+def snapshot_stats() -> Dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def init_snapshots(app):
+    from app.services.cache_tags import tags_invalidated
+    tags_invalidated.connect(_on_tags_invalidated)
@@ -7,6 +7,7 @@ sys.path.insert(0, ".")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
 
 import requests, urllib3
+from scripts.utils.http_cache import get_response_cache
 urllib3.disable_warnings()
 
 HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)", "Accept": "application/json"}
@@ -16,6 +17,8 @@ ESPN_LEAGUES = {
     "UCL": "uefa.champions",
 }
 
+CACHE_CONSUMER = "crawl_events"
+
 def norm_name(name):
     """Chuan hoa ten doi de matching chinh xac hon"""
     # Map ESPN name -> keyword de tim trong DB
@@ -43,9 +46,13 @@ def norm_name(name):
     return " ".join(parts[:2]) if len(parts) >= 2 else parts[0]
 
 def fetch_espn_events(league_slug, date_from="20250801", date_to="20260601"):
-    """Lay tat ca completed matches co events tu ESPN - fetch theo tung thang"""
+    """
+    Lay tat ca completed matches co events tu ESPN - fetch theo tung thang.
+    Tra ve (events, responses); responses dung de kiem tra/danh dau HTTP cache.
+    """
     url = f"https://site.api.espn.com/apis/site/v2/sports/soccer/{league_slug}/scoreboard"
     all_events = []
+    responses = []
 
     # Chia nho thanh tung thang de tranh timeout
     from datetime import datetime, timedelta
@@ -55,21 +62,22 @@ def fetch_espn_events(league_slug, date_from="20250801", date_to="20260601"):
     cur = d_start
     while cur < d_end:
         nxt = min(cur + timedelta(days=30), d_end)
-        params = {"limit": 100, "dates": f"{cur.strftime("%Y%m%d")}-{nxt.strftime("%Y%m%d")}"}
+        params = {"limit": 100, "dates": f"{cur.strftime('%Y%m%d')}-{nxt.strftime('%Y%m%d')}"}
         try:
-            r = requests.get(url, params=params, headers=HEADERS, verify=False, timeout=30)
-            if r.status_code == 200:
+            r = get_response_cache().fetch(url, params=params, headers=HEADERS, verify=False, timeout=30)
+            if r.ok:
                 evs = r.json().get("events", [])
                 all_events.extend(evs)
-                logging.info(f"  {params["dates"]}: {len(evs)} events")
+                responses.append(r)
+                logging.info(f"  {params['dates']}: {len(evs)} events{' (304)' if r.not_modified else ''}")
             else:
-                logging.warning(f"ESPN {league_slug} {params["dates"]}: {r.status_code}")
+                logging.warning(f"ESPN {league_slug} {params['dates']}: {r.status}")
         except Exception as e:
-            logging.error(f"ESPN fetch error {params["dates"]}: {e}")
+            logging.error(f"ESPN fetch error {params['dates']}: {e}")
         time.sleep(1)
         cur = nxt + timedelta(days=1)
 
-    return all_events
+    return all_events, responses
 
 def parse_events(espn_event):
     """Parse ESPN event -> list of normalized events"""
@@ -130,13 +138,18 @@ from app.extensions import db
 app = create_app()
 with app.app_context():
     from app.models import Match
+    from scripts.utils.db_writer import data_changed
 
     total_updated = 0
 
     for LEAGUE, slug in ESPN_LEAGUES.items():
         logging.info(f"\n=== {LEAGUE} ({slug}) ===")
-        espn_events = fetch_espn_events(slug)
+        espn_events, responses = fetch_espn_events(slug)
         logging.info(f"ESPN events: {len(espn_events)}")
+        cache = get_response_cache()
+        if responses and all(cache.is_seen(CACHE_CONSUMER, r.url, r.version) for r in responses):
+            logging.info(f"{LEAGUE}: ESPN data unchanged since last run - skip DB")
+            continue
 
         matched = 0
         for ev in espn_events:
@@ -175,6 +188,9 @@ with app.app_context():
                 matched += 1
 
         db.session.commit()
+        data_changed.send("matches", leagues={LEAGUE}, ids=None)
+        for r in responses:
+            cache.mark_seen(CACHE_CONSUMER, r.url, r.version)
         logging.info(f"{LEAGUE}: matched & updated {matched} matches with events")
         total_updated += matched
 
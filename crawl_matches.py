@@ -39,14 +39,28 @@ with app.app_context():
     from scripts.crawlers.pl_matches  import PLMatchesCrawler
     from scripts.crawlers.ucl_matches import UCLMatchesCrawler
     from scripts.utils.db_writer      import DBWriter
+    from scripts.utils.bulk_loader    import BulkLoader
+    from scripts.utils.fingerprint    import forget_fingerprints
+    from scripts.utils.db_writer      import data_changed
+    from app.models import Match
     writer = DBWriter()
 
-    db.session.execute(db.text("DELETE FROM matches"))
-    db.session.commit()
+    # Reload toan bo -> force de khong bo qua khi payload khong doi (304)
+    loaded = {
+        "PL":  writer.match_rows(PLMatchesCrawler().run_sync(force=True), "PL"),
+        "UCL": writer.match_rows(UCLMatchesCrawler().run_sync(force=True), "UCL"),
+    }
 
-    pl = PLMatchesCrawler().run_sync()
-    n1 = writer.upsert_matches(pl, "PL")
-
-    ucl = UCLMatchesCrawler().run_sync()
-    n2 = writer.upsert_matches(ucl, "UCL")
-    print(f"Done: PL={n1}, UCL={n2}")
\ No newline at end of file
+    # Staging + merge trong 1 transaction (thay cho DELETE FROM matches roi insert lai):
+    # nguoi doc khong bao gio thay bang rong, id tran va events_json duoc giu nguyen.
+    # Moi league 1 stage + scope rieng: crawl 1 league loi (run_sync -> []) khong xoa tran cua no
+    with BulkLoader(db) as bl:
+        for LEAGUE, rows in loaded.items():
+            if not rows:
+                logging.warning(f"{LEAGUE}: khong co du lieu - giu nguyen bang cu")
+                continue
+            bl.stage(f"matches_{LEAGUE}", Match.__table__, list(rows.values()))
+            bl.merge(Match.__table__, f"matches_{LEAGUE}", keys=("source_id",), scope={"league": LEAGUE})
+        forget_fingerprints("match")
+    data_changed.send("matches", leagues={lg for lg, rows in loaded.items() if rows}, ids=None)
+    print(f"Done: PL={len(loaded['PL'])}, UCL={len(loaded['UCL'])}")
@@ -13,6 +13,7 @@ import requests, urllib3
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
+from scripts.utils.http_cache import get_response_cache
 urllib3.disable_warnings()
 
 HEADERS = {
@@ -28,11 +29,14 @@ FEEDS = [
     ("UCL", "The Guardian", "https://www.theguardian.com/football/championsleague/rss"),
 ]
 
+CACHE_CONSUMER = "crawl_news"
+
 def fetch_rss(url):
+    """Conditional GET qua HTTP cache -> CachedResponse (body co ca khi 304) hoac None."""
     try:
-        r = requests.get(url, headers=HEADERS, verify=False, timeout=15)
-        if r.status_code == 200:
-            return r.content
+        r = get_response_cache().fetch(url, headers=HEADERS, verify=False, timeout=15)
+        if r.ok:
+            return r
     except Exception as e:
         logging.warning(f"RSS fetch error {url}: {e}")
     return None
@@ -125,52 +129,48 @@ def parse_rss(content, league, source_name):
 from app import create_app
 from app.extensions import db
 
+# Fetch tat ca feed truoc: neu khong feed nao doi (304 / cung noi dung) thi khong dung DB
+fetched = []
+for league, source, url in FEEDS:
+    logging.info(f"Fetching {source} [{league}]: {url}")
+    resp = fetch_rss(url)
+    if not resp:
+        logging.warning(f"  No content")
+        continue
+    fetched.append((league, source, resp))
+
+changed = [r for _, _, r in fetched if not get_response_cache().is_seen(CACHE_CONSUMER, r.url, r.version)]
+if not changed:
+    logging.info("All feeds unchanged since last run - skip DB")
+    sys.exit(0)
+
 app = create_app()
 with app.app_context():
     from app.models import News
 
-    # Xoa news cu
-    db.session.execute(db.text("DELETE FROM news"))
-    db.session.commit()
-    logging.info("Cleared news")
-
-    total = 0
-    for league, source, url in FEEDS:
-        logging.info(f"Fetching {source} [{league}]: {url}")
-        content = fetch_rss(url)
-        if not content:
-            logging.warning(f"  No content")
-            continue
-
-        items = parse_rss(content, league, source)
+    # Parse het roi nap 1 lan qua staging table (thay cho DELETE FROM news + insert
+    # tung dong): nguoi doc thay bang cu cho toi khi COMMIT, khong bao gio thay bang rong
+    rows = {}
+    for league, source, resp in fetched:
+        # Feed khong doi van parse lai tu body da cache vi bang duoc nap lai toan bo
+        items = parse_rss(resp.body, league, source)
         logging.info(f"  Parsed {len(items)} articles")
-
         for item in items:
-            try:
-                # Skip neu da co source_id
-                exists = News.query.filter_by(source_id=item["source_id"]).first()
-                if exists:
-                    continue
-
-                news = News(
-                    source_id    = item["source_id"],
-                    league       = item["league"],
-                    season       = "2025",
-                    title        = item["title"],
-                    excerpt      = item["excerpt"],
-                    thumbnail_url= item["thumbnail_url"],
-                    source_url   = item["source_url"],
-                    source_name  = item["source_name"],
-                    category     = item["category"],
-                    published_at = item["published_at"],
-                )
-                db.session.add(news)
-                total += 1
-            except Exception as e:
-                logging.error(f"  Error: {e}")
-                db.session.rollback()
-
-        db.session.commit()
+            # Trung source_id -> giu ban dau tien
+            rows.setdefault(item["source_id"], dict(item, season="2025"))
+    total = len(rows)
+
+    from scripts.utils.bulk_loader import BulkLoader
+    from scripts.utils.fingerprint import forget_fingerprints
+    from scripts.utils.db_writer import data_changed
+    with BulkLoader(db) as bl:
+        bl.stage("news", News.__table__, list(rows.values()))
+        bl.merge(News.__table__, "news", keys=("source_id",))
+        forget_fingerprints("news")
+    data_changed.send("news", leagues={row["league"] for row in rows.values()}, ids=None)
+
+    for _, _, resp in fetched:
+        get_response_cache().mark_seen(CACHE_CONSUMER, resp.url, resp.version)
 
     logging.info(f"\nDone: {total} articles saved")
 
@@ -2,13 +2,14 @@
 crawl_players.py - Crawl stats + squad, luu vao DB
 Position mapping chinh xac tu FotMob position IDs thuc te
 """
-import sys, os, logging
+import sys, os, logging, time
 os.environ["DISABLE_SCHEDULER"] = "1"
 sys.path.insert(0, ".")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
 
 import requests, urllib3
 urllib3.disable_warnings()
+from scripts.utils.rate_limiter import THROTTLE_STATUSES, backoff_delay, rate_limiter
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36",
@@ -91,13 +92,21 @@ def map_pos(pos_ids):
     if p <= 82:       return "MID"
     return "FWD"
 
-def fetch(url):
-    try:
-        r = requests.get(url, headers=HEADERS, verify=False, timeout=15)
-        if r.status_code == 200:
-            return r.json()
-    except Exception as e:
-        logging.warning(f"fetch error {url}: {e}")
+def fetch(url, retry=3):
+    """GET qua rate_limiter; 403/429/503 -> cho Retry-After / backoff roi thu lai."""
+    for attempt in range(1, retry + 1):
+        try:
+            rate_limiter.acquire(url)
+            r = requests.get(url, headers=HEADERS, verify=False, timeout=15)
+            rate_limiter.feedback(url, r.status_code, r.headers)
+            if r.status_code == 200:
+                return r.json()
+            if r.status_code not in THROTTLE_STATUSES:
+                return None
+        except Exception as e:
+            logging.warning(f"fetch error {url}: {e}")
+        if attempt < retry:
+            time.sleep(backoff_delay(attempt))
     return None
 
 def badge(tid): return f"https://images.fotmob.com/image_resources/logo/teamlogo/{tid}_small.png"
@@ -183,9 +192,10 @@ def crawl_stats(league_id, season_id):
 
     return players
 
-def crawl_squad(league_id):
-    """Lay squad info: shirt, dob, height, nationality. Return dict pid -> info"""
-    data = fetch(f"https://www.fotmob.com/api/leagues?id={league_id}")
+def crawl_squad(league_id, data=None):
+    """Lay squad info: shirt, dob, height, nationality. Return dict pid -> info
+    data: league payload da fetch san (tranh tai lai cung 1 document)."""
+    data = data or fetch(f"https://www.fotmob.com/api/leagues?id={league_id}")
     if not data: return {}
 
     # Lay club IDs tu FIXTURES (chac chan co du tat ca clubs ke ca UCL)
@@ -242,21 +252,19 @@ with app.app_context():
     from app.models import Player, Club, Statistic
     from datetime import date
 
+    # Crawl het truoc, nap DB 1 lan cuoi (staging + merge, 1 transaction)
+    loaded = {}
     for LEAGUE, league_id, season_id in [("PL", 47, 27110), ("UCL", 42, 28184)]:
         logging.info(f"\n=== {LEAGUE} ===")
 
-        # Xoa cu
-        db.session.execute(db.text(f"DELETE FROM statistics WHERE league='{LEAGUE}'"))
-        db.session.execute(db.text(f"DELETE FROM players WHERE league='{LEAGUE}'"))
-        db.session.commit()
-
+        # League payload fetch 1 lan, dung chung cho squad + GK supplement
+        data_lg = fetch(f"https://www.fotmob.com/api/leagues?id={league_id}")
         stats  = crawl_stats(league_id, season_id)
-        squad  = crawl_squad(league_id)
+        squad  = crawl_squad(league_id, data_lg)
         clubs  = {c.source_id: c for c in Club.query.filter_by(league=LEAGUE).all()}
         logging.info(f"  Stats: {len(stats)}, Squad: {len(squad)}, Clubs: {len(clubs)}")
 
         # Supplement: them GK tu squad section "keepers" neu chua co trong stats
-        data_lg = fetch(f"https://www.fotmob.com/api/leagues?id={league_id}")
         club_ids_for_gk = set()
         if data_lg:
             for m in data_lg.get("fixtures",{}).get("allMatches",[]):
@@ -297,61 +305,79 @@ with app.app_context():
                         }
         logging.info(f"  After GK supplement: {len(stats)} total")
 
-        count = 0
+        player_rows, stat_rows = [], []
         for pid, s in stats.items():
             try:
                 club = clubs.get(s["team_id"])
                 sq   = squad.get(pid, {})
 
-                player = Player(source_id=pid, league=LEAGUE, season="2025")
-                db.session.add(player)
-                player.name         = s["name"]
-                player.club_id      = club.id if club else None
                 # Uu tien position tu squad (chinh xac hon stats)
-                sq_pos = map_pos_from_desc(sq.get("position_desc",""), sq.get("section_title",""))
-                if sq_pos:
-                    player.position = sq_pos
-                elif s["position"]:
-                    player.position = s["position"]
-                else:
+                position = map_pos_from_desc(sq.get("position_desc",""), sq.get("section_title",""))
+                if not position and s["position"]:
+                    position = s["position"]
+                elif not position:
                     # Fallback theo section title
                     sec = sq.get("section_title","").lower()
-                    player.position = "GK" if "keeper" in sec else "DEF" if "defend" in sec else "FWD" if "attack" in sec else "MID"
-                player.photo_url    = photo(pid)
-                player.nationality  = sq.get("nationality","")
-                player.shirt_number = sq.get("shirt_number") or None
-                player.height_cm    = sq.get("height_cm") or None
-                dob = sq.get("date_of_birth","")
+                    position = "GK" if "keeper" in sec else "DEF" if "defend" in sec else "FWD" if "attack" in sec else "MID"
+                dob, date_of_birth = sq.get("date_of_birth",""), None
                 if dob and len(dob) >= 10:
-                    try: player.date_of_birth = date.fromisoformat(dob[:10])
+                    try: date_of_birth = date.fromisoformat(dob[:10])
                     except: pass
-                db.session.flush()
-
-                stat = Statistic(player_id=player.id, league=LEAGUE, season="2025",
-                                 club_id=club.id if club else None)
-                db.session.add(stat)
-                stat.goals          = s["goals"]
-                stat.assists        = s["assists"]
-                stat.yellow_cards   = s["yellow_cards"]
-                stat.red_cards      = s["red_cards"]
-                stat.saves          = s["saves"]
-                stat.clean_sheets   = s["clean_sheets"]
-                stat.average_rating = s["rating"]
-                stat.expected_goals = s["xg"]
-                stat.appearances    = s["appearances"]
-                stat.minutes_played = s["minutes"]
-                count += 1
-
-                if count % 100 == 0:
-                    db.session.commit()
-                    logging.info(f"  Committed {count}...")
 
+                player_rows.append({
+                    "source_id": pid, "league": LEAGUE, "season": "2025",
+                    "club_id": club.id if club else None,
+                    "name": s["name"], "position": position, "photo_url": photo(pid),
+                    "nationality": sq.get("nationality",""),
+                    "shirt_number": int(sq["shirt_number"]) if sq.get("shirt_number") else None,
+                    "height_cm": int(sq["height_cm"]) if sq.get("height_cm") else None,
+                    "date_of_birth": date_of_birth,
+                })
+                stat_rows.append({
+                    "player_source_id": pid, "league": LEAGUE, "season": "2025",
+                    "club_id": club.id if club else None,
+                    "goals": s["goals"], "assists": s["assists"],
+                    "yellow_cards": s["yellow_cards"], "red_cards": s["red_cards"],
+                    "saves": s["saves"], "clean_sheets": s["clean_sheets"],
+                    "average_rating": s["rating"], "expected_goals": s["xg"],
+                    "appearances": s["appearances"], "minutes_played": s["minutes"],
+                })
             except Exception as e:
                 logging.error(f"  Error pid={pid} {s.get('name')}: {e}")
-                db.session.rollback()
 
-        db.session.commit()
-        logging.info(f"{LEAGUE} done: {count} players")
+        loaded[LEAGUE] = (player_rows, stat_rows)
+        logging.info(f"{LEAGUE} parsed: {len(player_rows)} players")
+
+    # Nap qua staging table: nguoi doc thay bang cu cho toi khi COMMIT
+    from sqlalchemy import select
+    from scripts.utils.bulk_loader import BulkLoader
+    from scripts.utils.fingerprint import forget_fingerprints
+    from scripts.utils.db_writer import data_changed
+    players_t, stats_t = Player.__table__, Statistic.__table__
+    with BulkLoader(db) as bl:
+        for LEAGUE, (player_rows, stat_rows) in loaded.items():
+            if not player_rows:
+                logging.warning(f"{LEAGUE}: khong co du lieu - giu nguyen bang cu")
+                continue
+            scope = {"league": LEAGUE, "season": "2025"}
+            bl.stage(f"players_{LEAGUE}", players_t, player_rows)
+            bl.merge(players_t, f"players_{LEAGUE}", keys=("source_id", "league", "season"),
+                     scope=scope, delete_missing=False)
+
+            # player_source_id -> player_id qua join voi bang players vua merge
+            st = bl.stage(f"stats_{LEAGUE}", stats_t, stat_rows)
+            stat_cols = [c for c in st.columns if c.name != "player_source_id"]
+            source = select(players_t.c.id.label("player_id"), *stat_cols).join(
+                players_t, (players_t.c.source_id == st.c.player_source_id)
+                & (players_t.c.league == st.c.league) & (players_t.c.season == st.c.season))
+            bl.merge(stats_t, f"stats_{LEAGUE}", keys=("player_id", "league", "season"),
+                     scope=scope, source=source)
+            # Player khong con trong danh sach -> xoa (statistic cua ho da bi xoa o tren)
+            bl.delete_missing(players_t, f"players_{LEAGUE}", ("source_id", "league", "season"), scope)
+            logging.info(f"{LEAGUE} done: {len(player_rows)} players")
+        # Du lieu vua nap khong qua DBWriter -> fingerprint cu khong con dung
+        forget_fingerprints("player")
+    data_changed.send("players", leagues={lg for lg, (rows, _) in loaded.items() if rows}, ids=None)
 
     # Verify
     logging.info("\n=== VERIFY ===")
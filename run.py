@@ -10,7 +10,11 @@ app = create_app(env)
 # Tu dong tao bang khi khoi dong (can thiet cho PostgreSQL tren Render)
 with app.app_context():
     from app.extensions import db
+    from app.models.indexes import ensure_indexes
     db.create_all()
+    ensure_indexes()   # Index composite moi cho bang da ton tai
+    from app.services.search import ensure_search_index
+    ensure_search_index()   # FTS5 / tsvector + backfill search_documents lan dau
 
 if __name__ == "__main__":
     app.run(
@@ -0,0 +1,247 @@
+"""
+scripts/build_assets.py - Build static cho production
+  - minify css / js / svg (chi bo comment + khoang trang, khong doi ten bien)
+  - fingerprint: static/dist/js/api.<sha1[:10]>.js
+  - nen san .br (brotli, neu co) + .gz muc toi da cho file text
+  - static/dist/manifest.json: "js/api.js" -> {"url": "js/api.<hash>.js", "sha1": <sha1 file nguon>}
+Template goi {{ asset_url('js/api.js') }} (app/services/assets.py); /static/dist/*
+tra ve voi Cache-Control immutable 1 nam.
+Usage:
+  python scripts/build_assets.py            # chay sau pip install, truoc khi start gunicorn
+  python scripts/build_assets.py --check    # exit 1 neu manifest cu hon file nguon
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli la tuy chon
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC = os.path.join(ROOT, "static")
+DIST = os.path.join(STATIC, "dist")
+MANIFEST = os.path.join(DIST, "manifest.json")
+
+SOURCE_DIRS = ("css", "js", "images")
+TEXT_EXTENSIONS = (".css", ".js", ".svg")
+COMPRESS_MIN_SIZE = 512
+HASH_LENGTH = 10
+
+
+# ── Minify ────────────────────────────────────────────────────────
+_CSS_STRING = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+_CSS_COMMENTS = re.compile(rf"({_CSS_STRING})|/\*.*?\*/", re.S)
+_CSS_STRINGS = re.compile(rf"({_CSS_STRING})", re.S)
+
+
+def _squeeze_css(text: str) -> str:
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r" ?([{};,>]) ?", r"\1", text)
+    # Chi bo space SAU ":" ("a :hover" khac "a:hover")
+    return text.replace(": ", ":").replace(";}", "}")
+
+
+def minify_css(source: str) -> str:
+    """Bo comment, gop khoang trang; giu nguyen chuoi trong ngoac kep."""
+    source = _CSS_COMMENTS.sub(lambda m: m.group(1) or "", source)
+    parts = _CSS_STRINGS.split(source)
+    return "".join(p if k % 2 else _squeeze_css(p) for k, p in enumerate(parts)).strip()
+
+
+# Sau cac token nay "/" bat dau regex literal, nguoc lai la phep chia
+_REGEX_PREV = set("(,=:[!&|?{};+-*%~^<>") | {""}
+_REGEX_KEYWORDS = ("return", "typeof", "case", "in", "of", "delete", "void", "throw", "new")
+
+
+def minify_js(source: str) -> str:
+    """
+    Bo comment, indent dau dong va dong trong. Giu xuong dong (an toan voi ASI),
+    giu nguyen noi dung chuoi / template literal / regex literal.
+    """
+    out, i, n = [], 0, len(source)
+    prev = ""                       # ky tu co nghia gan nhat da ghi (phan biet regex / chia)
+    line_start = True
+    templates = []                  # do sau ${ } cua template literal dang mo
+
+    def emit(text: str):
+        nonlocal prev, line_start
+        out.append(text)
+        stripped = text.rstrip()
+        if stripped:
+            prev = stripped[-1]
+            line_start = False
+
+    def last_word() -> str:
+        tail = "".join(out[-3:])
+        m = re.search(r"([A-Za-z_$]+)\s*$", tail)
+        return m.group(1) if m else ""
+
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ""
+        if ch == "`" or (ch == "}" and templates and templates[-1] == 0):
+            # Template literal: chep nguyen toi ` dong hoac ${
+            if ch == "}":
+                templates.pop()
+            j = i + 1
+            while j < n:
+                if source[j] == "\\":
+                    j += 2
+                    continue
+                if source[j] == "`":
+                    break
+                if source[j] == "$" and j + 1 < n and source[j + 1] == "{":
+                    templates.append(0)
+                    j += 1
+                    break
+                j += 1
+            emit(source[i:j + 1])
+            i = j + 1
+            continue
+        if ch in "{" and templates:
+            templates[-1] += 1
+        elif ch == "}" and templates:
+            templates[-1] -= 1
+        if ch in "'\"":
+            j = i + 1
+            while j < n and source[j] != ch:
+                j += 2 if source[j] == "\\" else 1
+            emit(source[i:j + 1])
+            i = j + 1
+            continue
+        if ch == "/" and nxt == "/":
+            while i < n and source[i] != "\n":
+                i += 1
+            continue
+        if ch == "/" and nxt == "*":
+            end = source.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if ch == "/" and (prev in _REGEX_PREV or last_word() in _REGEX_KEYWORDS):
+            j, in_class = i + 1, False
+            while j < n and (in_class or source[j] != "/"):
+                if source[j] == "\\":
+                    j += 1
+                elif source[j] == "[":
+                    in_class = True
+                elif source[j] == "]":
+                    in_class = False
+                j += 1
+            emit(source[i:j + 1])
+            i = j + 1
+            continue
+        if ch == "\n":
+            if not line_start:
+                out.append("\n")
+                line_start = True
+            i += 1
+            continue
+        if ch in " \t\r":
+            j = i
+            while j < n and source[j] in " \t\r":
+                j += 1
+            if not line_start and j < n and source[j] != "\n":
+                out.append(" ")
+            i = j
+            continue
+        emit(ch)
+        i += 1
+    return "".join(out).strip() + "\n"
+
+
+def minify_svg(source: str) -> str:
+    out = re.sub(r"<!--.*?-->", "", source, flags=re.S)
+    if "<text" not in out:          # khoang trang trong <text> co nghia
+        out = re.sub(r">\s+<", "><", out)
+    return out.strip()
+
+
+_MINIFIERS = {".css": minify_css, ".js": minify_js, ".svg": minify_svg}
+
+
+# ── Build ─────────────────────────────────────────────────────────
+def _sha1(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _sources():
+    for folder in SOURCE_DIRS:
+        base = os.path.join(STATIC, folder)
+        for dirpath, _, files in os.walk(base):
+            for name in sorted(files):
+                path = os.path.join(dirpath, name)
+                yield os.path.relpath(path, STATIC).replace(os.sep, "/"), path
+
+
+def _write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def build() -> dict:
+    shutil.rmtree(DIST, ignore_errors=True)
+    files, saved = {}, 0
+    for rel, path in _sources():
+        with open(path, "rb") as f:
+            raw = f.read()
+        stem, ext = os.path.splitext(rel)
+        data = raw
+        if ext in _MINIFIERS:
+            data = _MINIFIERS[ext](raw.decode("utf-8")).encode("utf-8")
+        url = f"{stem}.{_sha1(data)[:HASH_LENGTH]}{ext}"
+        target = os.path.join(DIST, url)
+        _write(target, data)
+        variants = []
+        if ext in TEXT_EXTENSIONS and len(data) >= COMPRESS_MIN_SIZE:
+            encoded = {".gz": gzip.compress(data, compresslevel=9)}
+            if brotli is not None:
+                encoded[".br"] = brotli.compress(data, quality=11)
+            for suffix, blob in encoded.items():
+                if len(blob) < len(data):
+                    _write(target + suffix, blob)
+                    variants.append(f"{suffix[1:]}={len(blob)}")
+        saved += len(raw) - len(data)
+        files[rel] = {"url": url, "sha1": _sha1(raw)}
+        print(f"  {rel:28} {len(raw):>8} -> {len(data):>8}  {url}  {' '.join(variants)}")
+    manifest = {"files": files}
+    _write(MANIFEST, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    print(f"Built {len(files)} asset(s) into {os.path.relpath(DIST, ROOT)} (minify saved {saved} bytes)")
+    return manifest
+
+
+def check() -> int:
+    """So file nguon da sua ma chua build lai."""
+    try:
+        with open(MANIFEST, encoding="utf-8") as f:
+            files = json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        print("No manifest - run python scripts/build_assets.py")
+        return 1
+    stale = 0
+    for rel, path in _sources():
+        with open(path, "rb") as f:
+            if files.get(rel, {}).get("sha1") != _sha1(f.read()):
+                print(f"stale: {rel}")
+                stale += 1
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint, minify and pre-compress static assets")
+    parser.add_argument("--check", action="store_true", help="Exit 1 neu manifest cu hon file nguon")
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(1 if check() else 0)
+    build()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,25 @@
 """
 scripts/crawlers/base_crawler.py
 Base class cho tất cả FotMob crawlers.
-Dung requests (dong bo) thay vi aiohttp de tranh loi DNS tren Windows.
+Dung requests (dong bo) cho request don le; fetch_many() dung aiohttp de tai
+nhieu URL song song (ThreadedResolver de tranh loi DNS/aiodns tren Windows).
 """
 import asyncio
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 
+import aiohttp
 import requests
 import urllib3
 
+from scripts.crawlers.league_snapshot import league_snapshots
+from scripts.utils.http_cache import CachedResponse, get_response_cache
+from scripts.utils.rate_limiter import THROTTLE_STATUSES, backoff_delay, rate_limiter
+
 # Tat canh bao SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -35,36 +44,76 @@ FOTMOB_HEADERS = {
 
 SEASON = "2025"
 
+# So request dong thoi toi da cho moi host khi dung fetch_many()
+FETCH_CONCURRENCY_PER_HOST = 6
+
 
 class BaseFotMobCrawler(ABC):
     LEAGUE: str = ""
     SEASON: str = SEASON
+    # False: parse() con tai payload khac (stats JSON, team page) -> league payload
+    # khong doi van parse; 304 cua tung URL + fingerprint DBWriter lo phan khong doi
+    SKIP_UNCHANGED_LEAGUE: bool = True
 
-    def __init__(self, retry: int = 3, delay: float = 2.0):
+    def __init__(self, retry: int = 3, delay: float = 2.0, consumer: Optional[str] = None,
+                 snapshot_max_age: Optional[float] = None):
         self.retry = retry
         self.delay = delay
+        # None -> dung freshness window mac dinh cua league_snapshots
+        self.snapshot_max_age = snapshot_max_age
         self.league_id = FOTMOB_LEAGUE_IDS.get(self.LEAGUE, 47)
         self._session = requests.Session()
         self._session.headers.update(FOTMOB_HEADERS)
         self._session.verify = False
+        # Conditional GET: consumer = ten dung de nho "da xu ly version nao"
+        self.consumer = consumer or self.__class__.__name__
+        self.unchanged = False
+        self._cache = get_response_cache()
+        self._league_response: Optional[CachedResponse] = None
+        self._unseen: Optional[tuple] = None   # (url, version) cho mark_seen sau khi ghi DB
 
-    def run_sync(self) -> List[Dict]:
-        """Chay dong bo - dung trong scheduler va run_all.py."""
+    def run_sync(self, force: bool = False) -> List[Dict]:
+        """
+        Chay dong bo - dung trong scheduler va run_all.py.
+        Neu league payload khong doi ke tu lan parse truoc cua consumer nay (304 hoac
+        cung noi dung) -> tra [] va dat self.unchanged = True, khong goi parse()
+        (chi voi SKIP_UNCHANGED_LEAGUE = True).
+        force=True: luon parse (vd. script xoa bang roi crawl lai).
+        Payload chi duoc danh dau "da xu ly" khi caller goi mark_seen() sau commit
+        thanh cong -> ghi DB loi thi tick sau van parse lai.
+        Giua cac attempt: backoff ngau nhien (backoff_delay), rate_limiter lo Retry-After.
+        """
+        self.unchanged = False
+        self._unseen = None
         for attempt in range(1, self.retry + 1):
             try:
                 data = self._fetch_league()
                 if data:
+                    resp = self._league_response
+                    if (not force and self.SKIP_UNCHANGED_LEAGUE and resp
+                            and self._cache.is_seen(self.consumer, resp.url, resp.version)):
+                        self.unchanged = True
+                        logger.info(f"[{self.__class__.__name__}] League payload unchanged"
+                                    f"{' (304)' if resp.not_modified else ''} - skip parse")
+                        return []
                     results = self.parse(data)
                     logger.info(f"[{self.__class__.__name__}] Crawled {len(results)} records")
+                    if results and resp:
+                        self._unseen = (resp.url, resp.version)
                     return results
             except Exception as e:
                 logger.warning(f"[{self.__class__.__name__}] Attempt {attempt}/{self.retry} failed: {e}")
-                if attempt < self.retry:
-                    import time
-                    time.sleep(self.delay * attempt)
+            if attempt < self.retry:
+                time.sleep(backoff_delay(attempt, base=self.delay))
         logger.error(f"[{self.__class__.__name__}] All retries exhausted")
         return []
 
+    def mark_seen(self):
+        """Goi sau khi record cua run_sync da commit: lan sau payload khong doi -> bo qua."""
+        if self._unseen:
+            self._cache.mark_seen(self.consumer, *self._unseen)
+            self._unseen = None
+
     async def run(self) -> List[Dict]:
         """Async wrapper - goi run_sync trong executor."""
         loop = asyncio.get_event_loop()
@@ -75,24 +124,108 @@ class BaseFotMobCrawler(ABC):
         ...
 
     def _fetch_league(self) -> Optional[Dict]:
+        """League payload dung chung qua league_snapshots (1 lan fetch / chu ky)."""
         url = f"{FOTMOB_BASE}/leagues?id={self.league_id}"
-        return self._get(url)
+        snap = league_snapshots.get(url, self._get_cached, max_age=self.snapshot_max_age)
+        self._league_response = snap.response if snap else None
+        return snap.data if snap else None
 
     def _fetch_matches_day(self, date_str: str) -> Optional[Dict]:
         url = f"{FOTMOB_BASE}/matches?date={date_str}"
         return self._get(url)
 
     def _fetch_match_detail(self, match_id: int) -> Optional[Dict]:
-        url = f"{FOTMOB_BASE}/matchDetails?matchId={match_id}"
-        return self._get(url)
+        return self._get(self._match_detail_url(match_id))
+
+    @staticmethod
+    def _match_detail_url(match_id) -> str:
+        return f"{FOTMOB_BASE}/matchDetails?matchId={match_id}"
+
+    def _fetch_team(self, team_id: str) -> Optional[Dict]:
+        return self._get(self._team_url(team_id))
+
+    @staticmethod
+    def _team_url(team_id: str) -> str:
+        return f"{FOTMOB_BASE}/teams?id={team_id}"
+
+    def fetch_many(self, urls: List[str], per_host: int = FETCH_CONCURRENCY_PER_HOST) -> List[Optional[Dict]]:
+        """
+        Tai nhieu URL song song bang aiohttp, gioi han `per_host` request dong thoi
+        cho moi host. Ket qua tra ve dung thu tu `urls`; URL loi -> None.
+        """
+        if not urls:
+            return []
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._fetch_many_async(urls, per_host))
+
+        # Dang o trong event loop -> chay engine tren thread rieng co loop moi
+        results: List[Optional[Dict]] = [None] * len(urls)
+
+        def _worker():
+            results[:] = asyncio.run(self._fetch_many_async(urls, per_host))
+
+        worker = threading.Thread(target=_worker, daemon=True)
+        worker.start()
+        worker.join()
+        return results
+
+    async def _fetch_many_async(self, urls: List[str], per_host: int) -> List[Optional[Dict]]:
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        for url in urls:
+            host = urlsplit(url).netloc
+            if host not in semaphores:
+                semaphores[host] = asyncio.Semaphore(per_host)
+
+        connector = aiohttp.TCPConnector(
+            ssl=False, limit_per_host=per_host, resolver=aiohttp.ThreadedResolver()
+        )
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(
+            headers=FOTMOB_HEADERS, connector=connector, timeout=timeout
+        ) as session:
+            tasks = [
+                self._fetch_one_async(session, semaphores[urlsplit(url).netloc], url)
+                for url in urls
+            ]
+            return await asyncio.gather(*tasks)
+
+    async def _fetch_one_async(self, session: aiohttp.ClientSession,
+                               semaphore: asyncio.Semaphore, url: str) -> Optional[Dict]:
+        for attempt in range(1, self.retry + 1):
+            try:
+                async with semaphore:
+                    await rate_limiter.acquire_async(url)
+                    async with session.get(url, headers=self._cache.request_headers(url)) as resp:
+                        body = await resp.read() if resp.status == 200 else None
+                        rate_limiter.feedback(url, resp.status, resp.headers)
+                        cached = self._cache.resolve(url, resp.status, body, resp.headers)
+                if cached.status in THROTTLE_STATUSES and attempt < self.retry:
+                    # Host dang bi chan -> lan acquire sau tu cho het Retry-After
+                    continue
+                if not cached.ok:
+                    logger.warning(f"HTTP {cached.status} for {url}")
+                    return None
+                return cached.json()
+            except Exception as e:
+                logger.debug(f"[{self.__class__.__name__}] GET {url} attempt {attempt}/{self.retry}: {e}")
+                if attempt < self.retry:
+                    await asyncio.sleep(backoff_delay(attempt, base=self.delay))
+        logger.warning(f"[{self.__class__.__name__}] GET {url} failed after {self.retry} attempts")
+        return None
 
     def _get(self, url: str) -> Optional[Dict]:
+        return self._get_cached(url)[0]
+
+    def _get_cached(self, url: str):
+        """GET qua ResponseCache -> (json | None, CachedResponse)."""
         try:
-            resp = self._session.get(url, timeout=30)
-            if resp.status_code != 200:
-                logger.warning(f"HTTP {resp.status_code} for {url}")
-                return None
-            return resp.json()
+            resp = self._cache.fetch(url, session=self._session, timeout=30)
+            if not resp.ok:
+                logger.warning(f"HTTP {resp.status} for {url}")
+                return None, resp
+            return resp.json(), resp
         except Exception as e:
             raise Exception(f"GET {url} failed: {e}")
 
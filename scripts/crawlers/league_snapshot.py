@@ -0,0 +1,89 @@
+"""
+scripts/crawlers/league_snapshot.py
+Snapshot league payload (leagues?id=47 / 42) dung chung cho moi crawler.
+
+Standings, matches, news, players, clubs deu parse cung 1 document -> chi
+fetch 1 lan moi chu ky crawl, cac crawler sau dung lai dict da parse neu
+snapshot con "tuoi" (LEAGUE_SNAPSHOT_MAX_AGE giay, mac dinh 120).
+Nhieu thread cung hoi 1 URL -> chi 1 thread fetch, cac thread khac cho.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from scripts.utils.http_cache import CachedResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = float(os.getenv("LEAGUE_SNAPSHOT_MAX_AGE", "120"))
+
+Fetcher = Callable[[str], Tuple[Optional[Dict], Optional[CachedResponse]]]
+
+
+@dataclass
+class LeagueSnapshot:
+    url: str
+    data: Dict
+    response: Optional[CachedResponse]
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class LeagueSnapshotProvider:
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE):
+        self.max_age = max_age
+        self._snapshots: Dict[str, LeagueSnapshot] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    def get(self, url: str, fetcher: Fetcher, max_age: Optional[float] = None) -> Optional[LeagueSnapshot]:
+        """Tra snapshot con tuoi hoac fetch moi qua `fetcher(url)`; loi -> None."""
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock_for(url):
+            snap = self._snapshots.get(url)
+            if snap and snap.age <= max_age:
+                self.hits += 1
+                logger.debug(f"[LeagueSnapshot] Reuse {url} (age {snap.age:.0f}s)")
+                return snap
+
+            data, resp = fetcher(url)
+            self.fetches += 1
+            if not data:
+                return None
+            snap = LeagueSnapshot(url, data, resp, time.monotonic())
+            self._snapshots[url] = snap
+            return snap
+
+    def invalidate(self, url: Optional[str] = None):
+        """Bat dau chu ky moi: bo snapshot cua 1 URL hoac tat ca."""
+        with self._guard:
+            if url is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(url, None)
+
+    def stats(self) -> Dict:
+        return {
+            "fetches": self.fetches,
+            "hits": self.hits,
+            "max_age": self.max_age,
+            "cached": {url: round(s.age, 1) for url, s in self._snapshots.items()},
+        }
+
+    def _lock_for(self, url: str) -> threading.Lock:
+        with self._guard:
+            if url not in self._locks:
+                self._locks[url] = threading.Lock()
+            return self._locks[url]
+
+
+# Provider dung chung ca process (scheduler, run_all.py)
+league_snapshots = LeagueSnapshotProvider()
@@ -0,0 +1,117 @@
+"""
+scripts/crawlers/live_scores.py
+Fast path cho tran dang da: chi lay ti so / phut / trang thai cua cac tran
+LIVE/HT (hoac sap da) thay vi crawl lai ca league document.
+
+Nguon:
+  matches?date=YYYYMMDD   -> data["leagues"][i]["matches"] (moi giai trong ngay)
+  matchDetails?matchId=.. -> data["header"]["status"], data["header"]["teams"]
+                             (fallback cho tran khong co trong danh sach ngay)
+"""
+import logging
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from scripts.crawlers.base_crawler import BaseFotMobCrawler
+
+logger = logging.getLogger(__name__)
+
+
+class LiveScoreCrawler(BaseFotMobCrawler):
+    LEAGUE = ""
+
+    def fetch_live(self, source_ids: Iterable[str], days: Optional[Iterable[date]] = None) -> List[Dict]:
+        """
+        Tra ve [{source_id, status, home_score, away_score, minute}] cho cac
+        source_ids. `days`: ngay (UTC) can poll, mac dinh hom nay.
+        """
+        wanted = {str(s) for s in source_ids if s}
+        if not wanted:
+            return []
+
+        results: Dict[str, Dict] = {}
+        for day in sorted(set(days or [datetime.now(timezone.utc).date()])):
+            try:
+                data = self._fetch_matches_day(day.strftime("%Y%m%d"))
+            except Exception as e:
+                logger.warning(f"[LiveScore] matches?date={day:%Y%m%d} failed: {e}")
+                continue
+            for record in self.parse(data or {}):
+                if record["source_id"] in wanted:
+                    results[record["source_id"]] = record
+
+        # Tran khong co trong danh sach ngay -> hoi matchDetails
+        missing = sorted(wanted - results.keys())
+        if missing:
+            details = self.fetch_many([self._match_detail_url(sid) for sid in missing])
+            for sid, detail in zip(missing, details):
+                record = self._parse_detail(sid, detail) if detail else None
+                if record:
+                    results[sid] = record
+
+        logger.info(f"[LiveScore] {len(results)}/{len(wanted)} matches resolved "
+                    f"({len(missing)} via matchDetails)")
+        return list(results.values())
+
+    def parse(self, data: Dict) -> List[Dict]:
+        """Parse payload matches?date=... -> live records cua moi tran trong ngay."""
+        results = []
+        for league in data.get("leagues", []):
+            for m in league.get("matches", []):
+                home, away = m.get("home", {}), m.get("away", {})
+                record = self._live_record(str(m.get("id", "")), m.get("status", {}),
+                                           home.get("score"), away.get("score"))
+                if record:
+                    results.append(record)
+        return results
+
+    def _parse_detail(self, source_id: str, data: Dict) -> Optional[Dict]:
+        header = data.get("header", {})
+        teams = header.get("teams", [])
+        home_score = teams[0].get("score") if len(teams) > 0 else None
+        away_score = teams[1].get("score") if len(teams) > 1 else None
+        return self._live_record(source_id, header.get("status", {}), home_score, away_score)
+
+    def _live_record(self, source_id: str, status_obj: Dict, home_score, away_score) -> Optional[Dict]:
+        if not source_id:
+            return None
+
+        reason_short = self.clean(status_obj.get("reason", {}).get("short", "")).upper()
+        if status_obj.get("cancelled"):
+            status = "CANCELLED"
+        elif status_obj.get("finished"):
+            status = "FT"
+        elif status_obj.get("started"):
+            status = "HT" if reason_short == "HT" else "LIVE"
+        else:
+            status = "SCHEDULED"
+
+        # scoreStr ("2 - 1" / "2:1") uu tien, fallback home.score / away.score
+        score_norm = self.clean(status_obj.get("scoreStr", "")).replace(" ", "").replace("-", ":")
+        parts = score_norm.split(":") if ":" in score_norm else []
+        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+            home_score, away_score = int(parts[0]), int(parts[1])
+        elif status == "SCHEDULED":
+            home_score = away_score = None
+        else:
+            home_score = self.safe_int(home_score) if home_score is not None else None
+            away_score = self.safe_int(away_score) if away_score is not None else None
+
+        # liveTime.short: "67", "45+2", "67'" ...
+        minute = None
+        if status == "LIVE":
+            short_time = self.clean((status_obj.get("liveTime") or {}).get("short", ""))
+            short_time = short_time.replace("'", "").replace("’", "")
+            if "+" in short_time:
+                base, added = short_time.split("+", 1)
+                minute = self.safe_int(base) + self.safe_int(added)
+            elif short_time.isdigit():
+                minute = int(short_time)
+
+        return {
+            "source_id": source_id,
+            "status": status,
+            "home_score": home_score,
+            "away_score": away_score,
+            "minute": minute,
+        }
@@ -16,6 +16,7 @@ logger = logging.getLogger(__name__)
 
 class PLClubsCrawler(BaseFotMobCrawler):
     LEAGUE = "PL"
+    SKIP_UNCHANGED_LEAGUE = False     # Manager / san / badge nam o team page
 
     def parse(self, data: Dict) -> List[Dict]:
         """Lay club IDs tu standings, fetch tung club."""
@@ -31,8 +32,10 @@ class PLClubsCrawler(BaseFotMobCrawler):
                     club_ids.add((str(cid), self.clean(row.get("name","")), self.clean(row.get("shortName",""))))
 
         logger.info(f"[PLClubs] Fetching {len(club_ids)} clubs...")
-        for cid, name, short in club_ids:
-            record = self._fetch_club(cid, name, short)
+        club_list = list(club_ids)
+        team_docs = self.fetch_many([self._team_url(cid) for cid, _, _ in club_list])
+        for (cid, name, short), team_data in zip(club_list, team_docs):
+            record = self._parse_club(cid, name, short, team_data)
             if record:
                 results.append(record)
 
@@ -40,8 +43,10 @@ class PLClubsCrawler(BaseFotMobCrawler):
         return results
 
     def _fetch_club(self, team_id: str, name: str, short: str) -> Optional[Dict]:
+        return self._parse_club(team_id, name, short, self._fetch_team(team_id))
+
+    def _parse_club(self, team_id: str, name: str, short: str, data: Optional[Dict]) -> Optional[Dict]:
         try:
-            data = self._get(f"https://www.fotmob.com/api/data/teams?id={team_id}")
             if not data:
                 return None
 
@@ -136,8 +141,10 @@ class UCLClubsCrawler(PLClubsCrawler):
             if a.get("id"): club_ids.add((str(a["id"]), a.get("name",""), a.get("shortName","")))
 
         logger.info(f"[UCLClubs] Fetching {len(club_ids)} clubs...")
-        for cid, name, short in list(club_ids)[:40]:
-            record = self._fetch_club(cid, name, short)
+        club_list = list(club_ids)[:40]
+        team_docs = self.fetch_many([self._team_url(cid) for cid, _, _ in club_list])
+        for (cid, name, short), team_data in zip(club_list, team_docs):
+            record = self._parse_club(cid, name, short, team_data)
             if record:
                 record["league"] = "UCL"
                 results.append(record)
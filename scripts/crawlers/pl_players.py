@@ -38,15 +38,16 @@ STAT_URLS = [
 
 class PLPlayersCrawler(BaseFotMobCrawler):
     LEAGUE = "PL"
+    SKIP_UNCHANGED_LEAGUE = False     # Du lieu chinh o STAT_URLS + team page
 
     def parse(self, data: Dict) -> List[Dict]:
         """Parse tu leagues API - lay danh sach club IDs va topPlayers."""
         players: Dict[str, Dict] = {}
 
         # ── 1. Fetch stats URLs truoc (co du lieu chinh xac nhat) ────
-        for stat_key, url in STAT_URLS:
+        stat_docs = self.fetch_many([url for _, url in STAT_URLS])
+        for (stat_key, url), stat_data in zip(STAT_URLS, stat_docs):
             try:
-                stat_data = self._get(url)
                 if not stat_data:
                     continue
                 for top_list in stat_data.get("TopLists", []):
@@ -149,17 +150,18 @@ class PLPlayersCrawler(BaseFotMobCrawler):
                 if cid:
                     club_ids.add(str(cid))
 
-        for cid in list(club_ids)[:20]:
-            self._fetch_squad(cid, players)
+        squad_ids = list(club_ids)[:20]
+        team_docs = self.fetch_many([self._team_url(cid) for cid in squad_ids])
+        for cid, team_data in zip(squad_ids, team_docs):
+            self._apply_squad(cid, team_data, players)
 
         results = list(players.values())
         logger.info(f"[PLPlayers] Total {len(results)} players")
         return results
 
-    def _fetch_squad(self, team_id: str, players: dict):
-        """Fetch squad cua 1 doi va cap nhat thong tin ca nhan."""
+    def _apply_squad(self, team_id: str, data: Optional[Dict], players: dict):
+        """Cap nhat thong tin ca nhan tu squad (teams API) cua 1 doi."""
         try:
-            data = self._get(f"https://www.fotmob.com/api/data/teams?id={team_id}")
             if not data:
                 return
             squad_sections = data.get("squad", {}).get("squad", [])
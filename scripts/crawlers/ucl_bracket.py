@@ -0,0 +1,140 @@
+"""
+scripts/crawlers/ucl_bracket.py
+Cao nhanh knockout Champions League tu FotMob (league payload, key "playoff").
+
+FotMob JSON structure:
+  data["playoff"]["type"]
+  data["playoff"]["rounds"][i]:
+    stage: "playoff" | "1/8" | "1/4" | "1/2" | "final"
+    matchups[j]:
+      drawOrder, homeTeamId, homeTeam, homeTeamShortName, tbdTeam1, homeTeamPlaceholder
+      (tuong tu away / tbdTeam2), aggregatedResult {homeScore, awayScore},
+      aggregatedWinner / aggregatedLoser (int id hoac {id, name}), bestOf,
+      matches[k]: matchId, home{id,name,shortName,score,winner}, away{...},
+                  status{utcTime, started, finished, scoreStr "2 - 1"}
+
+parse_bracket(data) dung chung cho crawler (scheduler -> DBWriter.upsert_bracket)
+va setup_ucl_playoff.py (tao lai tran playoff trong bang matches).
+"""
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from scripts.crawlers.base_crawler import BaseFotMobCrawler
+
+logger = logging.getLogger(__name__)
+
+BADGE_URL = "https://images.fotmob.com/image_resources/logo/teamlogo/{}_small.png"
+
+
+def _badge(team_id) -> str:
+    return BADGE_URL.format(team_id) if team_id else ""
+
+
+def _team_ref(value) -> Tuple[Optional[int], Optional[str]]:
+    """aggregatedWinner / aggregatedLoser: int id hoac {id, name}."""
+    if not value:
+        return None, None
+    if isinstance(value, dict):
+        return value.get("id"), value.get("name")
+    return value, None
+
+
+def _score(score_str: str) -> Tuple[Optional[int], Optional[int]]:
+    norm = (score_str or "").replace(" ", "").replace("-", ":")
+    if ":" not in norm:
+        return None, None
+    home, away = norm.split(":", 1)
+    try:
+        return int(home), int(away)
+    except ValueError:
+        return None, None
+
+
+def parse_leg(m: Dict, leg: int) -> Dict:
+    home, away, st = m.get("home", {}), m.get("away", {}), m.get("status", {})
+    finished, started = st.get("finished", False), st.get("started", False)
+    home_score, away_score = _score(st.get("scoreStr", ""))
+    if home_score is None and (started or finished):
+        home_score, away_score = home.get("score"), away.get("score")
+    return {
+        "match_id":    m.get("matchId"),
+        "leg":         leg,
+        "kickoff":     st.get("utcTime"),
+        "status":      "FT" if finished else ("LIVE" if started else "SCHEDULED"),
+        "home_name":   home.get("name", ""),
+        "home_short":  home.get("shortName", ""),
+        "home_id":     home.get("id"),
+        "home_score":  home_score,
+        "away_name":   away.get("name", ""),
+        "away_short":  away.get("shortName", ""),
+        "away_id":     away.get("id"),
+        "away_score":  away_score,
+        "home_winner": home.get("winner", False),
+        "away_winner": away.get("winner", False),
+    }
+
+
+def parse_matchup(mu: Dict) -> Dict:
+    tbd_home, tbd_away = mu.get("tbdTeam1", False), mu.get("tbdTeam2", False)
+    home_id, away_id = mu.get("homeTeamId"), mu.get("awayTeamId")
+    agg = mu.get("aggregatedResult") or {}
+    winner_id, winner_name = _team_ref(mu.get("aggregatedWinner"))
+    loser_id, _ = _team_ref(mu.get("aggregatedLoser"))
+    return {
+        "draw_order":  mu.get("drawOrder") or 0,
+        "home_id":     home_id,
+        "home_name":   mu.get("homeTeam") or (mu.get("homeTeamPlaceholder") if tbd_home else None) or "",
+        "home_short":  mu.get("homeTeamShortName", ""),
+        "home_badge":  _badge(home_id),
+        "away_id":     away_id,
+        "away_name":   mu.get("awayTeam") or (mu.get("awayTeamPlaceholder") if tbd_away else None) or "",
+        "away_short":  mu.get("awayTeamShortName", ""),
+        "away_badge":  _badge(away_id),
+        "agg_home":    agg.get("homeScore"),
+        "agg_away":    agg.get("awayScore"),
+        "winner_id":   winner_id,
+        "winner_name": winner_name,
+        "loser_id":    loser_id,
+        "tbd_home":    tbd_home,
+        "tbd_away":    tbd_away,
+        "best_of":     mu.get("bestOf", 2),
+        "matches":     [parse_leg(m, i) for i, m in enumerate(mu.get("matches", []), 1)],
+    }
+
+
+def parse_bracket(data: Dict) -> Dict:
+    """League payload -> {"type", "rounds": [{"stage", "matchups": [...]}]} (thu tu FotMob)."""
+    playoff = (data or {}).get("playoff") or {}
+    rounds = [{"stage": rnd.get("stage", ""),
+               "matchups": [parse_matchup(mu) for mu in rnd.get("matchups", [])]}
+              for rnd in playoff.get("rounds", [])]
+    return {"type": playoff.get("type", ""), "rounds": rounds}
+
+
+def stage_legs(records: List[Dict], stage: str) -> List[Dict]:
+    """Cac luot dau cua 1 vong tu record UCLBracketCrawler.parse (setup_ucl_playoff.py)."""
+    return [leg for r in records if r.get("stage") == stage
+            for leg in json.loads(r.get("legs_json") or "[]")]
+
+
+class UCLBracketCrawler(BaseFotMobCrawler):
+    LEAGUE = "UCL"
+
+    def parse(self, data: Dict) -> List[Dict]:
+        """1 record / cap dau (DBWriter.upsert_bracket)."""
+        results = []
+        try:
+            bracket = parse_bracket(data)
+            for order, rnd in enumerate(bracket["rounds"]):
+                for mu in rnd["matchups"]:
+                    record = dict(mu, league=self.LEAGUE, season=self.SEASON,
+                                  bracket_type=bracket["type"], stage=rnd["stage"], stage_order=order)
+                    record["legs_json"] = json.dumps(record.pop("matches"), ensure_ascii=False)
+                    results.append(record)
+            if not results:
+                logger.info("[UCLBracket] No playoff data yet")
+        except Exception as e:
+            logger.error(f"[UCLBracket] Parse error: {e}", exc_info=True)
+        logger.info(f"[UCLBracket] Parsed {len(results)} matchups")
+        return results
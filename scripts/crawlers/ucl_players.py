@@ -3,7 +3,7 @@ scripts/crawlers/ucl_players.py
 Cào cầu thủ Champions League - UCL 2025/26
 ✅ FIXED: Removed invalid syntax (...thong tin ca nhan...)
 """
-from typing import Dict, List
+from typing import Dict, List, Optional
 from scripts.crawlers.pl_players import PLPlayersCrawler
 import logging
 
@@ -66,9 +66,9 @@ class UCLPlayersCrawler(PLPlayersCrawler):
         players = {}
 
         # ── 1. Stats từ FotMob Stats URLs ────────────────────────────────
-        for stat_key, url in STAT_URLS_UCL:
+        stat_docs = self.fetch_many([url for _, url in STAT_URLS_UCL])
+        for (stat_key, url), stat_data in zip(STAT_URLS_UCL, stat_docs):
             try:
-                stat_data = self._get(url)
                 if not stat_data:
                     continue
 
@@ -168,21 +168,22 @@ class UCLPlayersCrawler(PLPlayersCrawler):
             if a:
                 club_ids.add(str(a))
 
-        for cid in list(club_ids)[:36]:  # UCL format mới có 36 đội
-            self._fetch_squad_ucl(cid, players)
+        squad_ids = list(club_ids)[:36]  # UCL format mới có 36 đội
+        team_docs = self.fetch_many([self._team_url(cid) for cid in squad_ids])
+        for cid, team_data in zip(squad_ids, team_docs):
+            self._apply_squad_ucl(cid, team_data, players)
 
         logger.info(f"[UCLPlayers] After squad: {len(players)} players, "
                     f"{sum(1 for p in players.values() if p.get('goals', 0) > 0)} with goals>0")
 
         return list(players.values())
 
-    def _fetch_squad_ucl(self, team_id: str, players: dict):
+    def _apply_squad_ucl(self, team_id: str, data: Optional[Dict], players: dict):
         """
-        Fetch squad từ team data.
+        Cập nhật squad từ team data (đã fetch qua fetch_many).
         ✅ IMPORTANT: Preserve stats từ FotMob stats URLs!
         """
         try:
-            data = self._get(f"https://www.fotmob.com/api/data/teams?id={team_id}")
             if not data:
                 return
 
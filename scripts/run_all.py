@@ -7,6 +7,7 @@ Usage:
   python scripts/run_all.py --only news
   python scripts/run_all.py --only players
   python scripts/run_all.py --no-db
+  python scripts/run_all.py --force     # parse ca khi payload khong doi (304)
 """
 import argparse
 import logging
@@ -23,17 +24,24 @@ logging.basicConfig(
 logger = logging.getLogger("run_all")
 
 
-def run_crawler(crawler_cls, write_db=True):
-    crawler = crawler_cls()
-    records = crawler.run_sync()
+def run_crawler(crawler_cls, write_db=True, force=False):
+    # Dry run dung consumer rieng de khong danh dau "da xu ly" cho lan ghi DB that
+    consumer = f"run_all{'' if write_db else '.dry'}.{crawler_cls.__name__}"
+    crawler = crawler_cls(consumer=consumer)
+    records = crawler.run_sync(force=force)
     league = crawler.LEAGUE
     ctype = crawler_cls.__name__.replace("Crawler", "").upper()
+    if crawler.unchanged:
+        logger.info(f"{league} {ctype}: unchanged since last run - skip DB")
+        return records
     logger.info(f"{league} {ctype}: {len(records)} records")
 
     if records:
         logger.info(f"  Sample: {records[0]}")
 
-    if write_db and records:
+    if not write_db:
+        crawler.mark_seen()
+    elif records:
         try:
             from app import create_app
             from scripts.utils.db_writer import DBWriter
@@ -54,13 +62,14 @@ def run_crawler(crawler_cls, write_db=True):
                 else:
                     n = 0
                 logger.info(f"  DB upsert: {n} rows affected")
+            crawler.mark_seen()
         except Exception as e:
             logger.error(f"  DB error: {e}", exc_info=True)
 
     return records
 
 
-def main(only=None, no_db=False):
+def main(only=None, no_db=False, force=False):
     from scripts.crawlers.pl_standings  import PLStandingsCrawler
     from scripts.crawlers.ucl_standings import UCLStandingsCrawler
     from scripts.crawlers.pl_matches    import PLMatchesCrawler
@@ -90,12 +99,12 @@ def main(only=None, no_db=False):
             logger.error(f"Unknown: {only}. Chon: {list(tasks.keys())}")
             return
         for cls in crawlers:
-            run_crawler(cls, write_db)
+            run_crawler(cls, write_db, force)
     else:
         for group, crawlers in tasks.items():
             logger.info(f"\n=== {group.upper()} ===")
             for cls in crawlers:
-                run_crawler(cls, write_db)
+                run_crawler(cls, write_db, force)
 
     logger.info("\nDone!")
 
@@ -104,5 +113,6 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--only", type=str, default=None)
     parser.add_argument("--no-db", action="store_true")
+    parser.add_argument("--force", action="store_true")
     args = parser.parse_args()
-    main(only=args.only, no_db=args.no_db)
\ No newline at end of file
+    main(only=args.only, no_db=args.no_db, force=args.force)
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+scripts/utils/bulk_loader.py
+Reload ca bang (hoac 1 phan theo league) qua staging table, trong 1 transaction.
+
+  1. CREATE TEMP TABLE stage_<ten> (cot lay kieu tu bang dich)
+  2. Nap du lieu: COPY ... FROM STDIN (PostgreSQL) | executemany (SQLite)
+  3. INSERT INTO <bang> SELECT ... FROM stage ON CONFLICT (...) DO UPDATE
+  4. DELETE row trong scope khong con trong stage
+  5. COMMIT -> nguoi doc chi thay bang cu hoac bang moi, khong bao gio thay
+     bang rong / nap do dang nhu kieu DELETE roi insert tung dong.
+
+Merge (thay vi DROP + RENAME) de giu nguyen id -> URL /players/<id> khong doi.
+
+Vi du:
+    with BulkLoader() as bl:
+        bl.stage("players", Player.__table__, rows)
+        bl.merge(Player.__table__, "players", keys=("source_id", "league", "season"),
+                 scope={"league": "PL"})
+"""
+import csv
+import io
+import logging
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Column, MetaData, String, Table, and_, delete, exists, select, true
+
+logger = logging.getLogger(__name__)
+
+SQLITE_BATCH_SIZE = 1000
+
+
+class BulkLoader:
+    def __init__(self, db=None):
+        if db is None:
+            from app.extensions import db
+        self.db = db
+        self.dialect = db.engine.dialect.name
+        self._meta = MetaData()
+        self._stages: Dict[str, Table] = {}
+        self._counts: Dict[str, int] = {}
+
+    # ── Transaction ───────────────────────────────────────────────
+    def __enter__(self) -> "BulkLoader":
+        self.conn = self.db.session.connection()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            for stage in self._stages.values():
+                stage.drop(self.conn, checkfirst=True)
+        finally:
+            if exc_type is None:
+                self.db.session.commit()
+            else:
+                logger.error(f"[BulkLoader] Rollback: {exc}")
+                self.db.session.rollback()
+        return False
+
+    # ── Staging ───────────────────────────────────────────────────
+    def stage(self, name: str, target: Table, rows: List[Dict]) -> Table:
+        """
+        Tao temp table stage_<name> voi cac cot cua `rows` (kieu lay tu `target`,
+        cot phu nhu player_source_id -> String) roi nap du lieu.
+        """
+        columns = list(rows[0]) if rows else [c.name for c in target.columns if not c.primary_key]
+        cols = [Column(c, target.c[c].type if c in target.c else String) for c in columns]
+        stage = Table(f"stage_{name}", self._meta, *cols, prefixes=["TEMPORARY"])
+        stage.drop(self.conn, checkfirst=True)
+        stage.create(self.conn)
+        self._stages[name] = stage
+        self._counts[name] = len(rows)
+
+        if rows:
+            if self.dialect == "postgresql":
+                self._copy_pg(stage, columns, rows)
+            else:
+                for i in range(0, len(rows), SQLITE_BATCH_SIZE):
+                    self.conn.execute(stage.insert(), rows[i:i + SQLITE_BATCH_SIZE])
+        logger.info(f"[BulkLoader] Staged {len(rows)} rows -> {stage.name}")
+        return stage
+
+    def _copy_pg(self, stage: Table, columns: List[str], rows: List[Dict]):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow(["\\N" if row[c] is None else row[c] for c in columns])
+        buf.seek(0)
+        cursor = self.conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {stage.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buf,
+            )
+        finally:
+            cursor.close()
+
+    # ── Merge ─────────────────────────────────────────────────────
+    def merge(self, target: Table, stage_name: str, keys: Sequence[str],
+              scope: Optional[Dict] = None, source=None, delete_missing: bool = True) -> int:
+        """
+        Upsert stage -> target theo `keys` (phai la unique constraint cua target).
+        source: SELECT tuy chinh (vd. join de doi player_source_id -> player_id);
+                mac dinh SELECT * tu stage.
+        scope:  {cot: gia tri} gioi han phan bang duoc reload; delete_missing=True
+                -> xoa row trong scope khong co trong stage.
+        """
+        from scripts.utils.db_writer import _upsert_stmt
+        stage = self._stages[stage_name]
+        if source is None:
+            source = select(*stage.columns)
+        columns = [c.name for c in source.selected_columns]
+        # SQLite: INSERT ... SELECT ... ON CONFLICT can WHERE de parse dung
+        source = source.where(true())
+
+        self.conn.execute(_upsert_stmt(self.db, target, columns, keys=tuple(keys),
+                                       touch_updated_at="updated_at" in target.c, source=source))
+
+        deleted = self.delete_missing(target, stage_name, keys, scope, source) if delete_missing else 0
+        logger.info(f"[BulkLoader] Merged {stage.name} -> {target.name} (deleted {deleted})")
+        return deleted
+
+    def delete_missing(self, target: Table, stage_name: str, keys: Sequence[str],
+                       scope: Optional[Dict] = None, source=None) -> int:
+        """Xoa row cua target (trong scope) khong co key tuong ung trong stage / source."""
+        if not self._counts[stage_name]:
+            # Stage rong (crawl loi?) -> khong xoa sach bang
+            logger.warning(f"[BulkLoader] stage_{stage_name} empty - skip delete on {target.name}")
+            return 0
+        if source is None:
+            source = select(*self._stages[stage_name].columns)
+        sub = source.subquery()
+        cond = [target.c[k] == sub.c[k] for k in keys]
+        stmt = delete(target).where(~exists(select(sub.c[keys[0]]).where(and_(*cond))))
+        for col, value in (scope or {}).items():
+            stmt = stmt.where(target.c[col] == value)
+        return self.conn.execute(stmt).rowcount
@@ -2,11 +2,30 @@
 scripts/utils/db_writer.py - Ghi du lieu vao database
 """
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, date
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
+
+from blinker import signal
+
+from scripts.utils.fingerprint import FingerprintStore, fingerprint, forget_fingerprints
 
 logger = logging.getLogger(__name__)
 
+# So dong moi batch khi bulk upsert (SELECT ... IN + INSERT ... ON CONFLICT)
+MATCH_BATCH_SIZE = 500
+PLAYER_BATCH_SIZE = 200
+
+# Cot Statistic do upsert_players ghi (thu tu dung de so sanh voi ban da luu)
+STAT_FIELDS = ("club_id", "goals", "assists", "appearances", "minutes_played",
+               "yellow_cards", "red_cards", "saves", "clean_sheets",
+               "expected_goals", "average_rating")
+
+# Phat sau moi commit co du lieu thay doi (app/services/cache_tags.py nghe de
+# invalidate cache): sender = entity ("matches", "news", ...),
+# leagues = cac league bi anh huong, ids = primary key cac row (None = khong ro)
+data_changed = signal("data-changed")
+
 
 def _load_clubs(db, Club, league):
     """Load clubs dict, neu UCL thi fallback them PL clubs."""
@@ -18,14 +37,177 @@ def _load_clubs(db, Club, league):
     return clubs
 
 
+def _emit_changed(entity: str, leagues: Iterable[str], ids: Optional[Iterable] = None):
+    leagues = {lg for lg in leagues if lg}
+    ids = None if ids is None else set(ids)
+    if leagues or ids:
+        data_changed.send(entity, leagues=leagues, ids=ids)
+
+
+def _naive_utc(value):
+    """datetime co tz -> naive UTC (cot DateTime khong luu tz) de so sanh / ghi."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _coerce_row(table, row: Dict) -> Dict:
+    """
+    Ep gia tri record ve kieu python cua cot ("3" -> 3, ISO string -> datetime naive UTC)
+    de so sanh voi row doc tu DB; khong ep duoc -> giu nguyen (DB bao loi khi ghi).
+    """
+    out = {}
+    for name, value in row.items():
+        col = table.c.get(name)
+        if value is None or col is None:
+            out[name] = value
+            continue
+        try:
+            py = col.type.python_type
+        except NotImplementedError:
+            out[name] = value
+            continue
+        try:
+            if py is datetime and isinstance(value, str):
+                value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            elif py is date and isinstance(value, str):
+                value = date.fromisoformat(value[:10])
+            elif py in (int, float, str) and not isinstance(value, py):
+                value = py(value)
+        except (TypeError, ValueError):
+            pass
+        out[name] = _naive_utc(value)
+    return out
+
+
+def _supports_upsert(db) -> bool:
+    return db.engine.dialect.name in ("postgresql", "sqlite")
+
+
+def _upsert_rows(db, table, columns, rows: List[Dict], keys=("source_id",),
+                 touch_updated_at=True, batch_size: int = MATCH_BATCH_SIZE):
+    """
+    Ghi rows theo keys: INSERT ... ON CONFLICT tren PostgreSQL / SQLite, dialect
+    khac -> merge tung row (UPDATE theo keys, khong co row nao -> INSERT).
+    """
+    if not rows:
+        return
+    if _supports_upsert(db):
+        stmt = _upsert_stmt(db, table, columns, keys=keys, touch_updated_at=touch_updated_at)
+        for i in range(0, len(rows), batch_size):
+            db.session.execute(stmt, rows[i:i + batch_size])
+        return
+    for row in rows:
+        values = {c: row[c] for c in columns if c not in keys}
+        if touch_updated_at:
+            values["updated_at"] = datetime.now(timezone.utc)
+        where = [table.c[k] == row[k] for k in keys]
+        if db.session.execute(db.update(table).where(*where).values(**values)).rowcount == 0:
+            db.session.execute(db.insert(table).values(**{c: row[c] for c in columns}))
+
+
+def _upsert_stmt(db, table, columns, keys=("source_id",), touch_updated_at=True, source=None):
+    """
+    INSERT ... ON CONFLICT (keys) DO UPDATE cho PostgreSQL / SQLite.
+    source: SELECT -> INSERT ... SELECT ... ON CONFLICT (BulkLoader), mac dinh VALUES.
+    Ghi VALUES nen qua _upsert_rows (co duong merge cho dialect khac).
+    """
+    dialect = db.engine.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Bulk upsert chua ho tro dialect {dialect}")
+    stmt = insert(table)
+    if source is not None:
+        stmt = stmt.from_select(list(columns), source)
+    set_ = {c: stmt.excluded[c] for c in columns if c not in keys}
+    # ON CONFLICT DO UPDATE khong kich hoat onupdate -> tu dat updated_at
+    if touch_updated_at:
+        set_["updated_at"] = datetime.now(timezone.utc)
+    return stmt.on_conflict_do_update(index_elements=list(keys), set_=set_)
+
+
+def _parse_player_record(r: Dict, league: str):
+    """Record crawler -> {player: {...}, stat: {...}}; sai kieu du lieu -> raise."""
+    source_id = str(r.get("source_id","")).strip()
+    name      = r.get("name","").strip()
+    if not source_id or not name:
+        return None
+
+    dob = r.get("date_of_birth","")
+    date_of_birth = None
+    if dob and isinstance(dob, str) and len(dob) >= 10:
+        try: date_of_birth = date.fromisoformat(dob[:10])
+        except ValueError: pass
+
+    return {
+        "source_id": source_id,
+        "league": r.get("league", league),
+        "season": r.get("season","2025"),
+        "name": name,
+        "team_source_id": str(r.get("team_source_id","")),
+        "player": {
+            "name":         name,
+            "position":     r.get("position","FWD"),
+            "nationality":  r.get("nationality",""),
+            "photo_url":    r.get("photo_url",""),
+            "shirt_number": r.get("shirt_number") or None,
+            "height_cm":    r.get("height_cm") or None,
+            **({"date_of_birth": date_of_birth} if date_of_birth else {}),
+        },
+        "stat": {
+            "goals":          int(r.get("goals") or 0),
+            "assists":        int(r.get("assists") or 0),
+            "appearances":    int(r.get("appearances") or 0),
+            "minutes_played": int(r.get("minutes_played") or 0),
+            "yellow_cards":   int(r.get("yellow_cards") or 0),
+            "red_cards":      int(r.get("red_cards") or 0),
+            "saves":          int(r["saves"]) if r.get("saves") else None,
+            "clean_sheets":   int(r["clean_sheets"]) if r.get("clean_sheets") else None,
+            "expected_goals": float(r["expected_goals"]) if r.get("expected_goals") else None,
+            "average_rating": float(r["average_rating"]) if r.get("average_rating") else None,
+        },
+    }
+
+
+def _player_key(item: Dict):
+    return (item["source_id"], item["league"], item["season"])
+
+
+def _player_fp_key(key) -> str:
+    source_id, league, season = key
+    return f"{league}:{season}:{source_id}"
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    ids: List[int] = field(default_factory=list)    # id tran da insert / update
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated
+
+    def __str__(self):
+        return f"{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged"
+
+
 class DBWriter:
     def __init__(self):
-        pass
+        # Chi tiet lan upsert_matches cuoi (inserted / updated / unchanged, id da ghi)
+        self.last_matches = UpsertResult()
 
     def upsert_clubs(self, records: List[Dict], league: str = "PL") -> int:
         from app.extensions import db
         from app.models import Club
-        count = 0
+        fps = FingerprintStore("club").load(
+            f"{lg}:{sid}" for sid, lg in db.session.execute(db.select(Club.source_id, Club.league)))
+        count = skipped = 0
+        changed = []
         for r in records:
             try:
                 source_id = str(r.get("source_id", "")).strip()
@@ -33,6 +215,9 @@ class DBWriter:
                 r_season  = r.get("season", "2025")
                 if not source_id:
                     continue
+                fp_key, digest = f"{r_league}:{source_id}", fingerprint(r)
+                if fps.unchanged(fp_key, digest):
+                    skipped += 1; continue
                 club = Club.query.filter_by(source_id=source_id, league=r_league).first()
                 if not club:
                     club = Club(source_id=source_id, league=r_league, season=r_season)
@@ -44,22 +229,34 @@ class DBWriter:
                 club.stadium_capacity = r.get("stadium_capacity") or None
                 club.manager = r.get("manager","")
                 db.session.flush(); count += 1
+                fps.stage(fp_key, digest)
+                changed.append((club.id, r_league))
             except Exception as e:
-                logger.error(f"[DBWriter.clubs] {e}"); db.session.rollback()
+                logger.error(f"[DBWriter.clubs] {e}"); db.session.rollback(); fps.pending.clear()
+                changed.clear()
+        fps.save()
         db.session.commit()
-        logger.info(f"[DBWriter] Clubs upserted: {count}")
+        _emit_changed("clubs", (lg for _, lg in changed), (cid for cid, _ in changed))
+        logger.info(f"[DBWriter] Clubs upserted: {count} ({skipped} unchanged)")
         return count
 
     def upsert_standings(self, records: List[Dict], league: str = "PL") -> int:
         from app.extensions import db
         from app.models import Club, Standing
         clubs = {c.source_id: c for c in Club.query.filter_by(league=league).all()}
-        count = 0
+        fps = FingerprintStore("standing").load(
+            f"{league}:{season}:{sid}" for sid, season in db.session.execute(
+                db.select(Club.source_id, Standing.season)
+                .join(Standing, Standing.club_id == Club.id).where(Standing.league == league)))
+        count = skipped = 0
         for r in records:
             try:
                 source_id = str(r.get("source_id","")).strip()
                 season = r.get("season","2025")
                 if not source_id: continue
+                fp_key, digest = f"{league}:{season}:{source_id}", fingerprint(r)
+                if fps.unchanged(fp_key, digest):
+                    skipped += 1; continue
                 club = clubs.get(source_id)
                 if not club:
                     club = Club(
@@ -86,144 +283,284 @@ class DBWriter:
                 st.goals_for=r.get("goals_for",0); st.goals_against=r.get("goals_against",0)
                 st.goal_difference=r.get("goal_difference",0); st.points=r.get("points",0)
                 st.form=r.get("form",""); st.status=r.get("status","normal")
-                st.updated_at=datetime.now(timezone.utc); count += 1
+                # updated_at chi doi qua onupdate khi co cot thuc su thay doi
+                count += 1
+                fps.stage(fp_key, digest)
             except Exception as e:
-                logger.error(f"[DBWriter.standings] {e}"); db.session.rollback()
+                logger.error(f"[DBWriter.standings] {e}"); db.session.rollback(); fps.pending.clear()
+        fps.save()
         db.session.commit()
-        logger.info(f"[DBWriter] Standings upserted: {count}")
+        if count:
+            _emit_changed("standings", [league], ())
+        logger.info(f"[DBWriter] Standings upserted: {count} ({skipped} unchanged)")
         return count
 
-    def upsert_matches(self, records: List[Dict], league: str = "PL") -> int:
+    def match_rows(self, records: List[Dict], league: str = "PL") -> Dict[str, Dict]:
+        """Record crawler -> {source_id: row cua bang matches} (dung chung upsert / bulk reload)."""
         from app.extensions import db
-        from app.models import Club, Match
-        clubs = {c.source_id: c for c in Club.query.filter_by(league=league).all()}
-        count = 0
+        from app.models import Club
+        clubs_by_league = {}
+        rows = {}
         for r in records:
-            try:
-                source_id = str(r.get("source_id", r.get("match_id",""))).strip()
-                season = r.get("season","2025")
-                if not source_id: continue
-                home_club = clubs.get(str(r.get("home_source_id","")))
-                away_club = clubs.get(str(r.get("away_source_id","")))
-                m = Match.query.filter_by(source_id=source_id, league=league).first()
-                if not m:
-                    m = Match(source_id=source_id, league=league, season=season)
-                    db.session.add(m)
-                m.league          = league
-                m.season          = season
-                m.home_club_id    = home_club.id if home_club else None
-                m.away_club_id    = away_club.id if away_club else None
-                m.home_team_name  = r.get("home_team_name", r.get("home_team",""))
-                m.away_team_name  = r.get("away_team_name", r.get("away_team",""))
-                m.home_team_badge = r.get("home_badge","")
-                m.away_team_badge = r.get("away_badge","")
-                m.home_score      = r.get("home_score")
-                m.away_score      = r.get("away_score")
-                m.status          = r.get("status","SCHEDULED")
-                m.kickoff_at      = r.get("kickoff_at") or r.get("kickoff_utc")
-                m.matchweek       = r.get("matchweek") or r.get("round_num")
-                m.round           = r.get("round_name","")
-                m.venue           = r.get("venue","")
-                m.home_score_pen  = r.get("home_score_pen")
-                m.away_score_pen  = r.get("away_score_pen")
-                count += 1
-            except Exception as e:
-                logger.error(f"[DBWriter.matches] {e} | {r.get('source_id')}")
-                db.session.rollback()
-        db.session.commit()
-        logger.info(f"[DBWriter] Matches upserted: {count}")
-        return count
+            source_id = str(r.get("source_id", r.get("match_id",""))).strip()
+            if not source_id: continue
+            r_league = r.get("league", league)
+            if r_league not in clubs_by_league:
+                clubs_by_league[r_league] = _load_clubs(db, Club, r_league)
+            clubs = clubs_by_league[r_league]
+            home_club = clubs.get(str(r.get("home_source_id","")))
+            away_club = clubs.get(str(r.get("away_source_id","")))
+            rows[source_id] = {
+                "source_id":       source_id,
+                "league":          r_league,
+                "season":          r.get("season","2025"),
+                "home_club_id":    home_club.id if home_club else None,
+                "away_club_id":    away_club.id if away_club else None,
+                "home_team_name":  r.get("home_team_name", r.get("home_team","")),
+                "away_team_name":  r.get("away_team_name", r.get("away_team","")),
+                "home_team_badge": r.get("home_badge",""),
+                "away_team_badge": r.get("away_badge",""),
+                "home_score":      r.get("home_score"),
+                "away_score":      r.get("away_score"),
+                "status":          r.get("status","SCHEDULED"),
+                "kickoff_at":      _naive_utc(r.get("kickoff_at") or r.get("kickoff_utc")),
+                "matchweek":       r.get("matchweek") or r.get("round_num"),
+                "round":           r.get("round_name",""),
+                "venue":           r.get("venue",""),
+                "home_score_pen":  r.get("home_score_pen"),
+                "away_score_pen":  r.get("away_score_pen"),
+            }
+        return rows
 
-    def upsert_players(self, records: List[Dict], league: str = "PL") -> int:
+    def upsert_matches(self, records: List[Dict], league: str = "PL") -> int:
+        """
+        Bulk upsert theo source_id: preload cac tran da co (1 SELECT / batch), chi
+        ghi tran moi hoac co gia tri khac bang INSERT ... ON CONFLICT (source_id)
+        DO UPDATE (PostgreSQL / SQLite; dialect khac -> merge tung row), chia batch
+        MATCH_BATCH_SIZE dong. Tra ve so tran da ghi; chi tiet o self.last_matches.
+        """
         from app.extensions import db
-        from app.models import Player, Club, Statistic
+        from app.models import Match
+        table = Match.__table__
+        result = self.last_matches = UpsertResult()
+        rows = {sid: _coerce_row(table, row) for sid, row in self.match_rows(records, league).items()}
+        if not rows:
+            return 0
 
-        clubs = _load_clubs(db, Club, league)
-        existing = {p.source_id: p for p in Player.query.filter_by(league=league, season="2025").all()}
+        # Fingerprint trung -> khong can SELECT / so sanh cot
+        fps = FingerprintStore("match").load(
+            sid for (sid,) in db.session.execute(db.select(table.c.source_id)))
+        digests = {sid: fingerprint(row) for sid, row in rows.items()}
+        ids = [sid for sid in rows if not fps.unchanged(sid, digests[sid])]
+        result.unchanged += len(rows) - len(ids)
 
-        count = 0
-        for i, r in enumerate(records):
-            try:
-                source_id = str(r.get("source_id","")).strip()
-                p_league  = r.get("league", league)
-                p_season  = r.get("season","2025")
-                name      = r.get("name","").strip()
-                if not source_id or not name:
+        columns = list(next(iter(rows.values())))
+        pending = []
+        for i in range(0, len(ids), MATCH_BATCH_SIZE):
+            batch = ids[i:i + MATCH_BATCH_SIZE]
+            existing = {
+                row.source_id: row for row in db.session.execute(
+                    db.select(*[table.c[c] for c in columns]).where(table.c.source_id.in_(batch))
+                )
+            }
+            for sid in batch:
+                row, old = rows[sid], existing.get(sid)
+                if old is None:
+                    result.inserted += 1
+                elif any(_naive_utc(getattr(old, c)) != row[c] for c in columns):   # row da _coerce_row
+                    result.updated += 1
+                else:
+                    result.unchanged += 1
+                    fps.stage(sid, digests[sid])
                     continue
+                pending.append(row)
+                fps.stage(sid, digests[sid])
 
-                club = clubs.get(str(r.get("team_source_id","")))
-
-                # Player
-                player = existing.get(source_id)
-                if not player:
-                    player = Player(source_id=source_id, league=p_league, season=p_season)
-                    db.session.add(player)
-                    existing[source_id] = player
-
-                player.name         = name
-                player.league       = p_league
-                player.season       = p_season
-                player.club_id      = club.id if club else None
-                player.position     = r.get("position","FWD")
-                player.nationality  = r.get("nationality","")
-                player.photo_url    = r.get("photo_url","")
-                player.shirt_number = r.get("shirt_number") or None
-                player.height_cm    = r.get("height_cm") or None
-
-                dob = r.get("date_of_birth","")
-                if dob and isinstance(dob, str) and len(dob) >= 10:
-                    try: player.date_of_birth = date.fromisoformat(dob[:10])
-                    except: pass
+        try:
+            _upsert_rows(db, table, columns, pending)
+            fps.save()
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"[DBWriter.matches] {e}")
+            db.session.rollback()
+            self.last_matches = UpsertResult()
+            return 0
 
-                db.session.flush()
+        if pending:
+            # 1 SELECT / batch: id cho data_changed (cache) va self.last_matches.ids
+            sids = [row["source_id"] for row in pending]
+            for i in range(0, len(sids), MATCH_BATCH_SIZE):
+                result.ids += db.session.execute(
+                    db.select(table.c.id).where(table.c.source_id.in_(sids[i:i + MATCH_BATCH_SIZE]))
+                ).scalars().all()
+            _emit_changed("matches", (row["league"] for row in pending), result.ids)
+        logger.info(f"[DBWriter] Matches upserted: {result}")
+        return result.written
 
-                # Statistic - 1 record per player+league+season
-                stat = Statistic.query.filter_by(
-                    player_id=player.id, league=p_league, season=p_season
-                ).first()
-                if not stat:
-                    stat = Statistic(player_id=player.id, league=p_league, season=p_season,
-                                     club_id=club.id if club else None)
-                    db.session.add(stat)
-
-                stat.club_id        = club.id if club else None
-                stat.goals          = int(r.get("goals") or 0)
-                stat.assists        = int(r.get("assists") or 0)
-                stat.appearances    = int(r.get("appearances") or 0)
-                stat.minutes_played = int(r.get("minutes_played") or 0)
-                stat.yellow_cards   = int(r.get("yellow_cards") or 0)
-                stat.red_cards      = int(r.get("red_cards") or 0)
-                stat.saves          = int(r["saves"]) if r.get("saves") else None
-                stat.clean_sheets   = int(r["clean_sheets"]) if r.get("clean_sheets") else None
-                stat.expected_goals = float(r["expected_goals"]) if r.get("expected_goals") else None
-                stat.average_rating = float(r["average_rating"]) if r.get("average_rating") else None
+    def update_live_scores(self, records: List[Dict]) -> int:
+        """
+        Live tick: chi ghi status / ti so / phut cua tran co thay doi.
+        records: [{source_id, status, home_score, away_score, minute}] (LiveScoreCrawler).
+        """
+        from app.extensions import db
+        from app.models import Match
+        by_id = {str(r["source_id"]): r for r in records if r.get("source_id")}
+        if not by_id:
+            return 0
+        count, changed_ids, touched = 0, [], []
+        for m in Match.query.filter(Match.source_id.in_(list(by_id))).all():
+            r = by_id[m.source_id]
+            changed = False
+            for field in ("status", "home_score", "away_score", "minute"):
+                value = r.get(field)
+                if field == "minute" and r.get("status") != "LIVE":
+                    value = None
+                if field in ("home_score", "away_score") and value is None:
+                    continue  # khong xoa ti so da co khi nguon thieu
+                if getattr(m, field) != value:
+                    setattr(m, field, value); changed = True
+            if changed:
                 count += 1
+                changed_ids.append(m.source_id)
+                touched.append((m.id, m.league))
+        if count:
+            # Row da khac record fixtures cuoi -> lan upsert_matches sau phai so sanh lai
+            forget_fingerprints("match", changed_ids)
+            db.session.commit()
+            _emit_changed("matches", (lg for _, lg in touched), (mid for mid, _ in touched))
+        logger.info(f"[DBWriter] Live scores changed: {count}/{len(by_id)}")
+        return count
 
-                if (i+1) % 100 == 0:
-                    db.session.commit()
+    def upsert_players(self, records: List[Dict], league: str = "PL") -> int:
+        """
+        Bulk ingest players + statistics:
+          - preload Player va Statistic cua (league, season) - 1 query moi bang
+          - player moi: add_all + 1 flush / batch de lay id
+          - statistic: chi dong thay doi, INSERT ... ON CONFLICT (player_id, league, season)
+          - moi batch chay trong SAVEPOINT; batch loi -> chay lai tung record trong
+            SAVEPOINT rieng, record hong bi bo qua, khong reload lai toan bo.
+        """
+        from app.extensions import db
+        from app.models import Player, Club, Statistic
 
+        # Chuan hoa truoc: record sai dinh dang bi loai ngay, khong dung toi DB
+        parsed = {}
+        for r in records:
+            try:
+                item = _parse_player_record(r, league)
             except Exception as e:
                 logger.error(f"[DBWriter.players] {e} | {r.get('source_id')} {r.get('name')}")
-                db.session.rollback()
-                clubs = _load_clubs(db, Club, league)
-                existing = {p.source_id: p for p in Player.query.filter_by(league=league, season="2025").all()}
+                continue
+            if item:
+                parsed[_player_key(item)] = item
+
+        scopes = {(k[1], k[2]) for k in parsed}
+        clubs = {lg: _load_clubs(db, Club, lg) for lg, _ in scopes}
+        existing, stats = {}, {}
+        for lg, season in scopes:
+            for p in Player.query.filter_by(league=lg, season=season).all():
+                existing[(p.source_id, lg, season)] = p
+            stat_cols = [Statistic.__table__.c[c] for c in ("player_id",) + STAT_FIELDS]
+            for row in db.session.execute(db.select(*stat_cols).where(
+                    Statistic.league == lg, Statistic.season == season)):
+                stats[(row.player_id, lg, season)] = tuple(row)[1:]
+
+        # Fingerprint trung (va player + statistic con trong DB) -> bo qua
+        fps = FingerprintStore("player").load(
+            f"{lg}:{season}:{sid}" for (sid, lg, season), p in existing.items()
+            if (p.id, lg, season) in stats)
+        digests = {k: fingerprint(item) for k, item in parsed.items()}
+        items = [item for k, item in parsed.items() if not fps.unchanged(_player_fp_key(k), digests[k])]
+        skipped = len(parsed) - len(items)
+
+        count = 0
+        for i in range(0, len(items), PLAYER_BATCH_SIZE):
+            batch = items[i:i + PLAYER_BATCH_SIZE]
+            try:
+                with db.session.begin_nested():
+                    new_stats = self._write_player_batch(db, batch, clubs, existing, stats)
+                count += len(batch)
+                for item in batch:
+                    k = _player_key(item)
+                    fps.stage(_player_fp_key(k), digests[k])
+            except Exception as e:
+                logger.warning(f"[DBWriter.players] batch {i // PLAYER_BATCH_SIZE + 1} failed ({e}), "
+                               f"retrying per record")
+                new_stats = {}
+                for item in batch:
+                    try:
+                        with db.session.begin_nested():
+                            new_stats.update(self._write_player_batch(db, [item], clubs, existing, stats))
+                        count += 1
+                        k = _player_key(item)
+                        fps.stage(_player_fp_key(k), digests[k])
+                    except Exception as e:
+                        logger.error(f"[DBWriter.players] {e} | {item['source_id']} {item['name']}")
+            stats.update(new_stats)
 
         try:
+            fps.save()
             db.session.commit()
         except Exception as e:
             logger.error(f"[DBWriter.players] final commit: {e}"); db.session.rollback()
+            return 0
 
-        logger.info(f"[DBWriter] Players upserted: {count}")
+        if count:
+            _emit_changed("players", {item["league"] for item in items})
+        logger.info(f"[DBWriter] Players upserted: {count} ({skipped} unchanged)")
         return count
 
+    def _write_player_batch(self, db, batch: List[Dict], clubs: Dict, existing: Dict, stats: Dict) -> Dict:
+        """Ghi 1 batch (trong SAVEPOINT cua caller). Tra ve stats da ghi de cap nhat cache."""
+        from app.models import Player, Statistic
+
+        new_players = {}
+        for item in batch:
+            key = (item["source_id"], item["league"], item["season"])
+            club = clubs.get(item["league"], {}).get(item["team_source_id"])
+            player = existing.get(key)
+            if player is None:
+                player = Player(source_id=item["source_id"], league=item["league"], season=item["season"])
+                new_players[key] = player
+            for field, value in item["player"].items():
+                setattr(player, field, value)
+            player.club_id = club.id if club else None
+        db.session.add_all(new_players.values())
+        db.session.flush()  # 1 INSERT batch cho player moi -> co id
+
+        rows = {}
+        for item in batch:
+            key = (item["source_id"], item["league"], item["season"])
+            player = existing.get(key) or new_players[key]
+            club = clubs.get(item["league"], {}).get(item["team_source_id"])
+            values = dict(item["stat"], club_id=club.id if club else None)
+            stat_key = (player.id, item["league"], item["season"])
+            if stats.get(stat_key) != tuple(values[f] for f in STAT_FIELDS):
+                rows[stat_key] = dict(values, player_id=player.id,
+                                      league=item["league"], season=item["season"])
+        if rows:
+            columns = ["player_id", "league", "season"] + list(STAT_FIELDS)
+            _upsert_rows(db, Statistic.__table__, columns, list(rows.values()),
+                         keys=("player_id", "league", "season"), batch_size=PLAYER_BATCH_SIZE)
+
+        # Chi cap nhat cache khi SAVEPOINT thanh cong (caller)
+        existing.update(new_players)
+        return {k: tuple(v[f] for f in STAT_FIELDS) for k, v in rows.items()}
+
     def upsert_news(self, records: List[Dict], league: str = "PL") -> int:
         from app.extensions import db
         from app.models import News
-        count = 0
+        fps = FingerprintStore("news").load(
+            sid for (sid,) in db.session.execute(db.select(News.source_id)))
+        count = skipped = 0
+        changed = []
         for r in records:
             try:
                 source_id = str(r.get("source_id","")).strip()
                 if not source_id: continue
+                digest = fingerprint(r)
+                if fps.unchanged(source_id, digest):
+                    skipped += 1; continue
                 news = News.query.filter_by(source_id=source_id).first()
                 if not news:
                     news = News(source_id=source_id); db.session.add(news)
@@ -232,8 +569,72 @@ class DBWriter:
                 news.image_url=r.get("image_url",""); news.published_at=r.get("published_at")
                 news.category=r.get("category",""); news.source=r.get("source","")
                 count += 1
+                fps.stage(source_id, digest)
+                changed.append(news)
             except Exception as e:
-                logger.error(f"[DBWriter.news] {e}"); db.session.rollback()
+                logger.error(f"[DBWriter.news] {e}"); db.session.rollback(); fps.pending.clear()
+                changed.clear()
+        fps.save()
+        db.session.flush()  # id cho tin moi
+        changed = [(n.id, n.league) for n in changed]
         db.session.commit()
-        logger.info(f"[DBWriter] News upserted: {count}")
-        return count
\ No newline at end of file
+        _emit_changed("news", (lg for _, lg in changed), (nid for nid, _ in changed))
+        logger.info(f"[DBWriter] News upserted: {count} ({skipped} unchanged)")
+        return count
+
+    def upsert_bracket(self, records: List[Dict], league: str = "UCL") -> int:
+        """
+        Nhanh knockout (scripts/crawlers/ucl_bracket.py): 1 record / cap dau.
+        records la ca nhanh cua 1 mua -> cap dau khong con trong payload bi xoa.
+        """
+        from app.extensions import db
+        from app.models import BracketMatchup
+        rows = {(m.season, m.stage, m.draw_order): m
+                for m in BracketMatchup.query.filter_by(league=league).all()}
+        fps = FingerprintStore("bracket").load(
+            f"{league}:{season}:{stage}:{order}" for season, stage, order in rows)
+        fields = [c.name for c in BracketMatchup.__table__.columns
+                  if c.name not in ("id", "league", "updated_at")]
+        count = skipped = 0
+        seen, failed = set(), set()      # failed: season co record loi (None = khong ro season)
+        for r in records:
+            season = r.get("season", "2025") if isinstance(r, dict) else None
+            try:
+                stage = r.get("stage")
+                if not stage:
+                    continue
+                key = (season, stage, r.get("draw_order") or 0)
+                seen.add(key)
+                fp_key, digest = f"{league}:{season}:{stage}:{key[2]}", fingerprint(r)
+                if fps.unchanged(fp_key, digest):
+                    skipped += 1; continue
+                with db.session.begin_nested():
+                    mu = rows.get(key)
+                    if not mu:
+                        mu = BracketMatchup(league=league, season=season, stage=stage, draw_order=key[2])
+                        db.session.add(mu)
+                    for f in fields:
+                        if f in r:
+                            setattr(mu, f, r[f])
+                    db.session.flush()
+                rows[key] = mu
+                count += 1
+                fps.stage(fp_key, digest)
+            except Exception as e:
+                logger.error(f"[DBWriter.bracket] {e}")
+                failed.add(season)
+        # Chi xoa cap dau bien mat o season ma moi record deu ghi duoc
+        removed = 0
+        if seen and None not in failed:
+            seasons = {s for s, _, _ in seen} - failed
+            stale = [key for key in rows if key[0] in seasons and key not in seen]
+            for key in stale:
+                db.session.delete(rows.pop(key))
+            forget_fingerprints("bracket", [f"{league}:{s}:{st}:{o}" for s, st, o in stale])
+            removed = len(stale)
+        fps.save()
+        db.session.commit()
+        if count or removed:
+            _emit_changed("bracket", [league], ())
+        logger.info(f"[DBWriter] Bracket upserted: {count} ({skipped} unchanged, {removed} removed)")
+        return count
@@ -0,0 +1,113 @@
+"""
+scripts/utils/fingerprint.py
+Change detection cho DBWriter: moi record crawler -> sha1 cua cac field da
+chuan hoa, luu trong bang record_fingerprints (RecordFingerprint).
+
+Record co digest trung voi lan ghi truoc (va row van con trong bang chinh)
+-> DBWriter bo qua, khong UPDATE, khong doi updated_at.
+"""
+import hashlib
+import json
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional
+
+
+def _normalize(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def fingerprint(record: Dict, fields: Optional[Iterable[str]] = None) -> str:
+    """sha1 on dinh cua record (hoac chi cac `fields`), khong phu thuoc thu tu key."""
+    if fields is not None:
+        record = {f: record.get(f) for f in fields}
+    payload = json.dumps(_normalize(record), sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FingerprintStore:
+    """Digest da luu cua 1 entity; gom thay doi de DBWriter ghi cung transaction."""
+
+    def __init__(self, entity: str):
+        self.entity = entity
+        self._digests: Dict[str, str] = {}
+        self.pending: Dict[str, str] = {}
+
+    def load(self, existing_keys: Optional[Iterable[str]] = None) -> "FingerprintStore":
+        """
+        1 query cho ca entity. existing_keys: key con row trong bang chinh -
+        digest cua row da bi xoa (vd. crawl_matches.py DELETE) bi bo qua.
+        """
+        from app.extensions import db
+        from app.models import RecordFingerprint
+        rows = db.session.execute(
+            db.select(RecordFingerprint.key, RecordFingerprint.digest)
+            .where(RecordFingerprint.entity == self.entity)
+        )
+        self._digests = {k: d for k, d in rows}
+        if existing_keys is not None:
+            keep = set(existing_keys)
+            self._digests = {k: d for k, d in self._digests.items() if k in keep}
+        return self
+
+    def unchanged(self, key: str, digest: str) -> bool:
+        return self._digests.get(key) == digest
+
+    def stage(self, key: str, digest: str):
+        """Danh dau digest moi (ghi khi DBWriter goi save)."""
+        if self._digests.get(key) != digest:
+            self.pending[key] = digest
+
+    def save(self):
+        """Upsert digest moi trong transaction hien tai (caller commit)."""
+        if not self.pending:
+            return
+        from app.extensions import db
+        from app.models import RecordFingerprint
+        from scripts.utils.db_writer import _upsert_rows
+        now = datetime.now(timezone.utc)
+        rows = [{"entity": self.entity, "key": k, "digest": d, "changed_at": now}
+                for k, d in self.pending.items()]
+        _upsert_rows(db, RecordFingerprint.__table__, ["entity", "key", "digest", "changed_at"], rows,
+                     keys=("entity", "key"), touch_updated_at=False)
+        self._digests.update(self.pending)
+        self.pending = {}
+
+
+def forget_fingerprints(entity: str, keys: Optional[Iterable[str]] = None):
+    """
+    Xoa digest cua cac row bi sua ngoai DBWriter upsert (vd. live tick,
+    bulk reload). keys=None -> xoa het cua entity.
+    """
+    from app.extensions import db
+    from app.models import RecordFingerprint
+    stmt = db.delete(RecordFingerprint).where(RecordFingerprint.entity == entity)
+    if keys is not None:
+        keys = list(keys)
+        if not keys:
+            return
+        stmt = stmt.where(RecordFingerprint.key.in_(keys))
+    db.session.execute(stmt)
+
+
+def last_changed(entity: str) -> Optional[datetime]:
+    """Thoi diem du lieu cua entity thay doi gan nhat (None neu chua co)."""
+    from app.extensions import db
+    from app.models import RecordFingerprint
+    return db.session.execute(
+        db.select(db.func.max(RecordFingerprint.changed_at))
+        .where(RecordFingerprint.entity == entity)
+    ).scalar()
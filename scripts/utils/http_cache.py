@@ -0,0 +1,230 @@
+"""
+scripts/utils/http_cache.py
+Cache response HTTP tren dia cho conditional GET (ETag / Last-Modified).
+
+Moi URL luu 2 file trong HTTP_CACHE_DIR:
+  <sha1(url)>.json  -> {url, etag, last_modified, version}
+  <sha1(url)>.body  -> body goc (bytes)
+
+Request sau gui If-None-Match / If-Modified-Since; 304 -> tra lai body da luu.
+`version` = sha1(body), dung de biet 1 consumer (crawler / script) da xu ly
+phien ban nay chua (is_seen / mark_seen) -> bo qua parse() + ghi DB.
+
+URL chi goi 1 lan (matches?date=, matchDetails, team page...) cung duoc luu ->
+prune() (toi da 1 lan / PRUNE_INTERVAL, khi ghi entry moi) xoa entry khong dung qua
+HTTP_CACHE_MAX_AGE_DAYS ngay, roi entry cu nhat cho toi khi thu muc <= HTTP_CACHE_MAX_MB.
+304 cham lai mtime -> URL poll thuong xuyen khong bi xoa.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+
+from scripts.utils.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIR = os.path.join(ROOT_DIR, "instance", "http_cache")
+MAX_AGE_DAYS = 7
+MAX_MB = 256
+PRUNE_INTERVAL = 3600          # Giay giua 2 lan prune tu dong
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int                 # 200 | 304 | HTTP code loi
+    body: Optional[bytes]       # body moi hoac body tu cache (304)
+    version: str = ""           # sha1(body)
+    not_modified: bool = False  # True neu server tra 304
+
+    @property
+    def ok(self) -> bool:
+        return self.body is not None
+
+    def json(self):
+        return json.loads(self.body) if self.body is not None else None
+
+
+class ResponseCache:
+    def __init__(self, directory: Optional[str] = None, max_age_days: Optional[float] = None,
+                 max_mb: Optional[float] = None):
+        self.directory = directory or os.getenv("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR)
+        os.makedirs(self.directory, exist_ok=True)
+        days = max_age_days if max_age_days is not None else float(os.getenv("HTTP_CACHE_MAX_AGE_DAYS", MAX_AGE_DAYS))
+        mb = max_mb if max_mb is not None else float(os.getenv("HTTP_CACHE_MAX_MB", MAX_MB))
+        self.max_age = days * 86400
+        self.max_bytes = int(mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    # ── Public API ────────────────────────────────────────────────
+    def fetch(self, url: str, session: Optional[requests.Session] = None,
+              params: Optional[Dict] = None, headers: Optional[Dict] = None,
+              timeout: float = 30, verify: bool = False) -> CachedResponse:
+        """GET co dieu kien qua rate_limiter. Loi mang -> raise (giong requests)."""
+        if params:
+            url = requests.Request("GET", url, params=params).prepare().url
+        getter = session.get if session is not None else requests.get
+        rate_limiter.acquire(url)
+        resp = getter(url, headers=self.request_headers(url, headers),
+                      timeout=timeout, verify=verify)
+        rate_limiter.feedback(url, resp.status_code, resp.headers)
+        return self.resolve(url, resp.status_code, resp.content, resp.headers)
+
+    def request_headers(self, url: str, headers: Optional[Dict] = None) -> Dict:
+        """Headers goc + If-None-Match / If-Modified-Since neu da co ban luu."""
+        req_headers = dict(headers or {})
+        entry = self._load_meta(url)
+        # Chi gui header dieu kien khi con body de tra lai cho 304
+        if entry and os.path.exists(self._body_path(url)):
+            if entry.get("etag"):
+                req_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                req_headers["If-Modified-Since"] = entry["last_modified"]
+        return req_headers
+
+    def resolve(self, url: str, status: int, body: Optional[bytes], resp_headers) -> CachedResponse:
+        """Xu ly response (sync hoac aiohttp): 304 -> body cu, 200 -> luu lai."""
+        if status == 304:
+            entry = self._load_meta(url)
+            cached = self._load_body(url) if entry else None
+            if cached is not None:
+                logger.debug(f"[HTTPCache] 304 {url}")
+                self._touch(url)
+                return CachedResponse(url, 304, cached, entry.get("version", ""), True)
+
+        if status != 200 or body is None:
+            return CachedResponse(url, status, None)
+
+        version = hashlib.sha1(body).hexdigest()
+        self._store(url, body, {
+            "url": url,
+            "etag": resp_headers.get("ETag"),
+            "last_modified": resp_headers.get("Last-Modified"),
+            "version": version,
+        })
+        return CachedResponse(url, 200, body, version, False)
+
+    def is_seen(self, consumer: str, url: str, version: str) -> bool:
+        """Consumer da xu ly dung phien ban nay cua URL chua?"""
+        if not version:
+            return False
+        try:
+            with open(self._seen_path(consumer, url), encoding="utf-8") as f:
+                return f.read().strip() == version
+        except OSError:
+            return False
+
+    def mark_seen(self, consumer: str, url: str, version: str):
+        if version:
+            self._atomic_write(self._seen_path(consumer, url), version.encode())
+
+    def prune(self) -> int:
+        """Xoa entry (json + body + seen) qua max_age / vuot max_bytes; tra so entry da xoa."""
+        groups: Dict[str, list] = {}           # key -> [mtime moi nhat, tong size, paths]
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                continue                        # Dang ghi do (_atomic_write)
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            group = groups.setdefault(name.split(".", 1)[0], [0.0, 0, []])
+            group[0] = max(group[0], st.st_mtime)
+            group[1] += st.st_size
+            group[2].append(path)
+        now, total, evicted = time.time(), sum(g[1] for g in groups.values()), 0
+        for mtime, size, paths in sorted(groups.values(), key=lambda g: g[0]):
+            if now - mtime < self.max_age and total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+        if evicted:
+            logger.info(f"[HTTPCache] Pruned {evicted} entries ({total // 1024} KB left)")
+        return evicted
+
+    # ── Storage ───────────────────────────────────────────────────
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _seen_path(self, consumer: str, url: str) -> str:
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in consumer)
+        return os.path.join(self.directory, f"{self._key(url)}.{safe}.seen")
+
+    def _load_meta(self, url: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.directory, self._key(url) + ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.directory, self._key(url) + ".body")
+
+    def _load_body(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._body_path(url), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _touch(self, url: str):
+        try:
+            os.utime(os.path.join(self.directory, self._key(url) + ".json"))
+        except OSError:
+            pass
+
+    def _store(self, url: str, body: bytes, meta: Dict):
+        key = self._key(url)
+        with self._lock:
+            # Ghi body truoc, meta sau -> meta luon tro toi body hop le
+            self._atomic_write(self._body_path(url), body)
+            self._atomic_write(os.path.join(self.directory, key + ".json"),
+                               json.dumps(meta).encode("utf-8"))
+            if time.time() - self._last_prune >= PRUNE_INTERVAL:
+                self._last_prune = time.time()
+                try:
+                    self.prune()
+                except OSError as e:
+                    logger.warning(f"[HTTPCache] Prune failed: {e}")
+
+    def _atomic_write(self, path: str, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """ResponseCache dung chung cho ca process."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
@@ -0,0 +1,164 @@
+"""
+scripts/utils/rate_limiter.py
+Rate limiter dung chung ca process cho moi request ra ngoai (FotMob, ESPN, RSS).
+
+Moi host 1 token bucket (rate req/s, burst). Khi server tra 429/403/503:
+  - ton trong Retry-After (giay hoac HTTP-date) -> chan host den het han
+  - giam rate xuong 1/2 (toi thieu min_rate), sau do tang dan lai khi on dinh
+Retry giua cac attempt dung backoff_delay() (exponential + full jitter) thay vi
+sleep co dinh de cac thread khong retry cung luc.
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = float(os.getenv("CRAWLER_RATE_PER_HOST", "4"))     # request / giay
+DEFAULT_BURST = int(os.getenv("CRAWLER_BURST_PER_HOST", "6"))
+MIN_RATE = 0.2
+MAX_RETRY_AFTER = 300.0  # Khong chan host qua 5 phut du server yeu cau
+
+# Status bi coi la "dang bi chan / qua tai" -> giam rate + nen retry sau
+THROTTLE_STATUSES = {403, 429, 503}
+
+
+@dataclass
+class _HostBucket:
+    rate: float
+    base_rate: float
+    burst: int
+    tokens: float
+    updated_at: float = field(default_factory=time.monotonic)
+    blocked_until: float = 0.0
+    requests: int = 0
+    throttled: int = 0
+    waited: float = 0.0
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class RateLimiter:
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 min_rate: float = MIN_RATE):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self._buckets: Dict[str, _HostBucket] = {}
+        self._lock = threading.Lock()
+
+    # ── Acquire ───────────────────────────────────────────────────
+    def acquire(self, url: str) -> float:
+        """Block den khi duoc phep gui request toi host cua url. Tra ve so giay da cho."""
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Ban async cua acquire() - khong chan event loop."""
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self, url: str) -> float:
+        # Lay truoc 1 token (co the am) -> thoi gian cho = phan thieu / rate
+        with self._lock:
+            bucket = self._bucket(urlsplit(url).netloc)
+            now = time.monotonic()
+            bucket.refill(now)
+            bucket.tokens -= 1
+            bucket.requests += 1
+            wait = max(bucket.blocked_until - now,
+                       -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0)
+            bucket.waited += wait
+            return wait
+
+    # ── Feedback ──────────────────────────────────────────────────
+    def feedback(self, url: str, status: int, headers=None) -> Optional[float]:
+        """
+        Bao ket qua request. Status bi throttle -> giam rate, chan host theo
+        Retry-After (hoac backoff ngau nhien); tra ve so giay bi chan.
+        Status khac -> tang rate dan ve muc goc.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._bucket(host)
+            if status not in THROTTLE_STATUSES:
+                if bucket.rate < bucket.base_rate:
+                    bucket.rate = min(bucket.base_rate, bucket.rate + bucket.base_rate * 0.1)
+                return None
+
+            bucket.throttled += 1
+            bucket.rate = max(self.min_rate, bucket.rate / 2)
+            retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+            if retry_after is None:
+                retry_after = backoff_delay(bucket.throttled, base=1.0, cap=60.0)
+            now = time.monotonic()
+            bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+            bucket.tokens = min(bucket.tokens, 0.0)
+
+        logger.warning(f"[RateLimiter] {host} HTTP {status} -> pause {retry_after:.1f}s, "
+                       f"rate {bucket.rate:.2f}/s")
+        return retry_after
+
+    # ── Stats ─────────────────────────────────────────────────────
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    "rate": round(b.rate, 2),
+                    "base_rate": b.base_rate,
+                    "requests": b.requests,
+                    "throttled": b.throttled,
+                    "waited_seconds": round(b.waited, 1),
+                    "blocked_for": round(max(0.0, b.blocked_until - now), 1),
+                }
+                for host, b in self._buckets.items()
+            }
+
+    def _bucket(self, host: str) -> _HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _HostBucket(rate=self.rate, base_rate=self.rate,
+                                 burst=self.burst, tokens=float(self.burst))
+            self._buckets[host] = bucket
+        return bucket
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Retry-After: so giay hoac HTTP-date -> so giay (gioi han MAX_RETRY_AFTER)."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        try:
+            when = parsedate_to_datetime(str(value))
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(MAX_RETRY_AFTER, max(0.0, seconds))
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff + full jitter: random(0, min(cap, base * 2^(attempt-1)))."""
+    return random.uniform(0, min(cap, base * (2 ** max(0, attempt - 1))))
+
+
+# Limiter dung chung ca process (scheduler, crawler, script)
+rate_limiter = RateLimiter()
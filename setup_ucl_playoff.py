@@ -7,15 +7,6 @@ os.environ["DISABLE_SCHEDULER"] = "1"
 sys.path.insert(0, ".")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
 
-import requests, urllib3
-urllib3.disable_warnings()
-
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-    "Accept": "application/json",
-    "Referer": "https://www.fotmob.com/",
-}
-
 def parse_utc(s):
     if not s: return None
     try:
@@ -30,58 +21,52 @@ from app.extensions import db
 app = create_app()
 with app.app_context():
     from app.models import Match
+    from scripts.crawlers.ucl_bracket import UCLBracketCrawler, stage_legs
+    from scripts.utils.db_writer import DBWriter, data_changed
 
-    r = requests.get("https://www.fotmob.com/api/leagues?id=42",
-                     headers=HEADERS, verify=False, timeout=15)
-    data = r.json()
-    rounds = data.get("playoff",{}).get("rounds",[])
+    # Cung parser voi job "bracket" cua scheduler; ghi luon bang bracket_matchups
+    records = UCLBracketCrawler().run_sync(force=True)
+    DBWriter().upsert_bracket(records, league="UCL")
 
     inserted = 0
-    for rd in rounds:
-        if rd.get("stage") != "playoff": continue
-        for mu in rd.get("matchups",[]):
-            for leg_num, m in enumerate(mu.get("matches",[]), 1):
-                sid = str(m.get("matchId",""))
-                if not sid: continue
-
-                status_obj = m.get("status",{})
-                finished = status_obj.get("finished", False)
-                started  = status_obj.get("started", False)
-                kickoff  = parse_utc(status_obj.get("utcTime",""))
-
-                status = "FT" if finished else ("LIVE" if started else "SCHEDULED")
-                h, a = m.get("home",{}), m.get("away",{})
+    for leg in stage_legs(records, "playoff"):
+        sid = str(leg.get("match_id") or "")
+        if not sid: continue
+        status = leg["status"]
+        h = {"name": leg["home_name"], "score": leg["home_score"]}
+        a = {"name": leg["away_name"], "score": leg["away_score"]}
 
-                db_m = Match.query.filter_by(source_id=sid).first()
-                if not db_m:
-                    db_m = Match(source_id=sid, league="UCL", season="2025")
-                    db.session.add(db_m)
+        db_m = Match.query.filter_by(source_id=sid).first()
+        if not db_m:
+            db_m = Match(source_id=sid, league="UCL", season="2025")
+            db.session.add(db_m)
 
-                db_m.matchweek   = 9
-                db_m.round       = "Playoff"
-                db_m.is_knockout = True
-                db_m.leg         = leg_num
-                db_m.kickoff_at  = kickoff
-                db_m.status      = status
-                db_m.home_team_name  = h.get("name","")
-                db_m.away_team_name  = a.get("name","")
-                db_m.home_score  = h.get("score") if finished or started else None
-                db_m.away_score  = a.get("score") if finished or started else None
+        db_m.matchweek   = 9
+        db_m.round       = "Playoff"
+        db_m.is_knockout = True
+        db_m.leg         = leg["leg"]
+        db_m.kickoff_at  = parse_utc(leg.get("kickoff") or "")
+        db_m.status      = status
+        db_m.home_team_name  = h.get("name","")
+        db_m.away_team_name  = a.get("name","")
+        db_m.home_score  = h["score"] if status != "SCHEDULED" else None
+        db_m.away_score  = a["score"] if status != "SCHEDULED" else None
 
-                # Badge tu Club
-                from app.models import Club
-                for team_name, attr in [(h.get("name",""), "home"), (a.get("name",""), "away")]:
-                    c = Club.query.filter(
-                        Club.name.ilike(f"%{team_name.split()[0]}%"),
-                        Club.league=="UCL"
-                    ).first()
-                    if c:
-                        if attr == "home": db_m.home_team_badge = c.badge_url or ""
-                        else: db_m.away_team_badge = c.badge_url or ""
+        # Badge tu Club
+        from app.models import Club
+        for team_name, attr in [(h.get("name",""), "home"), (a.get("name",""), "away")]:
+            c = Club.query.filter(
+                Club.name.ilike(f"%{team_name.split()[0]}%"),
+                Club.league=="UCL"
+            ).first()
+            if c:
+                if attr == "home": db_m.home_team_badge = c.badge_url or ""
+                else: db_m.away_team_badge = c.badge_url or ""
 
-                inserted += 1
+        inserted += 1
 
     db.session.commit()
+    data_changed.send("matches", leagues={"UCL"}, ids=None)
     logging.info(f"Restored {inserted} playoff matches")
 
     from sqlalchemy import text
@@ -7,15 +7,41 @@
 const API = (() => {
   const BASE = '/api';
 
+  // ── Conditional GET: path -> { etag, data } ──────────────
+  // Poll lai (live, bang xep hang...) gui If-None-Match, server tra 304 -> dung data cu
+  const ETAG_CACHE_SIZE = 200;
+  const _etags = new Map();
+
+  function _remember(path, etag, data) {
+    _etags.delete(path);
+    _etags.set(path, { etag, data });
+    if (_etags.size > ETAG_CACHE_SIZE) _etags.delete(_etags.keys().next().value);
+  }
+
   // ── Core fetch wrapper ────────────────────────────────────
-  async function request(path, opts = {}) {
+  // GET thuong (khong method / header / body) di qua _batched -> gop theo tick
+  function request(path, opts = {}) {
+    if (!opts.method && !opts.headers && !opts.body) return _batched(path);
+    return _fetchOne(path, opts);
+  }
+
+  async function _fetchOne(path, opts = {}) {
     try {
+      const isGet = !opts.method || opts.method.toUpperCase() === 'GET';
+      const cached = isGet ? _etags.get(path) : null;
       const res = await fetch(BASE + path, {
-        headers: { 'Content-Type': 'application/json', ...opts.headers },
         ...opts,
+        headers: {
+          'Content-Type': 'application/json',
+          ...(cached ? { 'If-None-Match': cached.etag } : {}),
+          ...opts.headers,
+        },
       });
+      if (res.status === 304 && cached) return { ok: true, data: cached.data };
       const data = await res.json();
       if (!res.ok) throw new Error(data.error || `HTTP ${res.status}`);
+      const etag = res.headers.get('ETag');
+      if (isGet && etag) _remember(path, etag, data);
       return { ok: true, data };
     } catch (err) {
       console.error(`[API] ${path}:`, err.message);
@@ -23,6 +49,66 @@ const API = (() => {
     }
   }
 
+  // ── Batch: GET goi trong cung 1 tick -> 1 POST /api/batch ──
+  const BATCH_MAX = 20;          // = MAX_REQUESTS cua app/routes/batch.py
+  let _pending = null;
+
+  function _batched(path) {
+    return new Promise(resolve => {
+      if (!_pending) {
+        _pending = [];
+        queueMicrotask(_flush);
+      }
+      _pending.push({ path, resolve });
+    });
+  }
+
+  function _flush() {
+    const queued = _pending;
+    _pending = null;
+    if (queued.length === 1) {
+      _fetchOne(queued[0].path).then(queued[0].resolve);
+      return;
+    }
+    for (let i = 0; i < queued.length; i += BATCH_MAX) _sendBatch(queued.slice(i, i + BATCH_MAX));
+  }
+
+  async function _sendBatch(chunk) {
+    let data;
+    try {
+      const res = await fetch(BASE + '/batch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          requests: chunk.map(c => ({ path: BASE + c.path, etag: _etags.get(c.path)?.etag })),
+        }),
+      });
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      data = await res.json();
+    } catch (err) {
+      // Batch loi -> goi rieng tung request
+      console.error('[API] /batch:', err.message);
+      chunk.forEach(c => _fetchOne(c.path).then(c.resolve));
+      return;
+    }
+    chunk.forEach((c, i) => c.resolve(_settle(c.path, data.responses[i])));
+  }
+
+  function _settle(path, r) {
+    if (r.status === 304) {
+      // Ban local da bi day khoi _etags (LRU) -> goi lai rieng, khong tra data rong
+      const cached = _etags.get(path);
+      return cached ? { ok: true, data: cached.data } : _fetchOne(path);
+    }
+    if (r.status >= 400) {
+      const error = r.body?.error || `HTTP ${r.status}`;
+      console.error(`[API] ${path}:`, error);
+      return { ok: false, error };
+    }
+    if (r.etag) _remember(path, r.etag, r.body);
+    return { ok: true, data: r.body };
+  }
+
   function _league() {
     return window.Theme?.getLeague() || 'PL';
   }
@@ -49,6 +135,9 @@ const API = (() => {
     upcoming: (p={}) => request(`/matches/upcoming${_qs(p)}`),
     results:  (p={}) => request(`/matches/results${_qs(p)}`),
     detail:   (id)   => request(`/matches/${id}`),
+    // SSE ti so live (snapshot + delta); null khi trinh duyet khong ho tro -> poll live()
+    stream:   (p={}) => window.EventSource
+      ? new EventSource(`${BASE}/matches/live/stream${_qs({ season: null, ...p })}`) : null,
   };
 
   // ── STANDINGS ────────────────────────────────────────────
@@ -96,22 +185,31 @@ const API = (() => {
   };
 
   // ── SEARCH (unified) ─────────────────────────────────────
-  async function search(q) {
+  // 1 request /api/search: full-text, khong phan biet dau ("mbappe" -> "Mbappé")
+  async function search(q, types = null) {
     if (!q || q.length < 2) return { news: [], players: [], clubs: [] };
-    const league = _league();
-    const [n, p, c] = await Promise.all([
-      news.search(q, { league }),
-      players.search(q, { league }),
-      clubs.search(q, { league }),
-    ]);
+    const res = await request(`/search/${_qs({ q, season: null, types: types && types.join(',') })}`);
+    return {
+      news:    res.ok ? res.data.news || [] : [],
+      players: res.ok ? res.data.players || [] : [],
+      clubs:   res.ok ? res.data.clubs || [] : [],
+    };
+  }
+
+  // Autocomplete ten cau thu / CLB (index trong RAM, khong cham DB)
+  async function suggest(q, p = {}) {
+    if (!q) return { players: [], clubs: [] };
+    const res = await request(`/search/suggest${_qs({ q, season: null, ...p })}`);
     return {
-      news:    n.ok ? n.data.items || [] : [],
-      players: p.ok ? p.data.items || [] : [],
-      clubs:   c.ok ? c.data.items || [] : [],
+      players: res.ok ? res.data.players || [] : [],
+      clubs:   res.ok ? res.data.clubs || [] : [],
     };
   }
 
-  return { news, matches, standings, players, clubs, stats, auth, chatbot, search };
+  // GET tuy y duoi /api (path da co query string) - van duoc gop batch
+  const get = (path) => request(path);
+
+  return { get, news, matches, standings, players, clubs, stats, auth, chatbot, search, suggest };
 })();
 
 window.API = API;
\ No newline at end of file
@@ -50,6 +50,8 @@ const UI = (() => {
   // ── SEARCH OVERLAY ──────────────────────────────────────
   let _searchOverlay = null;
   let _searchDebounce = null;
+  let _newsDebounce = null;
+  let _searchState = { q: '', suggest: null, news: null };
 
   function initSearch() {
     _searchOverlay = document.getElementById('search-overlay');
@@ -75,12 +77,16 @@ const UI = (() => {
     });
 
     // Search input
+    // Cau thu / CLB: autocomplete trong RAM server (100ms); tin tuc: full-text DB (350ms)
     input?.addEventListener('input', () => {
       clearTimeout(_searchDebounce);
+      clearTimeout(_newsDebounce);
       const q = input.value.trim();
+      _searchState = { q, suggest: null, news: null };
       if (q.length < 2) { results.innerHTML = ''; return; }
       results.innerHTML = `<div style="padding:12px;color:var(--color-text-muted);font-size:.85rem">Đang tìm...</div>`;
-      _searchDebounce = setTimeout(() => _doSearch(q, results), 350);
+      _searchDebounce = setTimeout(() => _doSearch(q, results, 'suggest'), 100);
+      _newsDebounce   = setTimeout(() => _doSearch(q, results, 'news'), 350);
     });
   }
 
@@ -99,15 +105,19 @@ const UI = (() => {
     if (results) results.innerHTML = '';
   }
 
-  async function _doSearch(q, container) {
-    const result = await API.search(q);
+  async function _doSearch(q, container, part) {
+    const result = part === 'news' ? await API.search(q, ['news']) : await API.suggest(q, { limit: 4 });
+    if (_searchState.q !== q) return;   // Nguoi dung da go tiep
+    _searchState[part] = result;
+    const { suggest, news } = _searchState;
     const all = [
-      ...result.news.map(n    => ({ type:'Tin tức', text: n.title, url:`/news/${n.id}` })),
-      ...result.players.map(p => ({ type:'Cầu thủ', text: `${p.name} — ${p.club_name||''}`, url:`/players/${p.id}` })),
-      ...result.clubs.map(c   => ({ type:'CLB', text: c.name, url:`/clubs/${c.id}` })),
+      ...(suggest?.players || []).map(p => ({ type:'Cầu thủ', text: `${p.name} — ${p.club_name||''}`, url:`/players/${p.id}` })),
+      ...(suggest?.clubs || []).map(c   => ({ type:'CLB', text: c.name, url:`/clubs/${c.id}` })),
+      ...(news?.news || []).map(n       => ({ type:'Tin tức', text: n.title, url:`/news/${n.id}` })),
     ];
 
     if (!all.length) {
+      if (!suggest || !news) return;    // Cho phan con lai
       container.innerHTML = `<div style="padding:12px;color:var(--color-text-muted);font-size:.85rem">Không tìm thấy kết quả nào cho "<strong>${escapeHtml(q)}</strong>"</div>`;
       return;
     }
@@ -0,0 +1,147 @@
+"""
+tests/test_query_budget.py
+Moi GET /api/* co @query_budget(n) chay tren TestingConfig (QUERY_BUDGET_MODE = "raise"):
+request vuot ngan sach -> QueryBudgetExceeded -> test fail. Cache bi xoa truoc moi
+request de do duong miss (cache hit khong query).
+
+  python -m pytest -q tests/test_query_budget.py
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+os.environ.setdefault("DISABLE_SCHEDULER", "1")
+
+from app import create_app                                  # noqa: E402
+from app.extensions import cache, db                        # noqa: E402
+
+# Endpoint khong goi duoc bang 1 request thuong
+SKIP_ENDPOINTS = {"matches.stream_live"}                    # SSE, giu ket noi
+
+URLS = [
+    "/api/news/?league=PL&per_page=5",
+    "/api/news/?league=UCL&per_page=2&with_total=1",
+    "/api/news/1",
+    "/api/news/search?q=arsenal",
+    "/api/news/latest?league=PL",
+    "/api/matches/?league=PL&per_page=5",
+    "/api/matches/?league=PL&status=FT&matchweek=1",
+    "/api/matches/live",
+    "/api/matches/live?league=PL",
+    "/api/matches/1",
+    "/api/matches/upcoming?league=PL",
+    "/api/matches/results?league=PL",
+    "/api/matches/rounds?league=PL",
+    "/api/matches/rounds?league=UCL",
+    "/api/matches/bracket?league=UCL",
+    "/api/standings/?league=PL",
+    "/api/standings/groups",
+    "/api/statistics/players?league=PL&sort=goals",
+    "/api/statistics/players?league=PL&sort=assists&per_page=2",
+    "/api/statistics/teams?league=PL",
+    "/api/players/?league=PL&per_page=5",
+    "/api/players/?league=PL&position=FWD",
+    "/api/players/1",
+    "/api/players/search?q=saka",
+    "/api/clubs/?league=PL",
+    "/api/clubs/1",
+    "/api/clubs/search?q=arsenal",
+    "/api/search/?q=arsenal",
+    "/api/search/suggest?q=ars",
+]
+
+
+def _seed():
+    from app.models import (BracketMatchup, Club, Match, News, Player, Standing,
+                            Statistic, TeamStatistic)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    names = ("Arsenal", "Chelsea", "Liverpool", "Everton")
+    for league in ("PL", "UCL"):
+        clubs = [Club(source_id=f"{league}{i}", league=league, season="2025", name=name,
+                      short_name=name[:3].upper()) for i, name in enumerate(names)]
+        db.session.add_all(clubs)
+        db.session.flush()
+        for i, club in enumerate(clubs):
+            db.session.add(Standing(club_id=club.id, league=league, season="2025", position=i + 1,
+                                    team_name=club.name, points=10 - i,
+                                    group=None if league == "PL" else "League Phase"))
+            db.session.add(TeamStatistic(club_id=club.id, league=league, season="2025", goals_scored=i))
+            for p, pos in enumerate(("GK", "DEF", "MID", "FWD")):
+                player = Player(source_id=f"{league}{i}-{p}", league=league, season="2025",
+                                club_id=club.id, name=f"Saka {club.name} {p}", position=pos)
+                db.session.add(player)
+                db.session.flush()
+                db.session.add(Statistic(player_id=player.id, club_id=club.id, league=league,
+                                         season="2025", goals=p, assists=i, appearances=3))
+        for m, (status, days) in enumerate((("FT", -7), ("FT", -3), ("LIVE", 0), ("SCHEDULED", 3))):
+            home, away = clubs[m % 4], clubs[(m + 1) % 4]
+            db.session.add(Match(source_id=f"{league}-m{m}", league=league, season="2025",
+                                 matchweek=m // 2 + 1, status=status,
+                                 home_club_id=home.id, away_club_id=away.id,
+                                 home_team_name=home.name, away_team_name=away.name,
+                                 home_score=1 if status != "SCHEDULED" else None,
+                                 away_score=0 if status != "SCHEDULED" else None,
+                                 kickoff_at=now + timedelta(days=days),
+                                 events_json=json.dumps([{"type": "goal", "minute": 10}])))
+        for n in range(3):
+            db.session.add(News(source_id=f"{league}-n{n}", league=league, season="2025",
+                                title=f"Arsenal news {n}", slug=f"{league.lower()}-news-{n}",
+                                published_at=now - timedelta(hours=n)))
+    db.session.add(BracketMatchup(league="UCL", season="2025", stage="1/8", stage_order=0, draw_order=1,
+                                  home_name="Arsenal", away_name="Chelsea", legs_json="[]"))
+    db.session.commit()
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = create_app("testing")
+    assert app.config["QUERY_BUDGET_MODE"] == "raise"
+    with app.app_context():
+        from app.services.search import ensure_search_index
+        db.create_all()
+        _seed()
+        ensure_search_index()
+    yield app
+
+
+@pytest.fixture()
+def client(app):
+    with app.app_context():
+        cache.clear()
+    return app.test_client()
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_endpoint_within_budget(client, url):
+    # Vuot ngan sach -> QueryBudgetExceeded lan ra tu test client (TESTING=True)
+    resp = client.get(url)
+    assert resp.status_code == 200, f"{url} -> {resp.status_code}"
+
+
+def test_every_budgeted_endpoint_is_exercised(app):
+    adapter = app.url_map.bind("localhost")
+    covered = {adapter.match(url.split("?", 1)[0], method="GET")[0] for url in URLS}
+    budgeted = {endpoint for endpoint, view in app.view_functions.items()
+                if getattr(view, "query_budget", None) is not None}
+    missing = budgeted - covered - SKIP_ENDPOINTS
+    assert not missing, f"No budget test for: {sorted(missing)}"
+
+
+def test_budget_violation_raises():
+    from app.services.query_budget import QueryBudgetExceeded, query_budget
+    from app.models import Club
+
+    @query_budget(1)
+    def two_queries():
+        Club.query.first()
+        Club.query.count()
+        return "ok"
+
+    probe = create_app("testing")          # App moi: app fixture da nhan request
+    probe.add_url_rule("/api/_budget_probe", "budget_probe", two_queries)
+    with probe.app_context():
+        db.create_all()
+    with pytest.raises(QueryBudgetExceeded):
+        probe.test_client().get("/api/_budget_probe")
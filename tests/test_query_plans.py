@@ -0,0 +1,16 @@
+"""
+tests/test_query_plans.py
+Regression query plan cua endpoint nong (scripts/check_query_plans.py) tren SQLite
+in-memory: full scan bang nong hoac sort tam (temp B-tree) -> test fail, kem dong FAIL.
+
+  python -m pytest -q tests/test_query_plans.py
+  python scripts/check_query_plans.py -v      # in plan cua moi query
+"""
+from scripts.check_query_plans import run
+
+
+def test_hot_endpoints_use_indexes(capsys):
+    code = run()
+    out = capsys.readouterr().out
+    failures = [line for line in out.splitlines() if not line.startswith(("ok", "Seeded", "All hot"))]
+    assert code == 0, "\n".join(failures)